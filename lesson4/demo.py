@@ -4,14 +4,19 @@
 实现了三种经典的智能体范式：ReAct、Plan-and-Solve、Reflection
 """
 
+import asyncio
+import contextvars
+import io
+import sys
+
 from llm_client import HelloAgentsLLM
-from tools import ToolExecutor, search, calculator
+from tools import ToolExecutor, asearch, calculator
 from react_agent import ReActAgent
 from plan_and_solve_agent import PlanAndSolveAgent
 from reflection_agent import ReflectionAgent
 
 
-def demo_react():
+async def demo_react():
     """演示 ReAct 智能体"""
     print("\n" + "=" * 60)
     print("演示 1: ReAct 智能体 (Reasoning and Acting)")
@@ -24,7 +29,7 @@ def demo_react():
     tool_executor.registerTool(
         "Search",
         "一个网页搜索引擎。当你需要回答关于时事、事实以及在你的知识库中找不到的信息时，应使用此工具。",
-        search
+        asearch
     )
     tool_executor.registerTool(
         "Calculator",
@@ -36,10 +41,10 @@ def demo_react():
 
     question = "华为最新的手机是哪一款？它的主要卖点是什么？"
     print(f"\n问题: {question}")
-    agent.run(question)
+    await agent.arun(question)
 
 
-def demo_plan_and_solve():
+async def demo_plan_and_solve():
     """演示 Plan-and-Solve 智能体"""
     print("\n" + "=" * 60)
     print("演示 2: Plan-and-Solve 智能体")
@@ -50,10 +55,10 @@ def demo_plan_and_solve():
     agent = PlanAndSolveAgent(llm_client)
 
     question = "一个水果店周一卖出了15个苹果。周二卖出的苹果数量是周一的两倍。周三卖出的数量比周二少了5个。请问这三天总共卖出了多少个苹果？"
-    agent.run(question)
+    await agent.arun(question)
 
 
-def demo_reflection():
+async def demo_reflection():
     """演示 Reflection 智能体"""
     print("\n" + "=" * 60)
     print("演示 3: Reflection 智能体")
@@ -64,7 +69,47 @@ def demo_reflection():
     agent = ReflectionAgent(llm_client, max_iterations=2)
 
     task = "编写一个Python函数，找出1到n之间所有的素数 (prime numbers)。"
-    agent.run(task)
+    await agent.arun(task)
+
+
+# 并发演示时，每个演示的输出先写入各自的缓冲区，完成后再整体输出，避免互相穿插
+_demo_output: contextvars.ContextVar = contextvars.ContextVar("demo_output", default=None)
+
+
+class _DemoStdout:
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = _demo_output.get()
+        return (buffer if buffer is not None else self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+async def _run_buffered(demo):
+    buffer = io.StringIO()
+    _demo_output.set(buffer)
+    try:
+        await demo()
+    finally:
+        _demo_output.set(None)
+        print(buffer.getvalue(), end="", flush=True)
+
+
+async def demo_all():
+    """并发运行全部演示，总耗时约等于最慢的一个"""
+    stdout = sys.stdout
+    sys.stdout = _DemoStdout(stdout)
+    try:
+        await asyncio.gather(
+            _run_buffered(demo_react),
+            _run_buffered(demo_plan_and_solve),
+            _run_buffered(demo_reflection),
+        )
+    finally:
+        sys.stdout = stdout
 
 
 def main():
@@ -87,15 +132,13 @@ def main():
         choice = input("\n请输入选项 (0-4): ").strip()
 
         if choice == "1":
-            demo_react()
+            asyncio.run(demo_react())
         elif choice == "2":
-            demo_plan_and_solve()
+            asyncio.run(demo_plan_and_solve())
         elif choice == "3":
-            demo_reflection()
+            asyncio.run(demo_reflection())
         elif choice == "4":
-            demo_react()
-            demo_plan_and_solve()
-            demo_reflection()
+            asyncio.run(demo_all())
         elif choice == "0":
             print("退出演示")
             return
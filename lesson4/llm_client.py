@@ -1,9 +1,11 @@
 import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import List, Dict, Any, AsyncIterator
 
-load_dotenv()
+if not os.getenv("_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_DOTENV_LOADED"] = "1"
 
 class HelloAgentsLLM:
     def __init__(self, model: str = None, apiKey: str = None, baseUrl: str = None, timeout: int = None):
@@ -16,8 +18,9 @@ class HelloAgentsLLM:
             raise ValueError("模型ID、API密钥和服务地址必须被提供或在.env文件中定义。")
 
         self.client = OpenAI(api_key=apiKey, base_url=baseUrl, timeout=timeout)
+        self.async_client = AsyncOpenAI(api_key=apiKey, base_url=baseUrl, timeout=timeout)
 
-    def think(self, messages: List[Dict[str, str]], temperature: float = 0) -> str:
+    def think(self, messages: List[Dict[str, Any]], temperature: float = 0) -> str:
         print(f"🧠 正在调用 {self.model} 模型...")
         try:
             response = self.client.chat.completions.create(
@@ -39,3 +42,33 @@ class HelloAgentsLLM:
         except Exception as e:
             print(f"❌ 调用LLM API时发生错误: {e}")
             return None
+
+    async def athink(self, messages: List[Dict[str, Any]], temperature: float = 0) -> str:
+        print(f"🧠 正在调用 {self.model} 模型...")
+        try:
+            collected_content = []
+            first_chunk = True
+            async for content in self.astream(messages, temperature=temperature):
+                if first_chunk:
+                    print("✅ 大语言模型响应成功:")
+                    first_chunk = False
+                print(content, end="", flush=True)
+                collected_content.append(content)
+            print()
+            return "".join(collected_content)
+
+        except Exception as e:
+            print(f"❌ 调用LLM API时发生错误: {e}")
+            return None
+
+    async def astream(self, messages: List[Dict[str, Any]], temperature: float = 0) -> AsyncIterator[str]:
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+        )
+        async for chunk in response:
+            content = chunk.choices[0].delta.content or ""
+            if content:
+                yield content
@@ -1,4 +1,5 @@
 import ast
+import asyncio
 from llm_client import HelloAgentsLLM
 
 PLANNER_PROMPT_TEMPLATE = """
@@ -40,11 +41,14 @@ class Planner:
         self.llm_client = llm_client
 
     def plan(self, question: str) -> list:
+        return asyncio.run(self.aplan(question))
+
+    async def aplan(self, question: str) -> list:
         prompt = PLANNER_PROMPT_TEMPLATE.format(question=question)
         messages = [{"role": "user", "content": prompt}]
 
         print("--- 正在生成计划 ---")
-        response_text = self.llm_client.think(messages=messages) or ""
+        response_text = await self.llm_client.athink(messages=messages) or ""
 
         print(f"✅ 计划已生成:\n{response_text}")
 
@@ -66,6 +70,9 @@ class Executor:
         self.llm_client = llm_client
 
     def execute(self, question: str, plan: list) -> str:
+        return asyncio.run(self.aexecute(question, plan))
+
+    async def aexecute(self, question: str, plan: list) -> str:
         history = ""
 
         print("\n--- 正在执行计划 ---")
@@ -82,7 +89,7 @@ class Executor:
             )
 
             messages = [{"role": "user", "content": prompt}]
-            response_text = self.llm_client.think(messages=messages) or ""
+            response_text = await self.llm_client.athink(messages=messages) or ""
 
             history += f"步骤 {i+1}: {step}\n结果: {response_text}\n\n"
             print(f"✅ 步骤 {i+1} 已完成，结果: {response_text}")
@@ -97,15 +104,18 @@ class PlanAndSolveAgent:
         self.executor = Executor(self.llm_client)
 
     def run(self, question: str):
+        return asyncio.run(self.arun(question))
+
+    async def arun(self, question: str):
         print(f"\n--- 开始处理问题 ---\n问题: {question}")
 
-        plan = self.planner.plan(question)
+        plan = await self.planner.aplan(question)
 
         if not plan:
             print("\n--- 任务终止 --- \n无法生成有效的行动计划。")
             return None
 
-        final_answer = self.executor.execute(question, plan)
+        final_answer = await self.executor.aexecute(question, plan)
 
         print(f"\n--- 任务完成 ---\n最终答案: {final_answer}")
         return final_answer
@@ -1,3 +1,5 @@
+import asyncio
+import inspect
 import re
 from llm_client import HelloAgentsLLM
 from tools import ToolExecutor, search, calculator
@@ -30,6 +32,9 @@ class ReActAgent:
         self.history = []
 
     def run(self, question: str):
+        return asyncio.run(self.arun(question))
+
+    async def arun(self, question: str):
         self.history = []
         current_step = 0
 
@@ -46,7 +51,7 @@ class ReActAgent:
             )
 
             messages = [{"role": "user", "content": prompt}]
-            response_text = self.llm_client.think(messages=messages)
+            response_text = await self.llm_client.athink(messages=messages)
 
             if not response_text:
                 print("错误:LLM未能返回有效响应。")
@@ -83,8 +88,10 @@ class ReActAgent:
             tool_function = self.tool_executor.getTool(tool_name)
             if not tool_function:
                 observation = f"错误:未找到名为 '{tool_name}' 的工具。"
+            elif inspect.iscoroutinefunction(tool_function):
+                observation = await tool_function(tool_input)
             else:
-                observation = tool_function(tool_input)
+                observation = await asyncio.to_thread(tool_function, tool_input)
 
             print(f"👀 观察: {observation}")
 
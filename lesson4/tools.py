@@ -1,8 +1,20 @@
+import operator
 import os
-from typing import Dict, Any, Callable
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, Callable, List
+
+import httpx
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
-load_dotenv()
+# 多个模块都会在导入时加载 .env，只在第一次真正解析文件
+if not os.getenv("_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_DOTENV_LOADED"] = "1"
 
 class ToolExecutor:
     def __init__(self):
@@ -24,10 +36,84 @@ class ToolExecutor:
         ])
 
 
+SERPAPI_URL = "https://serpapi.com/search"
+
+# 所有搜索共享同一个连接池，复用 keep-alive 连接，避免每次调用都重新握手 TLS
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+# 异步客户端在首次调用 asearch 时创建，供并发查询复用
+_ASYNC_CLIENT = None
+
+
+# 搜索结果缓存：ReAct 循环中模型经常重复提问，相同查询在 TTL 内直接复用结果
+SEARCH_CACHE_TTL = 600
+SEARCH_CACHE_MAX_ENTRIES = 256
+_search_cache: Dict[str, Any] = {}
+_search_cache_lock = threading.Lock()
+
+
+def _cache_key(query: str) -> str:
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+def _cache_get(query: str):
+    key = _cache_key(query)
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is None:
+            return None
+        ts, result = entry
+        if time.monotonic() - ts > SEARCH_CACHE_TTL:
+            del _search_cache[key]
+            return None
+        return result
+
+
+def _cache_put(query: str, result: str):
+    key = _cache_key(query)
+    with _search_cache_lock:
+        _search_cache.pop(key, None)
+        if len(_search_cache) >= SEARCH_CACHE_MAX_ENTRIES:
+            _search_cache.pop(next(iter(_search_cache)))
+        _search_cache[key] = (time.monotonic(), result)
+
+
+def _serpapi_params(query: str, api_key: str) -> Dict[str, str]:
+    return {
+        "engine": "google",
+        "q": query,
+        "api_key": api_key,
+        "gl": "cn",
+        "hl": "zh-cn",
+    }
+
+
+def _format_results(query: str, results: Dict[str, Any]) -> str:
+    if "answer_box_list" in results:
+        return "\n".join(results["answer_box_list"])
+    if "answer_box" in results and "answer" in results["answer_box"]:
+        return results["answer_box"]["answer"]
+    if "knowledge_graph" in results and "description" in results["knowledge_graph"]:
+        return results["knowledge_graph"]["description"]
+    if "organic_results" in results and results["organic_results"]:
+        snippets = [
+            f"[{i+1}] {res.get('title', '')}\n{res.get('snippet', '')}"
+            for i, res in enumerate(results["organic_results"][:3])
+        ]
+        return "\n\n".join(snippets)
+
+    return f"对不起，没有找到关于 '{query}' 的信息。"
+
+
 def search(query: str) -> str:
     """网页搜索工具（支持 SerpAPI 或模拟模式）"""
     print(f"🔍 正在执行网页搜索: {query}")
 
+    cached = _cache_get(query)
+    if cached is not None:
+        return cached
+
     api_key = os.getenv("SERPAPI_API_KEY")
 
     # 如果没有配置 API key，使用模拟搜索
@@ -36,32 +122,39 @@ def search(query: str) -> str:
 
     # 使用真实的 SerpAPI
     try:
-        from serpapi import SerpApiClient
-        params = {
-            "engine": "google",
-            "q": query,
-            "api_key": api_key,
-            "gl": "cn",
-            "hl": "zh-cn",
-        }
-
-        client = SerpApiClient(params)
-        results = client.get_dict()
-
-        if "answer_box_list" in results:
-            return "\n".join(results["answer_box_list"])
-        if "answer_box" in results and "answer" in results["answer_box"]:
-            return results["answer_box"]["answer"]
-        if "knowledge_graph" in results and "description" in results["knowledge_graph"]:
-            return results["knowledge_graph"]["description"]
-        if "organic_results" in results and results["organic_results"]:
-            snippets = [
-                f"[{i+1}] {res.get('title', '')}\n{res.get('snippet', '')}"
-                for i, res in enumerate(results["organic_results"][:3])
-            ]
-            return "\n\n".join(snippets)
-
-        return f"对不起，没有找到关于 '{query}' 的信息。"
+        response = _SESSION.get(SERPAPI_URL, params=_serpapi_params(query, api_key), timeout=10)
+        result = _format_results(query, response.json())
+        _cache_put(query, result)
+        return result
+
+    except Exception as e:
+        return f"搜索时发生错误: {e}，切换到模拟模式"
+
+
+async def asearch(query: str) -> str:
+    """网页搜索工具的异步版本，多个查询可以在同一个连接池上并发执行"""
+    global _ASYNC_CLIENT
+    print(f"🔍 正在执行网页搜索: {query}")
+
+    cached = _cache_get(query)
+    if cached is not None:
+        return cached
+
+    api_key = os.getenv("SERPAPI_API_KEY")
+
+    if not api_key:
+        return search_mock(query)
+
+    try:
+        if _ASYNC_CLIENT is None:
+            _ASYNC_CLIENT = httpx.AsyncClient(
+                timeout=10,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+            )
+        response = await _ASYNC_CLIENT.get(SERPAPI_URL, params=_serpapi_params(query, api_key))
+        result = _format_results(query, response.json())
+        _cache_put(query, result)
+        return result
 
     except Exception as e:
         return f"搜索时发生错误: {e}，切换到模拟模式"
@@ -89,8 +182,113 @@ def search_mock(query: str) -> str:
 def calculator(expression: str) -> str:
     """简单计算器工具"""
     print(f"🔢 正在计算: {expression}")
+    return _calculate(expression)
+
+
+# 计算器使用 Pratt 解析器把表达式转换为后缀序列，再用栈机求值，不经过 eval/compile
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<op>\*\*|//|[-+*/%^×÷()]))"
+)
+
+# 运算符 -> (绑定强度, 运算函数)
+_BINARY_OPS = {
+    "+": (10, operator.add),
+    "-": (10, operator.sub),
+    "*": (20, operator.mul),
+    "×": (20, operator.mul),
+    "/": (20, operator.truediv),
+    "÷": (20, operator.truediv),
+    "//": (20, operator.floordiv),
+    "%": (20, operator.mod),
+    "**": (40, operator.pow),
+    "^": (40, operator.pow),
+}
+_RIGHT_ASSOC = {"**", "^"}
+_UNARY_BP = 30
+_MAX_POWER_BITS = 100000
+
+
+def _tokenize(expression: str) -> List[Any]:
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN_PATTERN.match(expression, pos)
+        if not match:
+            raise ValueError(f"无法识别的字符 '{expression[pos:].strip()[:1]}'")
+        num = match.group("num")
+        if num is not None:
+            tokens.append(float(num) if any(c in num for c in ".eE") else int(num))
+        else:
+            tokens.append(match.group("op"))
+        pos = match.end()
+    return tokens
+
+
+def _to_postfix(tokens: List[Any]) -> List[Any]:
+    output = []
+    pos = 0
+
+    def parse(min_bp: int):
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError("表达式不完整")
+        token = tokens[pos]
+        pos += 1
+
+        if token == "(":
+            parse(0)
+            if pos >= len(tokens) or tokens[pos] != ")":
+                raise ValueError("缺少右括号")
+            pos += 1
+        elif token in ("-", "+"):
+            parse(_UNARY_BP)
+            if token == "-":
+                output.append("neg")
+        elif isinstance(token, str):
+            raise ValueError(f"意外的符号 '{token}'")
+        else:
+            output.append(token)
+
+        while pos < len(tokens):
+            op = tokens[pos]
+            if op == ")":
+                break
+            if op not in _BINARY_OPS:
+                raise ValueError(f"意外的符号 '{op}'")
+            bp = _BINARY_OPS[op][0]
+            if bp <= min_bp:
+                break
+            pos += 1
+            parse(bp - 1 if op in _RIGHT_ASSOC else bp)
+            output.append(op)
+
+    parse(0)
+    if pos != len(tokens):
+        raise ValueError(f"意外的符号 '{tokens[pos]}'")
+    return output
+
+
+def _evaluate(postfix: List[Any]):
+    stack = []
+    for token in postfix:
+        if token == "neg":
+            stack.append(-stack.pop())
+        elif isinstance(token, str):
+            b = stack.pop()
+            a = stack.pop()
+            if token in _RIGHT_ASSOC and isinstance(a, int) and isinstance(b, int) and a.bit_length() * b > _MAX_POWER_BITS:
+                raise ValueError("指数过大")
+            stack.append(_BINARY_OPS[token][1](a, b))
+        else:
+            stack.append(token)
+    return stack[0]
+
+
+@lru_cache(maxsize=512)
+def _calculate(expression: str) -> str:
     try:
-        result = eval(expression, {"__builtins__": {}}, {})
+        result = _evaluate(_to_postfix(_tokenize(expression)))
         return str(result)
     except Exception as e:
         return f"计算错误: {e}"
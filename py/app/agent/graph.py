@@ -1,22 +1,50 @@
 """Main agent graph definition."""
+from collections import OrderedDict
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from app.agent.state import AgentState
-from app.agent.nodes.router import router_node
-from app.agent.nodes.rag import rag_node
-from app.agent.nodes.search import search_node
+from app.config import settings
+from app.agent.nodes.router import RAG_INTENTS, router_node
+from app.agent.nodes.retrieval import retrieval_node
 from app.agent.nodes.exercise import exercise_node
 from app.agent.nodes.grading import grading_node
 from app.agent.nodes.explanation import explanation_node
 
 
-def after_rag(state: AgentState) -> str:
-    """Determine next step after RAG retrieval."""
-    # If we need search and haven't done it yet
-    if state.get("needs_search", False) and not state.get("search_results"):
-        return "search"
-    else:
-        return "explanation"
+class BoundedMemorySaver(MemorySaver):
+    """In-memory checkpointer that keeps at most ``max_threads`` conversations.
+
+    Threads are tracked in least-recently-written order; once the cap is
+    exceeded the stalest conversation's checkpoints are dropped.
+    """
+
+    def __init__(self, max_threads: int = 1024, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._threads = OrderedDict()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+
+        while len(self._threads) > self.max_threads:
+            stale_id, _ = self._threads.popitem(last=False)
+            self._evict(stale_id)
+
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def _evict(self, thread_id: str) -> None:
+        """Drop all checkpoints and pending writes stored for a thread."""
+        if hasattr(self, "delete_thread"):
+            self.delete_thread(thread_id)
+            return
+
+        self.storage.pop(thread_id, None)
+        for store in (self.writes, getattr(self, "blobs", {})):
+            for key in [k for k in store if k[0] == thread_id]:
+                del store[key]
 
 
 def route_intent(state: AgentState) -> str:
@@ -27,9 +55,16 @@ def route_intent(state: AgentState) -> str:
         return "exercise"
     elif intent == "grading_request":
         return "grading"
+    elif (
+        intent in RAG_INTENTS
+        and state.get("draft_answer")
+        and not state.get("needs_rag", True)
+    ):
+        # Router already drafted a confident answer
+        return "explanation"
     else:
-        # All other intents go through RAG
-        return "rag"
+        # All other intents go through retrieval (RAG + optional web search)
+        return "retrieval"
 
 
 def create_agent_graph():
@@ -40,8 +75,7 @@ def create_agent_graph():
 
     # Add nodes
     workflow.add_node("router", router_node)
-    workflow.add_node("rag", rag_node)
-    workflow.add_node("search", search_node)
+    workflow.add_node("retrieval", retrieval_node)
     workflow.add_node("exercise", exercise_node)
     workflow.add_node("grading", grading_node)
     workflow.add_node("explanation", explanation_node)
@@ -56,32 +90,27 @@ def create_agent_graph():
         {
             "exercise": "exercise",
             "grading": "grading",
-            "rag": "rag",
-        }
-    )
-
-    # After RAG, decide whether to search or generate
-    workflow.add_conditional_edges(
-        "rag",
-        after_rag,
-        {
-            "search": "search",
+            "retrieval": "retrieval",
             "explanation": "explanation",
         }
     )
 
+    # Retrieval fans out to RAG and web search, then feeds the explanation
+    workflow.add_edge("retrieval", "explanation")
+
     # Connect other nodes to END
-    workflow.add_edge("search", "explanation")
     workflow.add_edge("exercise", END)
     workflow.add_edge("grading", END)
     workflow.add_edge("explanation", END)
 
-    # Compile with memory
-    memory = MemorySaver()
+    # Compile with memory, capped so idle conversations don't accumulate
+    memory = BoundedMemorySaver(max_threads=settings.checkpoint_max_threads)
     graph = workflow.compile(checkpointer=memory)
 
     return graph
 
 
-# Global agent graph instance
-agent_graph = create_agent_graph()
+@lru_cache(maxsize=1)
+def get_agent_graph():
+    """Return the shared agent graph, building it on first use."""
+    return create_agent_graph()
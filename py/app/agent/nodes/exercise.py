@@ -1,10 +1,14 @@
 """Exercise generation node."""
-import json
+import logging
+from pydantic import ValidationError
 from langchain_core.messages import HumanMessage, AIMessage
+from app.agent.schemas import ExerciseSchema
 from app.agent.state import AgentState
 from app.services.llm_service import llm_service
 from app.core.prompts import EXERCISE_GENERATION_PROMPT
 
+logger = logging.getLogger(__name__)
+
 
 async def exercise_node(state: AgentState) -> AgentState:
     """Generate practice exercises.
@@ -57,14 +61,15 @@ async def exercise_node(state: AgentState) -> AgentState:
     try:
         # Generate exercises
         messages_for_llm = [HumanMessage(content=prompt)]
-        response = await llm_service.generate(messages_for_llm, temperature=0.7)
+        response = await llm_service.generate(
+            messages_for_llm, temperature=0.7, schema=ExerciseSchema
+        )
 
-        # Try to parse JSON response
+        # Not every provider enforces the schema; fall back to the raw text
         try:
-            result = json.loads(response)
-            exercises = result.get("exercises", [])
-        except json.JSONDecodeError:
-            # If not valid JSON, use raw response
+            result = ExerciseSchema.model_validate_json(response)
+            exercises = [exercise.model_dump() for exercise in result.exercises]
+        except ValidationError:
             exercises = [{"question": response, "answer": "", "explanation": ""}]
 
         state["exercises"] = exercises
@@ -81,9 +86,10 @@ async def exercise_node(state: AgentState) -> AgentState:
         state["response"] = response_text
 
     except Exception as e:
-        print(f"Exercise generation error: {e}")
+        logger.exception("Exercise generation error")
         error_msg = "抱歉，生成练习题时出现错误，请稍后再试。"
         state["messages"].append(AIMessage(content=error_msg))
         state["response"] = error_msg
+        state["error"] = str(e)
 
     return state
@@ -1,10 +1,13 @@
 """Explanation node for generating responses."""
+import logging
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from app.agent.state import AgentState
 from app.services.llm_service import llm_service
 from app.services.search_service import search_service
 from app.core.prompts import SYSTEM_PROMPT, RAG_PROMPT
 
+logger = logging.getLogger(__name__)
+
 
 async def explanation_node(state: AgentState) -> AgentState:
     """Generate explanation/response based on retrieved context.
@@ -33,6 +36,13 @@ async def explanation_node(state: AgentState) -> AgentState:
         formatted_search = search_service.format_results(search_results)
         context_parts.append("**网络搜索结果：**\n" + formatted_search)
 
+    # Router already answered in its own call and nothing was retrieved
+    draft_answer = state.get("draft_answer")
+    if draft_answer and not context_parts:
+        state["messages"].append(AIMessage(content=draft_answer))
+        state["response"] = draft_answer
+        return state
+
     # Combine context
     context = "\n\n".join(context_parts) if context_parts else "无相关参考资料"
 
@@ -49,16 +59,22 @@ async def explanation_node(state: AgentState) -> AgentState:
             HumanMessage(content=prompt)
         ]
 
-        response = await llm_service.generate(messages_for_llm, temperature=0.7)
+        # Stream tokens so graph.astream/astream_events consumers see them as
+        # they arrive; the full text is accumulated for the final message
+        chunks = []
+        async for chunk in llm_service.stream(messages_for_llm, temperature=0.7):
+            chunks.append(chunk)
+        response = "".join(chunks)
 
         # Add response to messages
         state["messages"].append(AIMessage(content=response))
         state["response"] = response
 
     except Exception as e:
-        print(f"Explanation generation error: {e}")
+        logger.exception("Explanation generation error")
         error_msg = "抱歉，生成回答时出现错误，请稍后再试。"
         state["messages"].append(AIMessage(content=error_msg))
         state["response"] = error_msg
+        state["error"] = str(e)
 
     return state
@@ -1,10 +1,14 @@
 """Grading node for homework evaluation."""
-import json
+import logging
+from pydantic import ValidationError
 from langchain_core.messages import HumanMessage, AIMessage
+from app.agent.schemas import GradingSchema
 from app.agent.state import AgentState
 from app.services.llm_service import llm_service
 from app.core.prompts import GRADING_PROMPT
 
+logger = logging.getLogger(__name__)
+
 
 async def grading_node(state: AgentState) -> AgentState:
     """Grade student's homework.
@@ -45,12 +49,14 @@ async def grading_node(state: AgentState) -> AgentState:
     try:
         # Generate grading
         messages_for_llm = [HumanMessage(content=prompt)]
-        response = await llm_service.generate(messages_for_llm, temperature=0.3)
+        response = await llm_service.generate(
+            messages_for_llm, temperature=0.3, schema=GradingSchema
+        )
 
-        # Try to parse JSON response
+        # Not every provider enforces the schema; fall back to the raw text
         try:
-            result = json.loads(response)
-        except json.JSONDecodeError:
+            result = GradingSchema.model_validate_json(response).model_dump()
+        except ValidationError:
             result = {
                 "score": 70,
                 "feedback": response,
@@ -84,9 +90,10 @@ async def grading_node(state: AgentState) -> AgentState:
         state["response"] = response_text
 
     except Exception as e:
-        print(f"Grading error: {e}")
+        logger.exception("Grading error")
         error_msg = "抱歉，批改作业时出现错误，请稍后再试。"
         state["messages"].append(AIMessage(content=error_msg))
         state["response"] = error_msg
+        state["error"] = str(e)
 
     return state
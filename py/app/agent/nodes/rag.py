@@ -1,7 +1,10 @@
 """RAG retrieval node."""
+import logging
 from app.agent.state import AgentState
 from app.services.rag_service import rag_service
 
+logger = logging.getLogger(__name__)
+
 
 async def rag_node(state: AgentState) -> AgentState:
     """Retrieve relevant documents from vector store.
@@ -20,11 +23,12 @@ async def rag_node(state: AgentState) -> AgentState:
     subject = state.get("subject")
 
     try:
-        # Retrieve relevant documents
+        # Retrieve relevant documents; concurrent queries share one embedding call
         documents = await rag_service.retrieve(
             query=query,
             subject=subject,
-            k=5
+            k=5,
+            embedding=state.get("query_embedding")
         )
 
         # Format documents as context
@@ -37,7 +41,7 @@ async def rag_node(state: AgentState) -> AgentState:
             state["needs_search"] = True  # No docs found, try web search
 
     except Exception as e:
-        print(f"RAG retrieval error: {e}")
+        logger.exception("RAG retrieval error")
         state["retrieved_docs"] = []
         state["needs_search"] = True
 
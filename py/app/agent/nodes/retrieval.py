@@ -0,0 +1,32 @@
+"""Retrieval fan-out node combining RAG and web search."""
+import asyncio
+from app.agent.state import AgentState
+from app.agent.nodes.rag import rag_node
+from app.agent.nodes.search import search_node
+
+
+async def retrieval_node(state: AgentState) -> AgentState:
+    """Gather context from the knowledge base and, if needed, the web.
+
+    When the router already expects a web search, RAG retrieval and the
+    search run concurrently so the latency is max(rag, search) instead of
+    their sum. Otherwise RAG runs alone and web search is only used as a
+    fallback when no documents were found.
+
+    Args:
+        state: Current agent state
+
+    Returns:
+        Updated state with retrieved documents and search results
+    """
+    if state.get("needs_search", False):
+        await asyncio.gather(rag_node(state), search_node(state))
+        return state
+
+    await rag_node(state)
+
+    # rag_node flags needs_search when the knowledge base came back empty
+    if state.get("needs_search", False):
+        await search_node(state)
+
+    return state
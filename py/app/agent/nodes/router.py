@@ -1,61 +1,197 @@
 """Router node for intent classification."""
 import json
-import re
+import logging
 from langchain_core.messages import HumanMessage
 from app.agent.state import AgentState
 from app.services.llm_service import llm_service
-from app.core.prompts import INTENT_CLASSIFICATION_PROMPT
+from app.core.prompts import COMBINED_ROUTER_EXPLAIN_PROMPT
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+
+
+def _scan_json_spans(text: str):
+    """Yield each top-level ``{...}`` span in a single left-to-right pass.
+
+    Braces inside JSON string literals are ignored, so nested objects and
+    values such as ``"a{b}"`` are handled correctly.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            if depth > 0:
+                in_string = True
+        elif char == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
 
 
 def extract_json_from_response(response: str) -> dict:
     """Extract JSON from LLM response that may contain extra text."""
-    # Try to find JSON in the response
-    json_patterns = [
-        r'\{[^{}]*\}',  # Simple JSON object
-        r'\{.*?\}',     # Any JSON-like structure
-    ]
-
-    for pattern in json_patterns:
-        matches = re.findall(pattern, response, re.DOTALL)
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
+    for span in _scan_json_spans(response):
+        try:
+            return json.loads(span)
+        except json.JSONDecodeError:
+            continue
 
     return
 
 
-def classify_intent_simple(message: str) -> dict:
-    """Simple rule-based intent classification as fallback."""
-    message_lower = message.lower()
+# Keyword tables for rule-based classification, in priority order
+INTENT_KEYWORDS = {
+    "exercise_request": ("练习", "题目", "出题", "做题"),
+    "grading_request": ("批改", "检查", "对不对", "答案是"),
+    "explanation_request": ("解释", "什么是", "为什么", "怎么理解"),
+    "problem_solving": ("怎么做", "如何解", "求解", "计算"),
+}
+
+SUBJECT_KEYWORDS = {
+    "math": ("数学", "函数", "方程", "几何", "代数", "微积分"),
+    "physics": ("物理", "力学", "电学", "光学", "热学"),
+    "chemistry": ("化学", "元素", "反应", "分子", "原子"),
+}
+
+
+# Intent bits occupy the low half of the mask, subject bits the high half
+SUBJECT_SHIFT = 16
+
+
+def _build_keyword_bits() -> dict:
+    """Assign each keyword the bit of its intent or subject."""
+    kw_bits = {}
+    for i, keywords in enumerate(INTENT_KEYWORDS.values()):
+        for kw in keywords:
+            kw_bits[kw] = 1 << i
+    for i, keywords in enumerate(SUBJECT_KEYWORDS.values()):
+        for kw in keywords:
+            kw_bits[kw] = 1 << (SUBJECT_SHIFT + i)
+    return kw_bits
+
+
+def _build_priority_table(labels: list) -> tuple:
+    """Map every bit combination to the highest-priority label it contains."""
+    table = []
+    for mask in range(1 << len(labels)):
+        label = None
+        for i, candidate in enumerate(labels):
+            if mask & (1 << i):
+                label = candidate
+                break
+        table.append(label)
+    return tuple(table)
+
+
+KW_BITS = _build_keyword_bits()
+INTENT_MASK = (1 << len(INTENT_KEYWORDS)) - 1
+SUBJECT_MASK = (1 << len(SUBJECT_KEYWORDS)) - 1
+INTENT_FROM_BITS = _build_priority_table(list(INTENT_KEYWORDS))
+SUBJECT_FROM_BITS = _build_priority_table(list(SUBJECT_KEYWORDS))
+
+
+def _generate_keyword_scanner(kw_bits: dict):
+    """Generate a scanner function specialized to the keyword tables.
+
+    The keywords and their bits are folded into the source as literals, so
+    the emitted function is a flat chain of ``in`` checks OR-ing into a
+    single integer with no per-call list construction or dict lookups.
+    Only intent keywords are counted.
+    """
+    lines = ["def _scan_keywords(text):", "    bits = 0", "    count = 0"]
+    for kw, bit in kw_bits.items():
+        lines.append(f"    if {kw!r} in text:")
+        lines.append(f"        bits |= {bit}")
+        if bit & INTENT_MASK:
+            lines.append("        count += 1")
+    lines.append("    return bits, count")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["_scan_keywords"]
+
+
+def _build_keyword_matcher():
+    """Compile all keywords into one matcher built once at import.
+
+    The matcher returns the OR of ``KW_BITS`` for every keyword found and
+    the number of distinct intent keywords matched. Uses
+    an Aho-Corasick automaton when pyahocorasick is installed, otherwise a
+    generated flat scanner (see ``_generate_keyword_scanner``).
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for kw, bit in KW_BITS.items():
+            automaton.add_word(kw, (kw, bit))
+        automaton.make_automaton()
+
+        def _scan_keywords(text):
+            bits = 0
+            found = set()
+            for _, (kw, bit) in automaton.iter(text):
+                bits |= bit
+                if bit & INTENT_MASK:
+                    found.add(kw)
+            return bits, len(found)
+
+        return _scan_keywords
+
+    return _generate_keyword_scanner(KW_BITS)
+
+
+_match_keywords = _build_keyword_matcher()
+
+
+def classify_intent_simple(message: str) -> tuple:
+    """Simple rule-based intent classification as fallback.
+
+    Returns:
+        Tuple of (classification result, number of distinct keywords backing
+        the intent); the count is 0 when keywords of several intents matched
+    """
+    bits, intent_hits = _match_keywords(message.lower())
+
+    intent_bits = bits & INTENT_MASK
+    # Keywords of competing intents are a conflict, not agreement
+    if intent_bits & (intent_bits - 1):
+        intent_hits = 0
 
     result = {
-        "intent": "knowledge_question",
-        "subject": None,
+        "intent": INTENT_FROM_BITS[intent_bits] or "knowledge_question",
+        "subject": SUBJECT_FROM_BITS[(bits >> SUBJECT_SHIFT) & SUBJECT_MASK],
         "topic": None,
         "confidence": 0.6
     }
+    return result, intent_hits
+
 
-    # Detect intent
-    if any(kw in message_lower for kw in ["练习", "题目", "出题", "做题"]):
-        result["intent"] = "exercise_request"
-    elif any(kw in message_lower for kw in ["批改", "检查", "对不对", "答案是"]):
-        result["intent"] = "grading_request"
-    elif any(kw in message_lower for kw in ["解释", "什么是", "为什么", "怎么理解"]):
-        result["intent"] = "explanation_request"
-    elif any(kw in message_lower for kw in ["怎么做", "如何解", "求解", "计算"]):
-        result["intent"] = "problem_solving"
+# Router confidence above which its drafted answer is used without retrieval
+DRAFT_ANSWER_CONFIDENCE = 0.9
 
-    # Detect subject
-    if any(kw in message_lower for kw in ["数学", "函数", "方程", "几何", "代数", "微积分"]):
-        result["subject"] = "math"
-    elif any(kw in message_lower for kw in ["物理", "力学", "电学", "光学", "热学"]):
-        result["subject"] = "physics"
-    elif any(kw in message_lower for kw in ["化学", "元素", "反应", "分子", "原子"]):
-        result["subject"] = "chemistry"
+# Intents answered from retrieved context, or from the router's draft
+RAG_INTENTS = frozenset({"knowledge_question", "explanation_request", "problem_solving"})
 
-    return result
+# Hits on a single intent at which the rule-based result is trusted without the LLM
+RULE_MATCH_THRESHOLD = 2
+RULE_MATCH_CONFIDENCE = 0.95
 
 
 async def router_node(state: AgentState) -> AgentState:
@@ -72,45 +208,63 @@ async def router_node(state: AgentState) -> AgentState:
     last_message = messages[-1].content if messages else ""
 
     # First try simple rule-based classification
-    simple_result = classify_intent_simple(last_message)
-
-    # Try LLM classification for better accuracy
-    try:
-        prompt = INTENT_CLASSIFICATION_PROMPT.format(user_input=last_message)
-        messages_for_llm = [HumanMessage(content=prompt)]
-        response = await llm_service.generate(messages_for_llm, temperature=0.3)
-
-        # Try to parse JSON response
-        result = extract_json_from_response(response)
-
-        if result:
-            # Use LLM result if valid
-            state["intent"] = result.get("intent", simple_result["intent"])
-            state["subject"] = result.get("subject", simple_result["subject"])
-            state["topic"] = result.get("topic", simple_result["topic"])
-            state["confidence"] = result.get("confidence", 0.7)
-        else:
-            # Fall back to simple classification
-            state["intent"] = simple_result["intent"]
-            state["subject"] = simple_result["subject"]
-            state["topic"] = simple_result["topic"]
-            state["confidence"] = simple_result["confidence"]
+    simple_result, intent_hits = classify_intent_simple(last_message)
 
-    except Exception as e:
-        print(f"LLM classification error: {e}, using rule-based fallback")
+    state["draft_answer"] = None
+
+    if intent_hits >= RULE_MATCH_THRESHOLD:
+        # Several keywords agree on one intent; the LLM roundtrip adds nothing
         state["intent"] = simple_result["intent"]
         state["subject"] = simple_result["subject"]
         state["topic"] = simple_result["topic"]
-        state["confidence"] = simple_result["confidence"]
+        state["confidence"] = RULE_MATCH_CONFIDENCE
+    else:
+        # Try LLM classification for better accuracy; the same call drafts an
+        # answer for questions the model can handle without references
+        try:
+            prompt = COMBINED_ROUTER_EXPLAIN_PROMPT.format(user_input=last_message)
+            messages_for_llm = [HumanMessage(content=prompt)]
+            response = await llm_service.generate(messages_for_llm, temperature=0.3)
+
+            # Try to parse JSON response
+            result = extract_json_from_response(response)
+
+            if result:
+                # Use LLM result if valid
+                state["intent"] = result.get("intent", simple_result["intent"])
+                state["subject"] = result.get("subject", simple_result["subject"])
+                state["topic"] = result.get("topic", simple_result["topic"])
+                state["confidence"] = result.get("confidence", 0.7)
+                state["draft_answer"] = result.get("answer") or None
+            else:
+                # Fall back to simple classification
+                state["intent"] = simple_result["intent"]
+                state["subject"] = simple_result["subject"]
+                state["topic"] = simple_result["topic"]
+                state["confidence"] = simple_result["confidence"]
+
+        except Exception as e:
+            logger.warning("LLM classification error: %s, using rule-based fallback", e)
+            state["intent"] = simple_result["intent"]
+            state["subject"] = simple_result["subject"]
+            state["topic"] = simple_result["topic"]
+            state["confidence"] = simple_result["confidence"]
 
     # Determine if RAG or search is needed
-    if state["intent"] in ["knowledge_question", "explanation_request", "problem_solving"]:
-        state["needs_rag"] = True
-        state["needs_search"] = state["confidence"] < 0.7
+    if state["intent"] in RAG_INTENTS:
+        # A confident drafted answer makes retrieval and a second LLM call unnecessary
+        state["needs_rag"] = not (
+            state["draft_answer"] and state["confidence"] >= DRAFT_ANSWER_CONFIDENCE
+        )
+        state["needs_search"] = state["needs_rag"] and state["confidence"] < 0.7
     else:
         state["needs_rag"] = False
         state["needs_search"] = False
+        state["draft_answer"] = None
 
-    print(f"Router: intent={state['intent']}, subject={state['subject']}, confidence={state['confidence']}")
+    logger.debug(
+        "Router: intent=%s, subject=%s, confidence=%s",
+        state["intent"], state["subject"], state["confidence"]
+    )
 
     return state
@@ -1,7 +1,10 @@
 """Web search node."""
+import logging
 from app.agent.state import AgentState
 from app.services.search_service import search_service
 
+logger = logging.getLogger(__name__)
+
 
 async def search_node(state: AgentState) -> AgentState:
     """Perform web search for additional information.
@@ -28,13 +31,13 @@ async def search_node(state: AgentState) -> AgentState:
 
     try:
         # Perform search
-        results = search_service.search(query, num_results=5)
+        results = await search_service.asearch(query, num_results=5)
 
         # Store results
         state["search_results"] = results
 
     except Exception as e:
-        print(f"Search error: {e}")
+        logger.exception("Search error")
         state["search_results"] = []
 
     return state
@@ -0,0 +1,34 @@
+"""Pydantic schemas for structured LLM output.
+
+Strict structured output requires every object to forbid extra keys.
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import List
+
+
+class ExerciseItem(BaseModel):
+    """A single generated exercise."""
+    model_config = ConfigDict(extra="forbid")
+
+    question: str
+    type: str
+    answer: str
+    explanation: str
+    knowledge_points: List[str]
+
+
+class ExerciseSchema(BaseModel):
+    """Exercise generation output schema."""
+    model_config = ConfigDict(extra="forbid")
+
+    exercises: List[ExerciseItem]
+
+
+class GradingSchema(BaseModel):
+    """Grading output schema."""
+    model_config = ConfigDict(extra="forbid")
+
+    score: int
+    feedback: str
+    strengths: List[str]
+    improvements: List[str]
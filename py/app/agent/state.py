@@ -19,6 +19,9 @@ class AgentState(TypedDict):
     subject: Optional[str]  # math, physics, chemistry
     topic: Optional[str]  # specific topic
 
+    # Query embedding already computed upstream, reused for retrieval
+    query_embedding: Optional[List[float]]
+
     # Retrieved context
     retrieved_docs: Optional[List[str]]
     search_results: Optional[List[dict]]
@@ -32,5 +35,11 @@ class AgentState(TypedDict):
     needs_rag: bool
     confidence: float
 
+    # Answer drafted by the router in the same call as classification
+    draft_answer: Optional[str]
+
     # Final response
     response: Optional[str]
+
+    # Set by a node that fell back to an error message
+    error: Optional[str]
@@ -1,13 +1,74 @@
 """Chat API routes."""
+import logging
+import orjson
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
-from langchain_core.messages import HumanMessage
+from fastapi.responses import StreamingResponse
+from langchain_core.messages import AIMessage, HumanMessage
 from app.api.schemas.chat import ChatRequest, ChatResponse
-from app.agent.graph import agent_graph
+from app.agent.graph import get_agent_graph
 from app.agent.state import AgentState
+from app.services.response_cache import response_cache
 import uuid
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Only answers that depend on the question alone are shared between users;
+# exercises should vary and gradings depend on the submitted answer
+CACHEABLE_INTENTS = frozenset({"knowledge_question", "explanation_request"})
+
+
+# Per-request fields are filled in by _build_initial_state
+_INITIAL_STATE: AgentState = {
+    "messages": [],
+    "user_id": "",
+    "conversation_id": None,
+    "intent": None,
+    "subject": None,
+    "topic": None,
+    "query_embedding": None,
+    "retrieved_docs": None,
+    "search_results": None,
+    "exercises": None,
+    "grading_result": None,
+    "needs_search": False,
+    "needs_rag": False,
+    "confidence": 0.0,
+    "draft_answer": None,
+    "response": None,
+    "error": None,
+}
+
+
+def _build_initial_state(
+    request: ChatRequest,
+    conversation_id: str,
+    query_embedding: Optional[List[float]] = None
+) -> AgentState:
+    """Create the initial agent state for a chat request."""
+    return {
+        **_INITIAL_STATE,
+        "messages": [HumanMessage(content=request.message)],
+        "user_id": request.user_id,
+        "conversation_id": conversation_id,
+        "query_embedding": query_embedding,
+    }
+
+
+def _extract_sources(result: dict) -> list:
+    """Collect knowledge base and web search sources from a final state."""
+    sources = []
+    if result.get("retrieved_docs"):
+        sources.append({"type": "knowledge_base", "count": len(result["retrieved_docs"])})
+    if result.get("search_results"):
+        sources.extend([
+            {"type": "web_search", "title": r.get("title"), "link": r.get("link")}
+            for r in result["search_results"]
+        ])
+    return sources
+
 
 @router.post("/message", response_model=ChatResponse)
 async def send_message(request: ChatRequest):
@@ -21,54 +82,101 @@ async def send_message(request: ChatRequest):
     """
     try:
         # Generate conversation ID if not provided
-        conversation_id = request.conversation_id or str(uuid.uuid4())
-
-        # Create initial state
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content=request.message)],
-            "user_id": request.user_id,
-            "conversation_id": conversation_id,
-            "intent": None,
-            "subject": None,
-            "topic": None,
-            "retrieved_docs": None,
-            "search_results": None,
-            "exercises": None,
-            "grading_result": None,
-            "needs_search": False,
-            "needs_rag": False,
-            "confidence": 0.0,
-            "response": None,
-        }
-
-        # Run the agent graph
+        conversation_id = request.conversation_id or uuid.uuid4().hex
         config = {"configurable": {"thread_id": conversation_id}}
-        result = await agent_graph.ainvoke(initial_state, config)
 
-        # Extract response
-        response_text = result.get("response", "抱歉，我无法生成回答。")
+        async def run_agent(query_embedding: Optional[List[float]]):
+            # Run the agent graph, reusing the cache's embedding for retrieval
+            initial_state = _build_initial_state(request, conversation_id, query_embedding)
+            result = await get_agent_graph().ainvoke(initial_state, config)
+
+            # Extract response
+            response_text = result.get("response", "抱歉，我无法生成回答。")
+
+            entry = {"response": response_text, "sources": _extract_sources(result)}
+            # Don't cache error fallbacks or intent-specific answers
+            cacheable = (
+                bool(result.get("response"))
+                and not result.get("error")
+                and result.get("intent") in CACHEABLE_INTENTS
+            )
+            return entry, cacheable
+
+        # Identical or near-identical questions are served from the cache
+        entry, cache_hit = await response_cache.get_or_compute(request.message, run_agent)
 
-        # Extract sources if available
-        sources = []
-        if result.get("retrieved_docs"):
-            sources.append({"type": "knowledge_base", "count": len(result["retrieved_docs"])})
-        if result.get("search_results"):
-            sources.extend([
-                {"type": "web_search", "title": r.get("title"), "link": r.get("link")}
-                for r in result["search_results"]
-            ])
+        sources = list(entry["sources"])
+        if cache_hit:
+            # The graph was skipped; record the turn in the conversation anyway
+            await get_agent_graph().aupdate_state(
+                config,
+                {"messages": [
+                    HumanMessage(content=request.message),
+                    AIMessage(content=entry["response"]),
+                ]},
+                as_node="explanation",
+            )
+            sources.append({"type": "cache_hit", "match": cache_hit})
 
         return ChatResponse(
-            response=response_text,
+            response=entry["response"],
             conversation_id=conversation_id,
             sources=sources if sources else None
         )
 
     except Exception as e:
-        print(f"Chat error: {e}")
+        logger.exception("Chat error")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(payload: dict) -> bytes:
+    """Format a payload as a Server-Sent Events data frame."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+@router.post("/message/stream")
+async def stream_message(request: ChatRequest):
+    """Send a message and stream the reply as Server-Sent Events.
+
+    Emits ``token`` events as the explanation is generated, then a single
+    ``done`` event carrying the full response and sources.
+
+    Args:
+        request: Chat request with message and user info
+
+    Returns:
+        Streaming response with media type text/event-stream
+    """
+    conversation_id = request.conversation_id or uuid.uuid4().hex
+
+    async def event_stream():
+        graph = get_agent_graph()
+        initial_state = _build_initial_state(request, conversation_id)
+        config = {"configurable": {"thread_id": conversation_id}}
+
+        try:
+            async for chunk, metadata in graph.astream(initial_state, config, stream_mode="messages"):
+                # Only the explanation node produces user-facing prose;
+                # the router's JSON classification is not forwarded
+                if metadata.get("langgraph_node") == "explanation" and chunk.content:
+                    yield _sse({"type": "token", "content": chunk.content})
+
+            result = (await graph.aget_state(config)).values
+            sources = _extract_sources(result)
+            yield _sse({
+                "type": "done",
+                "response": result.get("response", "抱歉，我无法生成回答。"),
+                "conversation_id": conversation_id,
+                "sources": sources if sources else None,
+            })
+
+        except Exception as e:
+            logger.exception("Chat stream error")
+            yield _sse({"type": "error", "detail": str(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/conversations/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """Get conversation history.
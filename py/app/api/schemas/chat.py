@@ -1,23 +1,62 @@
 """Pydantic schemas for chat API."""
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, List, Literal, Optional, Union
+
+_CONFIG = ConfigDict(extra="forbid", str_strip_whitespace=True)
 
 
 class ChatMessage(BaseModel):
     """Chat message schema."""
+    model_config = _CONFIG
+
     role: str
     content: str
 
 
 class ChatRequest(BaseModel):
     """Chat request schema."""
+    model_config = _CONFIG
+
     message: str
     user_id: str
     conversation_id: Optional[str] = None
 
 
+class KnowledgeSource(BaseModel):
+    """Knowledge base retrieval source."""
+    model_config = _CONFIG
+
+    type: Literal["knowledge_base"] = "knowledge_base"
+    count: int
+
+
+class WebSource(BaseModel):
+    """Web search result source."""
+    model_config = _CONFIG
+
+    type: Literal["web_search"] = "web_search"
+    title: Optional[str] = None
+    link: Optional[str] = None
+
+
+class CacheHitSource(BaseModel):
+    """Marks a response served from the response cache."""
+    model_config = _CONFIG
+
+    type: Literal["cache_hit"] = "cache_hit"
+    match: Literal["exact", "semantic"]
+
+
+Source = Annotated[
+    Union[KnowledgeSource, WebSource, CacheHitSource],
+    Field(discriminator="type")
+]
+
+
 class ChatResponse(BaseModel):
     """Chat response schema."""
+    model_config = _CONFIG
+
     response: str
     conversation_id: str
-    sources: Optional[List[dict]] = None
+    sources: Optional[List[Source]] = None
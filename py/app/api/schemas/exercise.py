@@ -1,10 +1,14 @@
 """Pydantic schemas for exercise API."""
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
+_CONFIG = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
 
 class ExerciseGenerateRequest(BaseModel):
     """Exercise generation request schema."""
+    model_config = _CONFIG
+
     subject: str  # math, physics, chemistry
     topic: Optional[str] = None
     difficulty: str = "intermediate"  # beginner, intermediate, advanced
@@ -14,6 +18,8 @@ class ExerciseGenerateRequest(BaseModel):
 
 class Exercise(BaseModel):
     """Exercise schema."""
+    model_config = _CONFIG
+
     id: Optional[str] = None
     question: str
     type: str
@@ -24,11 +30,15 @@ class Exercise(BaseModel):
 
 class ExerciseGenerateResponse(BaseModel):
     """Exercise generation response schema."""
+    model_config = _CONFIG
+
     exercises: List[Exercise]
 
 
 class ExerciseSubmitRequest(BaseModel):
     """Exercise submission request schema."""
+    model_config = _CONFIG
+
     user_id: str
     exercise_id: str
     answer: str
@@ -36,6 +46,8 @@ class ExerciseSubmitRequest(BaseModel):
 
 class ExerciseSubmitResponse(BaseModel):
     """Exercise submission response schema."""
+    model_config = _CONFIG
+
     score: float
     feedback: str
     correct_answer: Optional[str] = None
@@ -19,27 +19,59 @@ class Settings(BaseSettings):
     llm_timeout: int = 60
     llm_temperature: float = 0.7
     llm_max_tokens: int = 2000
+    # Warm static prompt prefixes at startup; needs server-side prefix caching
+    llm_prefix_cache_warmup: bool = False
 
     # Embedding Configuration
     embedding_api_key: Optional[str] = None
     embedding_model: str = "BAAI/bge-large-zh-v1.5"
     embedding_base_url: str = "https://api-inference.modelscope.cn/v1"
+    # "late" embeds each document's chunks in one request with late chunking;
+    # the endpoint must support the late_chunking flag (e.g. Jina embeddings)
+    chunking_strategy: str = "standard"
+    late_chunking_max_tokens: int = 8192
 
     # SerpAPI Configuration
     serpapi_api_key: str
+    search_cache_size: int = 2048
+    search_cache_ttl: int = 3600
 
     # Database Configuration
     database_url: str = "sqlite+aiosqlite:///./data/student_agent.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
 
     # Vector Store Configuration
     vector_store_path: str = "./data/vector_db"
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    # Debounced persistence of vector stores
+    vector_store_save_interval: int = 30
+    vector_store_save_every_docs: int = 1000
+    # Stores are rebuilt as this FAISS index once they hold enough vectors
+    faiss_index_factory: str = "IVF4096,PQ64"
+    faiss_ivf_min_vectors: int = 160000
+    # Raised to 39 x nlist for IVF indexes, the minimum FAISS trains on cleanly
+    faiss_train_sample_size: int = 160000
+    faiss_nprobe: int = 16
+    # Smaller stores are stored as int8 scalar-quantized vectors
+    faiss_int8_quantize: bool = True
+    # Exhaustive stores this large shortlist on a truncated embedding prefix
+    rag_two_stage_min_vectors: int = 20000
+    rag_prefix_dim: int = 256
+
+    # Agent Configuration
+    checkpoint_max_threads: int = 1024
+
+    # Response Cache Configuration
+    response_cache_size: int = 1024
+    response_cache_similarity: float = 0.95
 
     # Application Configuration
     app_name: str = "Student Learning Agent"
     app_version: str = "1.0.0"
     debug: bool = False
+    log_level: str = "WARNING"
 
     # CORS Configuration
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:5173"]
@@ -1,7 +1,13 @@
 """Embedding service for document vectorization."""
+import asyncio
+import httpx
 from langchain_openai import OpenAIEmbeddings
 from app.config import settings
-from typing import List
+from typing import List, Optional, Set
+
+# Micro-batching of concurrent embed_query calls
+MAX_BATCH = 32
+MAX_WAIT_MS = 5
 
 
 class EmbeddingService:
@@ -10,12 +16,40 @@ class EmbeddingService:
     def __init__(self):
         """Initialize embedding service."""
         # Use ModelScope API for embeddings
-        api_key = settings.embedding_api_key or settings.llm_api_key
+        self._api_key = settings.embedding_api_key or settings.llm_api_key
         self.embeddings = OpenAIEmbeddings(
             model=settings.embedding_model,
-            openai_api_key=api_key,
+            openai_api_key=self._api_key,
             openai_api_base=settings.embedding_base_url,
         )
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Set[asyncio.Task] = set()
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def start(self):
+        """Start the query batching worker on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the query batching worker and close the HTTP client."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed a list of documents.
@@ -28,16 +62,91 @@ class EmbeddingService:
         """
         return await self.embeddings.aembed_documents(texts)
 
+    async def embed_late_chunks(self, chunks: List[str]) -> List[List[float]]:
+        """Embed the chunks of one document with late chunking.
+
+        The chunks are sent in a single request with ``late_chunking``
+        enabled, so the backend encodes them as one sequence and pools each
+        chunk's token span, keeping cross-chunk context in every vector.
+
+        Args:
+            chunks: Consecutive chunks of a single document
+
+        Returns:
+            List of embedding vectors, one per chunk
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=settings.embedding_base_url,
+                headers={"Authorization": f"Bearer {self._api_key}"},
+                timeout=settings.llm_timeout,
+            )
+
+        response = await self._http.post(
+            "/embeddings",
+            json={
+                "model": settings.embedding_model,
+                "input": chunks,
+                "late_chunking": True,
+            },
+        )
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
     async def embed_query(self, text: str) -> List[float]:
         """Embed a single query.
 
+        Concurrent calls are coalesced into one ``aembed_documents`` request
+        by the batching worker.
+
         Args:
             text: Query text
 
         Returns:
             Embedding vector
         """
-        return await self.embeddings.aembed_query(text)
+        self.start()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        """Drain queued queries into batches of up to MAX_BATCH."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + MAX_WAIT_MS / 1000
+
+            while len(batch) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep draining while this batch is in flight
+            task = loop.create_task(self._embed_batch(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _embed_batch(self, batch: list):
+        """Embed one batch and resolve each caller's future."""
+        # Similar lengths together reduce padding on the backend
+        batch.sort(key=lambda item: len(item[0]))
+        try:
+            vectors = await self.embeddings.aembed_documents([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
 
 
 # Global embedding service instance
@@ -39,6 +39,33 @@ INTENT_CLASSIFICATION_PROMPT = """分析用户的输入，判断用户的意图
 }}
 """
 
+# Combined intent classification + direct answer prompt, so obvious
+# questions can be answered in the same roundtrip as routing
+COMBINED_ROUTER_EXPLAIN_PROMPT = """分析用户的输入，判断用户的意图；如果可以直接回答，同时给出回答。
+
+可能的意图类型：
+1. knowledge_question: 询问知识点、概念解释
+2. problem_solving: 需要帮助解决具体问题
+3. exercise_request: 请求生成练习题
+4. grading_request: 请求批改作业
+5. explanation_request: 请求详细解释某个概念
+6. progress_inquiry: 询问学习进度
+
+用户输入: {user_input}
+
+如果意图是 knowledge_question、explanation_request 或 problem_solving，且你无需查阅资料就能准确回答，
+请在 answer 中给出完整、清晰的回答；否则 answer 返回空字符串。
+
+请以JSON格式返回：
+{{
+    "intent": "意图类型",
+    "subject": "学科(math/physics/chemistry)",
+    "topic": "具体主题(如果能识别)",
+    "confidence": 0.0-1.0,
+    "answer": "直接回答或空字符串"
+}}
+"""
+
 # RAG prompt template
 RAG_PROMPT = """基于以下参考资料回答学生的问题。
 
@@ -124,3 +151,11 @@ SEARCH_QUERY_PROMPT = """基于学生的问题，生成适合网络搜索的查
     "queries": ["查询词1", "查询词2", "查询词3"]
 }}
 """
+
+
+# (system prompt, user prompt template) pairs sent on every request of a
+# node; their static prefixes are warmed in the server's prefix cache
+CACHEABLE_PREFIXES = [
+    (None, COMBINED_ROUTER_EXPLAIN_PROMPT),
+    (SYSTEM_PROMPT, RAG_PROMPT),
+]
@@ -0,0 +1,131 @@
+"""Text splitter with precompiled separator patterns."""
+import re
+from typing import Any, Dict, List, Optional, Pattern
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+
+class RegexTextSplitter(RecursiveCharacterTextSplitter):
+    """Recursive character splitter driven by precompiled regexes.
+
+    The base class builds and compiles a pattern for every separator probe
+    and split at every recursion level. Here the search and split patterns
+    are compiled once up front; probing still stops at the first separator
+    present, so text is scanned no further than in the base class. Chunks are
+    identical to the base class.
+    """
+
+    def __init__(
+        self,
+        separators: Optional[List[str]] = None,
+        is_separator_regex: bool = False,
+        **kwargs: Any
+    ):
+        """Initialize the splitter.
+
+        Args:
+            separators: Separators in priority order
+            is_separator_regex: Whether separators are regex patterns
+            **kwargs: Passed through to ``RecursiveCharacterTextSplitter``
+        """
+        super().__init__(
+            separators=separators,
+            is_separator_regex=is_separator_regex,
+            **kwargs
+        )
+        sources = [s if is_separator_regex else re.escape(s) for s in self._separators]
+
+        # Capture the separator only when it is kept in the chunks
+        split_template = "({})" if self._keep_separator else "{}"
+        self._split_patterns: Dict[str, Pattern] = {
+            sep: re.compile(split_template.format(source))
+            for sep, source in zip(self._separators, sources)
+            if sep
+        }
+
+        # None marks the empty separator, which ends the search
+        self._search_patterns: List[Optional[Pattern]] = [
+            re.compile(source) if sep else None
+            for sep, source in zip(self._separators, sources)
+        ]
+
+    def _find_separator(self, text: str, start: int) -> Optional[int]:
+        """Return the index of the highest-priority separator in the text.
+
+        Each separator is probed with one ``search`` in priority order, which
+        stops at its first occurrence.
+
+        Args:
+            text: Text to scan
+            start: Index of the first separator still in play
+
+        Returns:
+            Separator index, or None if an empty separator is reached or no
+            separator occurs
+        """
+        for index in range(start, len(self._search_patterns)):
+            pattern = self._search_patterns[index]
+            if pattern is None:
+                return None
+            if pattern.search(text):
+                return index
+        return None
+
+    def _split_with_pattern(self, text: str, separator: str) -> List[str]:
+        """Split text on a separator, keeping it per ``keep_separator``."""
+        if not separator:
+            return [c for c in text if c]
+
+        parts = self._split_patterns[separator].split(text)
+        if not self._keep_separator:
+            return [s for s in parts if s]
+
+        if self._keep_separator == "end":
+            splits = [parts[i] + parts[i + 1] for i in range(0, len(parts) - 1, 2)]
+            if len(parts) % 2 == 0:
+                splits += parts[-1:]
+            splits.append(parts[-1])
+        else:
+            splits = [parts[i] + parts[i + 1] for i in range(1, len(parts), 2)]
+            if len(parts) % 2 == 0:
+                splits += parts[-1:]
+            splits.insert(0, parts[0])
+        return [s for s in splits if s]
+
+    def _split_text(self, text: str, separators: List[str]) -> List[str]:
+        """Split text recursively, mirroring the base class algorithm."""
+        offset = len(self._separators) - len(separators)
+        index = self._find_separator(text, offset)
+
+        if index is None:
+            # Fall back to the last separator, which is "" for character splits
+            separator = separators[-1]
+            new_separators: List[str] = []
+            for sep in separators:
+                if not sep:
+                    separator = sep
+                    break
+        else:
+            separator = self._separators[index]
+            new_separators = self._separators[index + 1:]
+
+        splits = self._split_with_pattern(text, separator)
+
+        final_chunks: List[str] = []
+        good_splits: List[str] = []
+        merge_separator = "" if self._keep_separator else separator
+        for s in splits:
+            if self._length_function(s) < self._chunk_size:
+                good_splits.append(s)
+                continue
+
+            if good_splits:
+                final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+                good_splits = []
+            if not new_separators:
+                final_chunks.append(s)
+            else:
+                final_chunks.extend(self._split_text(s, new_separators))
+
+        if good_splits:
+            final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+        return final_chunks
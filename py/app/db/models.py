@@ -1,17 +1,32 @@
 """Database models using SQLAlchemy."""
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+import os
+import time
 import uuid
 
 Base = declarative_base()
 
 
 def generate_uuid():
-    """Generate a UUID."""
-    return uuid.uuid4()
+    """Generate a time-ordered UUID (version 7).
+
+    The leading 48 bits are a millisecond timestamp, so new rows append to
+    the right edge of the primary key B-tree instead of landing at random.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76  # version
+        | ((rand >> 62) & 0xFFF) << 64
+        | 0b10 << 62  # RFC 4122 variant
+        | (rand & ((1 << 62) - 1))
+    )
+    return uuid.UUID(int=value)
 
 
 class User(Base):
@@ -33,7 +48,7 @@ class Conversation(Base):
     __tablename__ = "conversations"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     title = Column(String, default="New Conversation")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -46,6 +61,10 @@ class Conversation(Base):
 class Message(Base):
     """Message model."""
     __tablename__ = "messages"
+    __table_args__ = (
+        # Serves "latest N messages of a conversation" as an index range scan
+        Index("ix_msg_conv_created", "conversation_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False)
@@ -80,10 +99,13 @@ class Exercise(Base):
 class ExerciseSubmission(Base):
     """Exercise submission model."""
     __tablename__ = "exercise_submissions"
+    __table_args__ = (
+        Index("ix_sub_user_exercise", "user_id", "exercise_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    exercise_id = Column(UUID(as_uuid=True), ForeignKey("exercises.id"), nullable=False)
+    exercise_id = Column(UUID(as_uuid=True), ForeignKey("exercises.id"), nullable=False, index=True)
     user_answer = Column(Text, nullable=False)
     score = Column(Float)
     feedback = Column(JSON, default=dict)
@@ -97,6 +119,9 @@ class ExerciseSubmission(Base):
 class TopicProgress(Base):
     """Topic progress tracking model."""
     __tablename__ = "topic_progress"
+    __table_args__ = (
+        Index("ix_prog_user_subject_topic", "user_id", "subject", "topic", unique=True),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
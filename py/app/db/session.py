@@ -1,16 +1,45 @@
 """Database session management."""
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.config import settings
 from app.db.models import Base
 
+# Applied to every new SQLite connection: WAL lets readers proceed while a
+# writer commits, and mmap I/O avoids a read() syscall per page
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA mmap_size=268435456",
+)
+
+is_sqlite = settings.database_url.startswith("sqlite")
 
 # Create async engine
+engine_options = {}
+if ":memory:" not in settings.database_url:
+    engine_options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    future=True
+    future=True,
+    **engine_options
 )
 
+if is_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune each SQLite connection for concurrent access."""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
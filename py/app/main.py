@@ -1,31 +1,86 @@
 """Main FastAPI application."""
+import asyncio
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from app.agent.graph import get_agent_graph
 from app.config import settings
+from app.core.embeddings import embedding_service
+from app.core.prompts import CACHEABLE_PREFIXES
+from app.services.llm_service import llm_service
+from app.services.rag_service import SUBJECTS
+from app.services.search_service import search_service
+from app.services.vector_store import vector_store_manager
 from app.db.session import init_db
 from app.api.routes import chat
 
+logger = logging.getLogger(__name__)
+
+
+def configure_logging() -> QueueListener:
+    """Route all log records through a queue drained on a background thread.
+
+    Handlers only enqueue records, so formatting and writing to stdout never
+    block the event loop.
+
+    Returns:
+        The listener; start it before serving and stop it on shutdown
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    queue = SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(queue)]
+    root.setLevel(settings.log_level.upper())
+
+    return QueueListener(queue, handler, respect_handler_level=True)
+
+
+log_listener = configure_logging()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
-    print("Initializing database...")
+    log_listener.start()
+    logger.info("Initializing database...")
     await init_db()
-    print("Application started successfully!")
+    logger.info("Loading vector stores...")
+    await vector_store_manager.warm_up(SUBJECTS)
+    autosave_task = asyncio.create_task(
+        vector_store_manager.autosave(settings.vector_store_save_interval)
+    )
+    embedding_service.start()
+    # Compile the agent graph now rather than on the first request
+    get_agent_graph()
+    if settings.llm_prefix_cache_warmup:
+        logger.info("Warming LLM prompt prefix cache...")
+        await llm_service.warm_prefix_cache(CACHEABLE_PREFIXES)
+    logger.info("Application started successfully!")
 
     yield
 
     # Shutdown
-    print("Application shutting down...")
+    logger.info("Application shutting down...")
+    await embedding_service.stop()
+    await search_service.aclose()
+    autosave_task.cancel()
+    await vector_store_manager.flush()
+    log_listener.stop()
 
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -1,8 +1,28 @@
 """LLM service for DeepSeek integration via ModelScope API."""
+import asyncio
+import logging
+import string
+from functools import lru_cache
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from pydantic import BaseModel
 from app.config import settings
-from typing import List, AsyncIterator
+from typing import List, AsyncIterator, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _response_format(schema: Type[BaseModel]) -> dict:
+    """Build the strict json_schema response format for a schema once."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "schema": schema.model_json_schema(),
+            "strict": True,
+        },
+    }
 
 
 class LLMService:
@@ -24,7 +44,8 @@ class LLMService:
         self,
         messages: List[BaseMessage],
         temperature: float = None,
-        max_tokens: int = None
+        max_tokens: int = None,
+        schema: Optional[Type[BaseModel]] = None
     ) -> str:
         """Generate a response from the LLM.
 
@@ -32,6 +53,9 @@ class LLMService:
             messages: List of messages for the conversation
             temperature: Optional temperature override
             max_tokens: Optional max tokens override
+            schema: Optional pydantic model; requests strict JSON matching
+                its schema. Providers without strict structured output may
+                still deviate, so callers validate the result
 
         Returns:
             Generated response text
@@ -41,6 +65,8 @@ class LLMService:
             llm = llm.bind(temperature=temperature)
         if max_tokens is not None:
             llm = llm.bind(max_tokens=max_tokens)
+        if schema is not None:
+            llm = llm.bind(response_format=_response_format(schema))
 
         response = await llm.ainvoke(messages)
         return response.content
@@ -71,6 +97,27 @@ class LLMService:
             if chunk.content:
                 yield chunk.content
 
+    async def warm_prefix_cache(self, prefixes: List[Tuple[Optional[str], str]]):
+        """Prefill static prompt prefixes so the server keeps their KV cache.
+
+        Only useful against endpoints with automatic prefix caching (e.g.
+        vLLM/SGLang); elsewhere it costs one tiny request per prefix. Each
+        template is cut at its first placeholder so the warmed text is
+        byte-identical to the start of real requests.
+
+        Args:
+            prefixes: (system prompt or None, user prompt template) pairs
+        """
+        async def warm(system_prompt: Optional[str], template: str):
+            static_text = next(string.Formatter().parse(template))[0]
+            messages = self.create_messages(system_prompt=system_prompt, user_message=static_text)
+            try:
+                await self.generate(messages, max_tokens=1)
+            except Exception as e:
+                logger.warning("Prefix cache warm-up error: %s", e)
+
+        await asyncio.gather(*(warm(system, template) for system, template in prefixes))
+
     def create_messages(
         self,
         system_prompt: str = None,
@@ -1,17 +1,45 @@
 """RAG (Retrieval Augmented Generation) service."""
-from typing import List, Optional
+import asyncio
+import itertools
+from typing import List, Optional, Tuple
+import numpy as np
 from langchain_core.documents import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from app.core.embeddings import embedding_service
+from app.core.text_splitter import RegexTextSplitter
 from app.services.vector_store import vector_store_manager
 from app.config import settings
 
+SUBJECTS = ["math", "physics", "chemistry"]
+
+
+def _top_k(results: List[Tuple[Document, float]], k: int) -> List[Tuple[Document, float]]:
+    """Return the k highest-scoring results, best first.
+
+    Uses ``np.partition`` so only the selected hits are sorted. Ties keep
+    their original order.
+    """
+    if k <= 0 or not results:
+        return []
+
+    scores = np.fromiter((score for _, score in results), dtype=np.float32, count=len(results))
+    if k < len(scores):
+        # Partition finds the k-th best score; ties at it are taken in order
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        idx = np.sort(np.concatenate([above, ties]))
+    else:
+        idx = np.arange(len(scores))
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [results[i] for i in idx]
+
 
 class RAGService:
     """Service for RAG operations."""
 
     def __init__(self):
         """Initialize RAG service."""
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.text_splitter = RegexTextSplitter(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap,
             separators=["\n\n", "\n", "。", "！", "？", ".", "!", "?", " ", ""],
@@ -40,24 +68,79 @@ class RAGService:
             subject: Subject category (math, physics, chemistry)
         """
         # Split documents into chunks
-        chunks = self.split_documents(documents)
+        await self.add_chunks(self.split_documents(documents), subject)
+
+    async def add_chunks(
+        self,
+        chunks: List[Document],
+        subject: str
+    ):
+        """Add already split chunks to the vector store.
 
+        Args:
+            chunks: List of document chunks
+            subject: Subject category (math, physics, chemistry)
+        """
         # Add subject metadata
         for chunk in chunks:
             chunk.metadata["subject"] = subject
 
+        embeddings = None
+        if settings.chunking_strategy == "late":
+            embeddings = await self._embed_late(chunks)
+
         # Get vector store for subject
-        store = vector_store_manager.get_store(subject)
+        store = await vector_store_manager.aget_store(subject)
 
         # Add documents to store
-        await store.add_documents(chunks)
+        await store.add_documents(chunks, embeddings=embeddings)
+
+    async def _embed_late(self, chunks: List[Document]) -> List[List[float]]:
+        """Embed chunks with one late-chunking request per source document.
+
+        Consecutive chunks with identical metadata came from the same loaded
+        document. Documents longer than ``late_chunking_max_tokens`` (counted
+        conservatively as characters) fall back to per-chunk embeddings.
+
+        Args:
+            chunks: Document chunks in split order
+
+        Returns:
+            List of embedding vectors, one per chunk
+        """
+        groups = [
+            [chunk.page_content for chunk in group]
+            for _, group in itertools.groupby(chunks, key=lambda chunk: chunk.metadata)
+        ]
+
+        async def embed_group(texts: List[str]) -> List[List[float]]:
+            if sum(len(text) for text in texts) <= settings.late_chunking_max_tokens:
+                return await embedding_service.embed_late_chunks(texts)
+            return await embedding_service.embed_documents(texts)
+
+        results = await asyncio.gather(*[embed_group(texts) for texts in groups])
+        return list(itertools.chain.from_iterable(results))
+
+    async def has_documents(self, subject: Optional[str] = None) -> bool:
+        """Check whether any store that a retrieval would search is populated.
+
+        Args:
+            subject: Optional subject filter
+
+        Returns:
+            True if at least one relevant store has been built
+        """
+        subjects = [subject] if subject else SUBJECTS
+        stores = await asyncio.gather(*[vector_store_manager.aget_store(subj) for subj in subjects])
+        return any(store.vector_store is not None for store in stores)
 
     async def retrieve(
         self,
         query: str,
         subject: Optional[str] = None,
         k: int = 5,
-        score_threshold: float = 0.0
+        score_threshold: float = 0.0,
+        embedding: Optional[List[float]] = None
     ) -> List[Document]:
         """Retrieve relevant documents.
 
@@ -66,25 +149,51 @@ class RAGService:
             subject: Optional subject filter
             k: Number of documents to retrieve
             score_threshold: Minimum relevance score
+            embedding: Precomputed query embedding, if the caller has one
+
+        Returns:
+            List of relevant documents
+        """
+        if not await self.has_documents(subject):
+            return []
+
+        # Embed once and reuse the vector for every subject store
+        if embedding is None:
+            embedding = await embedding_service.embed_query(query)
+        return await self.retrieve_by_vector(embedding, subject, k, score_threshold)
+
+    async def retrieve_by_vector(
+        self,
+        embedding: List[float],
+        subject: Optional[str] = None,
+        k: int = 5,
+        score_threshold: float = 0.0
+    ) -> List[Document]:
+        """Retrieve relevant documents for a precomputed query embedding.
+
+        Args:
+            embedding: Query embedding vector
+            subject: Optional subject filter
+            k: Number of documents to retrieve
+            score_threshold: Minimum relevance score
 
         Returns:
             List of relevant documents
         """
         if subject:
             # Search in specific subject store
-            store = vector_store_manager.get_store(subject)
-            results = await store.similarity_search_with_score(query, k=k)
+            store = await vector_store_manager.aget_store(subject)
+            results = await store.similarity_search_with_score_by_vector(embedding, k=k)
         else:
-            # Search across all subjects
-            all_results = []
-            for subj in ["math", "physics", "chemistry"]:
-                store = vector_store_manager.get_store(subj)
-                results = await store.similarity_search_with_score(query, k=k)
-                all_results.extend(results)
-
-            # Sort by score and take top k
-            all_results.sort(key=lambda x: x[1], reverse=True)
-            results = all_results[:k]
+            # Search across all subjects concurrently
+            stores = await asyncio.gather(*[vector_store_manager.aget_store(subj) for subj in SUBJECTS])
+            results_per_subj = await asyncio.gather(*[
+                store.similarity_search_with_score_by_vector(embedding, k=k)
+                for store in stores
+            ])
+            all_results = list(itertools.chain.from_iterable(results_per_subj))
+
+            results = _top_k(all_results, k)
 
         # Filter by score threshold
         filtered_results = [
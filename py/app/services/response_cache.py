@@ -0,0 +1,182 @@
+"""Exact + semantic response cache for the chat endpoint."""
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.embeddings import embedding_service
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Two-tier cache of agent responses keyed by the user's message.
+
+    Exact hits are looked up by a hash of the normalized message. On an exact
+    miss the message is embedded and compared against recent queries; a
+    cosine similarity at or above ``similarity_threshold`` counts as a
+    semantic hit. The query embedding is handed to ``compute`` so a miss
+    does not embed the message twice. Concurrent requests for the same
+    message share a single computation, even when caching is disabled with
+    ``max_entries=0``, unless its result is not cacheable; those requests
+    then compute their own response.
+    """
+
+    def __init__(self, max_entries: int = 1024, similarity_threshold: float = 0.95):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Ring buffer of L2-normalized query embeddings with parallel keys
+        self._embeddings: Optional[np.ndarray] = None
+        self._embedding_keys: List[Optional[str]] = [None] * max_entries
+        self._next_row = 0
+
+    @staticmethod
+    def make_key(message: str) -> str:
+        """Hash the normalized message for exact lookups."""
+        return hashlib.sha1(message.strip().lower().encode()).hexdigest()
+
+    async def get_or_compute(
+        self,
+        message: str,
+        compute: Callable[[Optional[List[float]]], Awaitable[Tuple[dict, bool]]]
+    ) -> Tuple[dict, Optional[str]]:
+        """Return a cached response for the message, computing it on a miss.
+
+        Args:
+            message: User message
+            compute: Coroutine factory called with the query embedding (None
+                if it was not computed) and returning ``(entry, cacheable)``
+
+        Returns:
+            Tuple of (entry, hit type) where hit type is "exact", "semantic"
+            or None when the entry was freshly computed
+        """
+        key = self.make_key(message)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry, "exact"
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            entry = await asyncio.shield(inflight)
+            if entry is not None:
+                return entry, "exact"
+            # The leader's response was specific to its own request
+            entry, hit, _ = await self._lookup_or_compute(key, message, compute)
+            return entry, hit
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry, hit, cacheable = await self._lookup_or_compute(key, message, compute)
+            # Waiters get only responses that may be served to anyone
+            future.set_result(entry if cacheable else None)
+            return entry, hit
+
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future doesn't log a warning
+            future.exception()
+            raise
+
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _lookup_or_compute(
+        self,
+        key: str,
+        message: str,
+        compute: Callable[[Optional[List[float]]], Awaitable[Tuple[dict, bool]]]
+    ) -> Tuple[dict, Optional[str], bool]:
+        """Serve a semantic hit or compute the response, caching it if allowed.
+
+        Returns:
+            Tuple of (entry, hit type, cacheable)
+        """
+        vector, embedding = await self._embed(message) if self.max_entries > 0 else (None, None)
+        if embedding is not None:
+            entry = self._semantic_lookup(embedding)
+            if entry is not None:
+                return entry, "semantic", True
+
+        entry, cacheable = await compute(vector)
+        if cacheable:
+            self._store(key, embedding, entry)
+        return entry, None, cacheable
+
+    async def _embed(self, message: str) -> Tuple[Optional[List[float]], Optional[np.ndarray]]:
+        """Embed a message.
+
+        Returns:
+            Tuple of (raw embedding, L2-normalized embedding); both None if
+            embedding fails
+        """
+        try:
+            vector = await embedding_service.embed_query(message)
+        except Exception as e:
+            logger.warning("Response cache embedding error: %s", e)
+            return None, None
+
+        embedding = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return vector, (embedding / norm if norm else None)
+
+    def _semantic_lookup(self, embedding: np.ndarray) -> Optional[dict]:
+        """Find the cached response whose query is most similar."""
+        if self._embeddings is None or self._embeddings.shape[1] != embedding.shape[0]:
+            return None
+
+        sims = self._embeddings @ embedding
+        row = int(np.argmax(sims))
+        if sims[row] < self.similarity_threshold:
+            return None
+
+        key = self._embedding_keys[row]
+        entry = self._entries.get(key) if key is not None else None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, embedding: Optional[np.ndarray], entry: dict):
+        """Insert an entry, evicting the least recently used one if full."""
+        if self.max_entries <= 0:
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        if embedding is None:
+            return
+
+        if self._embeddings is None or self._embeddings.shape[1] != embedding.shape[0]:
+            self._embeddings = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+            self._embedding_keys = [None] * self.max_entries
+            self._next_row = 0
+
+        # Rows whose entry was evicted from the LRU simply stop matching
+        row = self._next_row
+        self._embeddings[row] = embedding
+        self._embedding_keys[row] = key
+        self._next_row = (row + 1) % self.max_entries
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_size,
+    similarity_threshold=settings.response_cache_similarity,
+)
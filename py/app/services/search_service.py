@@ -1,8 +1,15 @@
 """Search service using SerpAPI."""
+import logging
 from typing import List, Dict, Optional
+import httpx
+from cachetools import TTLCache
 from serpapi import GoogleSearch
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+SERPAPI_URL = "https://serpapi.com/search"
+
 
 class SearchService:
     """Service for web search using SerpAPI."""
@@ -10,6 +17,12 @@ class SearchService:
     def __init__(self):
         """Initialize search service."""
         self.api_key = settings.serpapi_api_key
+        # Web results for the same query rarely change within the TTL
+        self._cache: TTLCache = TTLCache(
+            maxsize=settings.search_cache_size,
+            ttl=settings.search_cache_ttl
+        )
+        self._client: Optional[httpx.AsyncClient] = None
 
     def search(
         self,
@@ -36,22 +49,78 @@ class SearchService:
             })
 
             results = search.get_dict()
-            organic_results = results.get("organic_results", [])
+            return self._extract_organic(results, num_results)
+
+        except Exception as e:
+            logger.exception("Search error")
+            return []
+
+    async def asearch(
+        self,
+        query: str,
+        num_results: int = 5,
+        language: str = "zh-cn"
+    ) -> List[Dict]:
+        """Perform a web search without blocking the event loop.
+
+        Calls the SerpAPI endpoint over a shared async HTTP client and caches
+        non-empty results by (query, language, num_results).
+
+        Args:
+            query: Search query
+            num_results: Number of results to return
+            language: Search language
 
-            formatted_results = []
-            for result in organic_results[:num_results]:
-                formatted_results.append({
-                    "title": result.get("title", ""),
-                    "link": result.get("link", ""),
-                    "snippet": result.get("snippet", ""),
-                })
+        Returns:
+            List of search results
+        """
+        key = (query, language, num_results)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
 
-            return formatted_results
+        try:
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=10)
+
+            response = await self._client.get(SERPAPI_URL, params={
+                "engine": "google",
+                "q": query,
+                "api_key": self.api_key,
+                "num": num_results,
+                "hl": language,
+            })
+            response.raise_for_status()
+            formatted_results = self._extract_organic(response.json(), num_results)
 
         except Exception as e:
-            print(f"Search error: {e}")
+            logger.exception("Search error")
             return []
 
+        if formatted_results:
+            self._cache[key] = formatted_results
+        return formatted_results
+
+    async def aclose(self):
+        """Close the shared async HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _extract_organic(self, results: Dict, num_results: int) -> List[Dict]:
+        """Pick title/link/snippet from SerpAPI organic results."""
+        organic_results = results.get("organic_results", [])
+
+        formatted_results = []
+        for result in organic_results[:num_results]:
+            formatted_results.append({
+                "title": result.get("title", ""),
+                "link": result.get("link", ""),
+                "snippet": result.get("snippet", ""),
+            })
+
+        return formatted_results
+
     def format_results(self, results: List[Dict]) -> str:
         """Format search results into a readable string.
 
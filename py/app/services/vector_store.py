@@ -1,12 +1,21 @@
 """FAISS vector store implementation."""
+import asyncio
+import logging
 import os
 import pickle
 from typing import List, Dict, Optional, Tuple
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from app.core.embeddings import embedding_service
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# FAISS k-means wants at least this many training points per IVF list
+IVF_MIN_TRAIN_PER_LIST = 39
+
 
 class VectorStore:
     """FAISS vector store for document retrieval."""
@@ -20,41 +29,162 @@ class VectorStore:
         self.subject = subject
         self.store_path = os.path.join(settings.vector_store_path, subject)
         self.vector_store: Optional[FAISS] = None
+        self._read_only = False
+        self._prefix_index = None
+        self._dirty = False
+        self._unsaved_docs = 0
+        self._write_lock = asyncio.Lock()
         self._load_or_create()
 
     def _load_or_create(self):
         """Load existing vector store or create a new one."""
         if os.path.exists(self.store_path):
             try:
-                self.vector_store = FAISS.load_local(
-                    self.store_path,
-                    embedding_service.embeddings,
-                    allow_dangerous_deserialization=True
-                )
+                self.vector_store = self._load_local()
             except Exception as e:
-                print(f"Error loading vector store: {e}")
+                logger.exception("Error loading vector store %s", self.subject)
                 self.vector_store = None
         else:
             self.vector_store = None
 
-    async def add_documents(self, documents: List[Document]):
+    def _load_local(self) -> FAISS:
+        """Load the saved store with its index memory-mapped read-only.
+
+        Mapping keeps IVF inverted lists on disk instead of reading the whole
+        index into RAM.
+
+        Returns:
+            FAISS vector store
+        """
+        index = faiss.read_index(
+            os.path.join(self.store_path, "index.faiss"),
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        )
+        self._apply_search_params(index)
+        self._read_only = True
+
+        with open(os.path.join(self.store_path, "index.pkl"), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        return FAISS(
+            embedding_service.embeddings,
+            index,
+            docstore,
+            index_to_docstore_id
+        )
+
+    def _apply_search_params(self, index):
+        """Set the number of probed IVF lists if the index is an IVF index."""
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = settings.faiss_nprobe
+
+    def _make_writable(self):
+        """Replace a memory-mapped index with an in-memory copy before writes."""
+        if self._read_only and self.vector_store is not None:
+            index = faiss.read_index(os.path.join(self.store_path, "index.faiss"))
+            self._apply_search_params(index)
+            self.vector_store.index = index
+            self._read_only = False
+
+    def _maybe_compress(self):
+        """Rebuild a flat or int8 index in a compressed form.
+
+        Large stores become IVF-PQ; IVF needs enough vectors to train its
+        coarse quantizer, so smaller stores are scalar-quantized to int8
+        instead, which still cuts memory and bandwidth 4x with SIMD kernels.
+        An int8 store is promoted to IVF-PQ once it grows large enough.
+        """
+        index = self.vector_store.index
+        is_flat = isinstance(index, faiss.IndexFlat)
+        if not (is_flat or isinstance(index, faiss.IndexScalarQuantizer)):
+            return
+
+        if index.ntotal >= settings.faiss_ivf_min_vectors:
+            compressed = faiss.index_factory(index.d, settings.faiss_index_factory, index.metric_type)
+        elif is_flat and settings.faiss_int8_quantize:
+            compressed = faiss.IndexScalarQuantizer(
+                index.d, faiss.ScalarQuantizer.QT_8bit, index.metric_type
+            )
+        else:
+            return
+
+        sample_size = settings.faiss_train_sample_size
+        ivf = faiss.try_extract_index_ivf(compressed)
+        if ivf is not None:
+            min_train = IVF_MIN_TRAIN_PER_LIST * ivf.nlist
+            if index.ntotal < min_train:
+                logger.warning(
+                    "Store %s has %d vectors, IVF with %d lists needs %d; not compressing",
+                    self.subject, index.ntotal, ivf.nlist, min_train
+                )
+                return
+            sample_size = max(sample_size, min_train)
+
+        vectors = index.reconstruct_n(0, index.ntotal)
+        rng = np.random.default_rng(0)
+        sample_size = min(index.ntotal, sample_size)
+        sample = vectors[rng.choice(index.ntotal, sample_size, replace=False)]
+
+        compressed.train(sample)
+        compressed.add(vectors)
+        self._apply_search_params(compressed)
+        self.vector_store.index = compressed
+
+    async def add_documents(
+        self,
+        documents: List[Document],
+        embeddings: Optional[List[List[float]]] = None
+    ):
         """Add documents to the vector store.
 
+        The store is written to disk once ``vector_store_save_every_docs``
+        documents have accumulated; otherwise the periodic autosave (or an
+        explicit ``flush``) persists it.
+
+        Embedding happens before the write lock is taken, so concurrent
+        batches overlap their embedding requests.
+
         Args:
             documents: List of Document objects
+            embeddings: Precomputed embeddings, one per document
         """
-        if self.vector_store is None:
-            # Create new vector store
-            self.vector_store = await FAISS.afrom_documents(
-                documents,
-                embedding_service.embeddings
-            )
-        else:
-            # Add to existing vector store
-            await self.vector_store.aadd_documents(documents)
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        if embeddings is None:
+            embeddings = await embedding_service.embeddings.aembed_documents(texts)
+        text_embeddings = list(zip(texts, embeddings))
+
+        async with self._write_lock:
+            self._make_writable()
+
+            if self.vector_store is None:
+                # Create new vector store
+                self.vector_store = FAISS.from_embeddings(
+                    text_embeddings,
+                    embedding_service.embeddings,
+                    metadatas=metadatas
+                )
+            else:
+                # Add to existing vector store
+                self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+
+            self._prefix_index = None
+            self._dirty = True
+            self._unsaved_docs += len(documents)
+            save_now = self._unsaved_docs >= settings.vector_store_save_every_docs
 
-        # Save to disk
-        self.save()
+        if save_now:
+            await self.flush()
+
+    async def flush(self):
+        """Write pending changes to disk in a worker thread."""
+        async with self._write_lock:
+            if not self._dirty:
+                return
+            await asyncio.to_thread(self.save)
+            self._dirty = False
+            self._unsaved_docs = 0
 
     async def similarity_search(
         self,
@@ -108,9 +238,101 @@ class VectorStore:
         )
         return results
 
+    async def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """Search for similar documents using a precomputed query embedding.
+
+        Args:
+            embedding: Query embedding vector
+            k: Number of results to return
+            filter: Optional metadata filter
+
+        Returns:
+            List of (document, score) tuples
+        """
+        if self.vector_store is None:
+            return []
+
+        if filter is None and self._use_two_stage():
+            # Searching, and rebuilding the prefix index after adds, scans
+            # the whole store; keep it off the event loop
+            return await asyncio.to_thread(self._two_stage_search, embedding, k)
+
+        results = await self.vector_store.asimilarity_search_with_score_by_vector(
+            embedding,
+            k=k,
+            filter=filter
+        )
+        return results
+
+    def _use_two_stage(self) -> bool:
+        """Whether the index is a large exhaustive scan worth a prefix pass."""
+        index = self.vector_store.index
+        return (
+            faiss.try_extract_index_ivf(index) is None
+            and index.ntotal >= settings.rag_two_stage_min_vectors
+            and index.d > settings.rag_prefix_dim
+        )
+
+    def _build_prefix_index(self, index) -> faiss.IndexFlatIP:
+        """Index the L2-normalized leading dimensions of every vector."""
+        prefix = np.ascontiguousarray(
+            index.reconstruct_n(0, index.ntotal)[:, :settings.rag_prefix_dim]
+        )
+        faiss.normalize_L2(prefix)
+        prefix_index = faiss.IndexFlatIP(settings.rag_prefix_dim)
+        prefix_index.add(prefix)
+        return prefix_index
+
+    def _two_stage_search(
+        self,
+        embedding: List[float],
+        k: int
+    ) -> List[Tuple[Document, float]]:
+        """Shortlist with truncated embeddings, then rerank with full ones.
+
+        Stage 1 scans a cosine index over the first ``rag_prefix_dim``
+        dimensions for ``4k`` candidates; stage 2 scores only those against
+        the full query with the store's own metric, so returned scores match
+        a regular search.
+
+        Runs in a worker thread, so the prefix index is read once and
+        rebuilt whenever it no longer covers every vector.
+        """
+        index = self.vector_store.index
+        prefix_index = self._prefix_index
+        if prefix_index is None or prefix_index.ntotal != index.ntotal:
+            prefix_index = self._prefix_index = self._build_prefix_index(index)
+
+        query = np.asarray(embedding, dtype=np.float32)
+
+        prefix_query = query[None, :settings.rag_prefix_dim].copy()
+        faiss.normalize_L2(prefix_query)
+        _, candidates = prefix_index.search(prefix_query, min(4 * k, prefix_index.ntotal))
+        candidates = candidates[0][candidates[0] >= 0]
+
+        full = index.reconstruct_batch(candidates)
+        if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            scores = full @ query
+            order = np.argsort(-scores)[:k]
+        else:
+            scores = ((full - query) ** 2).sum(axis=1)
+            order = np.argsort(scores)[:k]
+
+        results = []
+        for i in order:
+            doc_id = self.vector_store.index_to_docstore_id[int(candidates[i])]
+            results.append((self.vector_store.docstore.search(doc_id), float(scores[i])))
+        return results
+
     def save(self):
         """Save vector store to disk."""
         if self.vector_store is not None:
+            self._maybe_compress()
             os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
             self.vector_store.save_local(self.store_path)
 
@@ -120,6 +342,7 @@ class VectorStore:
             import shutil
             shutil.rmtree(self.store_path)
         self.vector_store = None
+        self._prefix_index = None
 
 
 class VectorStoreManager:
@@ -128,6 +351,7 @@ class VectorStoreManager:
     def __init__(self):
         """Initialize vector store manager."""
         self.stores: Dict[str, VectorStore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
 
     def get_store(self, subject: str) -> VectorStore:
         """Get or create a vector store for a subject.
@@ -142,6 +366,53 @@ class VectorStoreManager:
             self.stores[subject] = VectorStore(subject)
         return self.stores[subject]
 
+    async def aget_store(self, subject: str) -> VectorStore:
+        """Get or create a vector store without blocking the event loop.
+
+        Concurrent callers for the same cold subject share one load from
+        disk, which runs in a worker thread.
+
+        Args:
+            subject: Subject name
+
+        Returns:
+            VectorStore instance
+        """
+        store = self.stores.get(subject)
+        if store is not None:
+            return store
+
+        lock = self._locks.setdefault(subject, asyncio.Lock())
+        async with lock:
+            if subject not in self.stores:
+                self.stores[subject] = await asyncio.to_thread(VectorStore, subject)
+        return self.stores[subject]
+
+    async def warm_up(self, subjects: List[str]):
+        """Load the given subject stores concurrently.
+
+        Args:
+            subjects: Subject names to load
+        """
+        await asyncio.gather(*[self.aget_store(subject) for subject in subjects])
+
+    async def flush(self):
+        """Persist every store with unsaved changes."""
+        await asyncio.gather(*[store.flush() for store in self.stores.values()])
+
+    async def autosave(self, interval: float):
+        """Flush dirty stores every ``interval`` seconds until cancelled.
+
+        Args:
+            interval: Seconds between flushes
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Vector store autosave error")
+
     async def search_all(
         self,
         query: str,
@@ -9,6 +9,7 @@ sys.path.insert(0, project_root)
 
 if __name__ == "__main__":
     import uvicorn
+    from app.config import settings
 
     print("Starting Student Learning Agent...")
     print(f"API docs: http://localhost:8000/docs")
@@ -19,5 +20,12 @@ if __name__ == "__main__":
         "app.main:app",  # Use import string instead of app object
         host="0.0.0.0",
         port=8000,
-        reload=True
+        # uvloop and httptools come with uvicorn[standard]; uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # Auto-reload in development (DEBUG=true)
+        reload=settings.debug,
+        # Single worker: checkpoints, caches, batchers and FAISS stores live
+        # in process, so extra workers would each hold a divergent copy
+        workers=1,
     )
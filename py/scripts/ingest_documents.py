@@ -1,7 +1,11 @@
 """Document ingestion script for loading learning materials."""
 import asyncio
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Set, Tuple
 from langchain_community.document_loaders import (
     PyPDFLoader,
     TextLoader,
@@ -9,8 +13,126 @@ from langchain_community.document_loaders import (
 )
 from langchain_core.documents import Document
 from app.services.rag_service import rag_service
+from app.services.vector_store import vector_store_manager
 from app.config import settings
 
+# Chunks per add_chunks call and number of calls in flight
+BATCH_SIZE = 128
+MAX_CONCURRENCY = 8
+
+SUPPORTED_SUFFIXES = {".pdf", ".txt", ".md"}
+
+# subject -> file content hash -> hashes of the chunks it produced
+INGEST_CACHE_PATH = "./data/.ingest_cache.json"
+
+
+def load_ingest_cache() -> Dict[str, Dict[str, List[str]]]:
+    """Load the ingestion cache, or an empty one if missing or corrupt."""
+    try:
+        with open(INGEST_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_ingest_cache(cache: Dict[str, Dict[str, List[str]]]):
+    """Write the ingestion cache atomically."""
+    os.makedirs(os.path.dirname(INGEST_CACHE_PATH), exist_ok=True)
+    tmp_path = INGEST_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, INGEST_CACHE_PATH)
+
+
+# Append-only log of (file hash, chunk index) pairs persisted so far
+CHECKPOINT_PATH = "./data/.ingest_checkpoint.jsonl"
+
+
+def load_checkpoint(subject: str) -> Set[Tuple[str, int]]:
+    """Load the chunks of a subject persisted by an interrupted run.
+
+    Args:
+        subject: Subject category
+
+    Returns:
+        Set of (file hash, chunk index) pairs
+    """
+    completed = set()
+    try:
+        with open(CHECKPOINT_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    continue
+                if record["subject"] == subject:
+                    completed.update((record["file"], i) for i in record["chunk_ids"])
+    except OSError:
+        pass
+    return completed
+
+
+def append_checkpoint(subject: str, keys: List[Tuple[str, int]]):
+    """Durably record persisted chunks, one line per source file.
+
+    Args:
+        subject: Subject category
+        keys: (file hash, chunk index) pairs
+    """
+    by_file: Dict[str, List[int]] = {}
+    for file_hash, chunk_id in keys:
+        by_file.setdefault(file_hash, []).append(chunk_id)
+
+    os.makedirs(os.path.dirname(CHECKPOINT_PATH), exist_ok=True)
+    with open(CHECKPOINT_PATH, "a", encoding="utf-8") as fp:
+        for file_hash, chunk_ids in by_file.items():
+            fp.write(json.dumps({"subject": subject, "file": file_hash, "chunk_ids": chunk_ids}) + "\n")
+        fp.flush()
+        os.fsync(fp.fileno())
+
+
+def _sha256(data: bytes) -> str:
+    """Hex SHA-256 digest of the given bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _load_file(path: str) -> List[Document]:
+    """Load a single file; runs in a worker process.
+
+    Args:
+        path: File path with a supported suffix
+
+    Returns:
+        Documents loaded from the file
+    """
+    suffix = Path(path).suffix
+    if suffix == ".pdf":
+        loader = PyPDFLoader(path)
+    elif suffix == ".txt":
+        loader = TextLoader(path, encoding="utf-8")
+    else:
+        loader = UnstructuredMarkdownLoader(path)
+    return loader.load()
+
+
+async def flush_chunks(chunks: List[Document], subject: str, semaphore: asyncio.Semaphore):
+    """Embed and store chunks in concurrent fixed-size batches.
+
+    Args:
+        chunks: Document chunks to store
+        subject: Subject category
+        semaphore: Limits the number of batches in flight
+    """
+    async def add_batch(batch: List[Document]):
+        async with semaphore:
+            await rag_service.add_chunks(batch, subject)
+
+    await asyncio.gather(*[
+        add_batch(chunks[i:i + BATCH_SIZE])
+        for i in range(0, len(chunks), BATCH_SIZE)
+    ])
+
 
 async def ingest_documents(subject: str, directory: str):
     """Ingest documents from a directory into the vector store.
@@ -21,51 +143,99 @@ async def ingest_documents(subject: str, directory: str):
     """
     print(f"Ingesting documents for {subject} from {directory}...")
 
-    documents = []
+    pending: List[Document] = []
+    total_docs = 0
+    total_chunks = 0
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
     directory_path = Path(directory)
 
     if not directory_path.exists():
         print(f"Directory {directory} does not exist!")
         return
 
-    # Process all files in directory
+    cache = load_ingest_cache()
+    subject_cache = cache.setdefault(subject, {})
+    seen_chunks = {h for hashes in subject_cache.values() for h in hashes}
+    completed = load_checkpoint(subject)
+    pending_keys: List[Tuple[str, int]] = []
+    staged: Dict[str, List[str]] = {}
+
+    async def flush(chunks: List[Document]):
+        """Store and persist chunks, then record progress."""
+        await flush_chunks(chunks, subject, semaphore)
+        await vector_store_manager.flush()
+        append_checkpoint(subject, pending_keys)
+        pending_keys.clear()
+        subject_cache.update(staged)
+        staged.clear()
+        save_ingest_cache(cache)
+
+    # Collect files to load, skipping ones ingested unchanged before
+    files = []
+    file_hashes = []
     for file_path in directory_path.rglob("*"):
         if not file_path.is_file():
             continue
+        if file_path.suffix not in SUPPORTED_SUFFIXES:
+            print(f"Skipping unsupported file type: {file_path.suffix}")
+            continue
+
+        file_hash = _sha256(file_path.read_bytes())
+        if file_hash in subject_cache:
+            print(f"Skipping unchanged file: {file_path.name}")
+            continue
+        files.append(file_path)
+        file_hashes.append(file_hash)
+
+    # Parse files in parallel worker processes
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        tasks = [loop.run_in_executor(executor, _load_file, str(p)) for p in files]
+        docs_per_file = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for file_path, file_hash, docs in zip(files, file_hashes, docs_per_file):
+        if isinstance(docs, Exception):
+            print(f"Error loading {file_path}: {docs}")
+            continue
+
+        # Add metadata
+        for doc in docs:
+            doc.metadata["subject"] = subject
+            doc.metadata["source"] = str(file_path.name)
 
-        print(f"Processing {file_path}...")
-
-        try:
-            # Load based on file type
-            if file_path.suffix == ".pdf":
-                loader = PyPDFLoader(str(file_path))
-                docs = loader.load()
-            elif file_path.suffix == ".txt":
-                loader = TextLoader(str(file_path), encoding="utf-8")
-                docs = loader.load()
-            elif file_path.suffix == ".md":
-                loader = UnstructuredMarkdownLoader(str(file_path))
-                docs = loader.load()
-            else:
-                print(f"Skipping unsupported file type: {file_path.suffix}")
+        # Drop chunks persisted by an interrupted run or already embedded
+        # for this subject; files may span several flushes
+        chunk_hashes = []
+        for chunk_id, chunk in enumerate(rag_service.split_documents(docs)):
+            chunk_hash = _sha256(chunk.page_content.encode("utf-8"))
+            chunk_hashes.append(chunk_hash)
+            if chunk_hash in seen_chunks:
                 continue
+            seen_chunks.add(chunk_hash)
+            if (file_hash, chunk_id) in completed:
+                continue
+            pending.append(chunk)
+            pending_keys.append((file_hash, chunk_id))
 
-            # Add metadata
-            for doc in docs:
-                doc.metadata["subject"] = subject
-                doc.metadata["source"] = str(file_path.name)
+            # Embed in concurrent batches as soon as enough chunks are queued
+            if len(pending) >= BATCH_SIZE * MAX_CONCURRENCY:
+                print(f"Ingesting {len(pending)} chunks into vector store...")
+                await flush(pending)
+                total_chunks += len(pending)
+                pending = []
 
-            documents.extend(docs)
-            print(f"Loaded {len(docs)} documents from {file_path.name}")
+        staged[file_hash] = chunk_hashes
+        total_docs += len(docs)
+        print(f"Loaded {len(docs)} documents from {file_path.name}")
 
-        except Exception as e:
-            print(f"Error loading {file_path}: {e}")
+    # Ingest remaining chunks
+    if pending or staged:
+        print(f"Ingesting {len(pending)} chunks into vector store...")
+        await flush(pending)
+        total_chunks += len(pending)
 
-    # Ingest documents
-    if documents:
-        print(f"\nIngesting {len(documents)} documents into vector store...")
-        await rag_service.add_documents(documents, subject)
-        print(f"Successfully ingested {len(documents)} documents for {subject}!")
+    if total_docs:
+        print(f"Successfully ingested {total_docs} documents ({total_chunks} chunks) for {subject}!")
     else:
         print("No documents found to ingest.")
 
@@ -83,6 +253,13 @@ async def main():
         await ingest_documents(subject, directory)
         print()
 
+    # Stores are saved lazily; write everything before exiting
+    await vector_store_manager.flush()
+
+    # Every file is now in the ingest cache, so the checkpoint is redundant
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
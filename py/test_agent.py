@@ -1,7 +1,7 @@
 """Simple test script to verify the agent setup."""
 import asyncio
 from langchain_core.messages import HumanMessage
-from app.agent.graph import agent_graph
+from app.agent.graph import get_agent_graph
 from app.agent.state import AgentState
 
 
@@ -28,14 +28,16 @@ async def test_agent():
         "needs_search": False,
         "needs_rag": False,
         "confidence": 0.0,
+        "draft_answer": None,
         "response": None,
+        "error": None,
     }
 
     try:
         # Run the agent
         print("Running agent...\n")
         config = {"configurable": {"thread_id": "test_thread"}}
-        result = await agent_graph.ainvoke(initial_state, config)
+        result = await get_agent_graph().ainvoke(initial_state, config)
 
         # Print results
         print("=" * 60)
@@ -1,49 +1,61 @@
 #!/usr/bin/env python3
 """Test the API with different queries."""
-import requests
-import json
+import asyncio
+from typing import Optional, Tuple
+import httpx
 
 API_URL = "http://localhost:8000/api/chat/message"
 
-def ask_question(question: str, user_id: str = "test_user"):
-    """Send a question to the agent."""
+# 测试不同类型的问题
+QUESTIONS = [
+    # 1. 知识问答
+    "什么是二次函数？请简单解释",
+    # 2. 练习题生成
+    "给我生成3道关于二次函数的练习题",
+    # 3. 概念解释
+    "为什么抛物线的顶点公式是 x = -b/2a？",
+    # 4. 物理问题
+    "什么是牛顿第二定律？",
+]
+
+
+async def ask_question(
+    client: httpx.AsyncClient,
+    question: str,
+    user_id: str = "test_user"
+) -> Tuple[Optional[dict], str]:
+    """Send a question to the agent and format its answer for printing."""
     payload = {
         "message": question,
         "user_id": user_id
     }
 
-    print(f"\n{'='*60}")
-    print(f"Question: {question}")
-    print('='*60)
-
     try:
-        response = requests.post(API_URL, json=payload, timeout=60)
+        response = await client.post(API_URL, json=payload)
         response.raise_for_status()
-
         result = response.json()
-        print(f"\nResponse:\n{result['response']}")
 
-        if result.get('sources'):
-            print(f"\nSources: {result['sources']}")
+    except httpx.HTTPError as e:
+        result = None
+        answer = f"Error: {e}"
 
-        return result
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error: {e}")
-        return None
+    else:
+        answer = f"\nResponse:\n{result['response']}"
+        if result.get('sources'):
+            answer += f"\n\nSources: {result['sources']}"
 
+    return result, f"\n{'='*60}\nQuestion: {question}\n{'='*60}\n{answer}"
 
-if __name__ == "__main__":
-    # 测试不同类型的问题
 
-    # 1. 知识问答
-    ask_question("什么是二次函数？请简单解释")
+async def main():
+    """Ask all test questions concurrently over one pooled client."""
+    async with httpx.AsyncClient(timeout=60) as client:
+        answers = await asyncio.gather(*[ask_question(client, q) for q in QUESTIONS])
 
-    # 2. 练习题生成
-    ask_question("给我生成3道关于二次函数的练习题")
+    # Print in question order once every answer is in
+    for _, text in answers:
+        print(text)
 
-    # 3. 概念解释
-    ask_question("为什么抛物线的顶点公式是 x = -b/2a？")
 
-    # 4. 物理问题
-    ask_question("什么是牛顿第二定律？")
+if __name__ == "__main__":
+    asyncio.run(main())
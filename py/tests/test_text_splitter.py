@@ -0,0 +1,54 @@
+"""RegexTextSplitter parity tests."""
+
+import random
+
+import pytest
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from app.core.text_splitter import RegexTextSplitter
+
+SEPARATORS = ["\n\n", "\n", "。", "！", "？", ".", "!", "?", " ", ""]
+
+# Alphabet weighted towards separators so every recursion level is exercised
+ALPHABET = list("abc函数方程xyz") * 4 + ["\n\n", "\n", "。", "！", "？", ".", "!", "?", " "]
+
+
+def random_text(rng: random.Random) -> str:
+    """Build a random mix of words and separators."""
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 400)))
+
+
+@pytest.mark.parametrize("keep_separator", [False, True, "start", "end"])
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(10, 0), (20, 5), (50, 10)])
+def test_chunks_match_base_class(keep_separator, chunk_size, chunk_overlap):
+    """Chunks are identical to RecursiveCharacterTextSplitter."""
+    kwargs = dict(
+        separators=SEPARATORS,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        keep_separator=keep_separator,
+    )
+    splitter = RegexTextSplitter(**kwargs)
+    reference = RecursiveCharacterTextSplitter(**kwargs)
+
+    rng = random.Random(f"{keep_separator}-{chunk_size}")
+    for _ in range(200):
+        text = random_text(rng)
+        assert splitter.split_text(text) == reference.split_text(text)
+
+
+def test_chunks_match_base_class_with_regex_separators():
+    """Regex separators split the same way as in the base class."""
+    kwargs = dict(
+        separators=[r"\n+", r"[。.]", " ", ""],
+        is_separator_regex=True,
+        chunk_size=15,
+        chunk_overlap=3,
+    )
+    splitter = RegexTextSplitter(**kwargs)
+    reference = RecursiveCharacterTextSplitter(**kwargs)
+
+    rng = random.Random(0)
+    for _ in range(200):
+        text = random_text(rng)
+        assert splitter.split_text(text) == reference.split_text(text)
@@ -1,13 +1,18 @@
 """ReAct Agent implementation using LangGraph."""
 
+import asyncio
 import uuid
-from typing import Any, AsyncGenerator, Dict, List, Literal, Optional
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, FrozenSet, List, Literal, Optional, Set
 
+import orjson
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
-from langgraph.prebuilt import ToolNode
 
 from app.agent.state import AgentState
 from app.core.config import settings
@@ -41,6 +46,68 @@ When using tools:
 Be concise but thorough. If you're unsure about something, acknowledge it rather than making things up.
 """
 
+# Pre-split around {context} so each agent step only concatenates strings
+_SYSTEM_PROMPT_PREFIX, _SYSTEM_PROMPT_SUFFIX = SYSTEM_PROMPT.split("{context}")
+_EMPTY_CONTEXT_SYSTEM_MESSAGE = SystemMessage(
+    content=_SYSTEM_PROMPT_PREFIX + _SYSTEM_PROMPT_SUFFIX
+)
+
+
+def _summary_spec(tool: BaseTool) -> Dict[str, Any]:
+    """OpenAI function spec carrying only a tool's name and short summary."""
+    return {
+        "type": "function",
+        "function": {
+            "name": tool.name,
+            "description": tool.short_summary,
+            "parameters": {"type": "object", "properties": {}},
+        },
+    }
+
+
+# Background PostgreSQL writes; the semaphore applies backpressure once this
+# many are in flight
+_PERSIST_SLOTS = asyncio.Semaphore(100)
+_persist_tasks: Set[asyncio.Task] = set()
+
+
+def _persist_done(task: asyncio.Task) -> None:
+    """Release the slot held by a finished background persist."""
+    _persist_tasks.discard(task)
+    _PERSIST_SLOTS.release()
+
+
+async def _persist_to_pg(
+    session_id: str, user_id: str, rows: List[Dict[str, Any]]
+) -> None:
+    """Write one exchange to PostgreSQL in its own session."""
+    try:
+        async with get_db_session() as session:
+            # Ensure conversation exists
+            conversation_id = uuid.UUID(session_id)
+            await ConversationCRUD.ensure(
+                session,
+                conversation_id,
+                user_id=uuid.UUID(user_id),
+                title="New Conversation",
+            )
+
+            # Save messages
+            await MessageCRUD.create_batch(
+                session,
+                [{"conversation_id": conversation_id, **row} for row in rows],
+            )
+
+    except Exception:
+        # Long-term storage is best effort
+        pass
+
+
+async def wait_for_background_persists() -> None:
+    """Wait for in-flight background PostgreSQL writes to finish."""
+    if _persist_tasks:
+        await asyncio.gather(*_persist_tasks, return_exceptions=True)
+
 
 class ReActAgent:
     """ReAct Agent with tool use, RAG, and memory capabilities."""
@@ -68,121 +135,184 @@ class ReActAgent:
 
         # Initialize tools
         self.tools = [web_search_tool, math_tool, db_query_tool]
-        self.llm_with_tools = self.llm.bind_tools(self.tools)
-
-        # Build the graph
-        self.graph = self._build_graph()
-
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow."""
-        # Create graph with state
-        workflow = StateGraph(AgentState)
-
-        # Add nodes
-        workflow.add_node("retrieve", self._retrieve_context)
-        workflow.add_node("agent", self._agent_node)
-        workflow.add_node("tools", ToolNode(self.tools))
-        workflow.add_node("persist", self._persist_conversation)
-
-        # Define edges
-        workflow.set_entry_point("retrieve")
-
-        workflow.add_edge("retrieve", "agent")
-
-        workflow.add_conditional_edges(
-            "agent",
-            self._should_continue,
-            {
-                "tools": "tools",
-                "persist": "persist",
-            },
+        self.tools_by_name = {tool.name: tool for tool in self.tools}
+        # Tools bound with their full schema; promotions last across runs
+        self.promoted_tools: FrozenSet[str] = (
+            frozenset() if settings.lazy_tool_schemas else frozenset(self.tools_by_name)
         )
+        self._bound_llms: Dict[FrozenSet[str], Runnable] = {}
 
-        workflow.add_edge("tools", "agent")
-        workflow.add_edge("persist", END)
+        # Tool specs are derived from the Pydantic args schemas once
+        self._tool_specs = {
+            tool.name: (convert_to_openai_tool(tool), _summary_spec(tool))
+            for tool in self.tools
+        }
 
-        return workflow.compile()
+        # Shared compiled graph; nodes find this agent through the run config
+        self.graph = _build_graph()
+        self.run_config: RunnableConfig = {"configurable": {"agent": self}}
 
     async def _retrieve_context(self, state: AgentState) -> Dict[str, Any]:
         """Retrieve relevant context using RAG."""
+        # Skipped when retrieval is disabled or was already done up front
         if not self.enable_rag or not state.get("should_retrieve", True):
-            return {"retrieved_context": None}
+            return {}
 
         # Get the last user message
-        messages = state.get("messages", [])
-        user_message = None
-        for msg in reversed(messages):
-            if isinstance(msg, HumanMessage):
-                user_message = msg.content
-                break
+        user_message = state.get("user_query")
+        if user_message is None:
+            for msg in reversed(state.get("messages", [])):
+                if isinstance(msg, HumanMessage):
+                    user_message = msg.content
+                    break
 
         if not user_message:
             return {"retrieved_context": None}
 
-        # Retrieve relevant documents
+        return {"retrieved_context": await self._retrieve(user_message)}
+
+    async def _retrieve(self, query: str) -> Optional[str]:
+        """Retrieve and format knowledge base context for a query."""
         try:
-            documents = await rag_manager.retrieve(user_message, k=3)
+            documents, context = await rag_manager.retrieve_context(query, k=3)
             if documents:
-                context = rag_manager.format_context(documents)
-                return {"retrieved_context": context}
+                return context
         except Exception:
             pass
 
-        return {"retrieved_context": None}
+        return None
+
+    def _llm_for(self, promoted: FrozenSet[str]) -> Runnable:
+        """LLM bound with full schemas for promoted tools, summaries for the rest.
+
+        Summary-only tools are listed in the run metadata so ``stream`` can
+        hold back tokens of a call that may be discarded.
+        """
+        llm = self._bound_llms.get(promoted)
+        if llm is None:
+            llm = self.llm.bind_tools(
+                [
+                    full if name in promoted else summary
+                    for name, (full, summary) in self._tool_specs.items()
+                ]
+            )
+            summary_tools = sorted(set(self._tool_specs) - promoted)
+            if summary_tools:
+                llm = llm.with_config(metadata={"summary_tools": summary_tools})
+            self._bound_llms[promoted] = llm
+        return llm
 
     async def _agent_node(self, state: AgentState) -> Dict[str, Any]:
         """Main agent reasoning node."""
-        messages = list(state.get("messages", []))
-        context = state.get("retrieved_context", "")
+        # One lookup per key for the whole step
+        get = state.get
+        messages = get("messages", ())
+        context = get("retrieved_context", "")
+        tool_calls_made = get("tool_calls_made", [])
+        iteration_count = get("iteration_count", 0)
 
         # Build system message with context
-        context_section = ""
         if context:
-            context_section = f"\n\nRelevant context from knowledge base:\n{context}"
-
-        system_message = SystemMessage(
-            content=SYSTEM_PROMPT.format(context=context_section)
-        )
+            system_message = SystemMessage(
+                content=_SYSTEM_PROMPT_PREFIX
+                + "\n\nRelevant context from knowledge base:\n"
+                + context
+                + _SYSTEM_PROMPT_SUFFIX
+            )
+        else:
+            system_message = _EMPTY_CONTEXT_SYSTEM_MESSAGE
 
         # Prepare messages for the model
-        model_messages = [system_message] + messages
-
-        # Invoke the model
-        response = await self.llm_with_tools.ainvoke(model_messages)
+        model_messages = (system_message, *messages)
+
+        # Invoke the model; a call to a tool bound only by its summary is
+        # discarded and the step retried with that tool's full schema
+        while True:
+            promoted = self.promoted_tools
+            response = await self._llm_for(promoted).ainvoke(model_messages)
+            picked = {
+                tc["name"]
+                for tc in response.tool_calls
+                if tc["name"] in self.tools_by_name
+            }
+            if picked <= promoted:
+                break
+            self.promoted_tools = self.promoted_tools | picked
 
         # Track tool calls
-        tool_calls_made = state.get("tool_calls_made", [])
         if response.tool_calls:
-            for tc in response.tool_calls:
-                tool_calls_made.append({
-                    "name": tc["name"],
-                    "args": tc["args"],
-                    "id": tc["id"],
-                })
+            tool_calls_made.extend(
+                {"name": tc["name"], "args": tc["args"], "id": tc["id"]}
+                for tc in response.tool_calls
+            )
 
         return {
             "messages": [response],
             "tool_calls_made": tool_calls_made,
-            "iteration_count": state.get("iteration_count", 0) + 1,
+            "iteration_count": iteration_count + 1,
+            "last_is_tool_call": bool(response.tool_calls),
         }
 
-    def _should_continue(
-        self, state: AgentState
-    ) -> Literal["tools", "persist"]:
+    async def _bounded_tool_node(
+        self, state: AgentState, config: RunnableConfig
+    ) -> Dict[str, Any]:
+        """Run the requested tools concurrently and cap each output.
+
+        Outputs longer than ``max_tool_output_chars`` are truncated in the
+        message history; the full payloads are kept in the state metadata
+        under ``tool_outputs``, keyed by tool call ID.
+        """
+        tool_calls = state["messages"][-1].tool_calls
+        tool_messages = await asyncio.gather(
+            *[self._invoke_tool(call, config) for call in tool_calls]
+        )
+        result = {"messages": tool_messages}
+        limit = settings.max_tool_output_chars
+
+        full_outputs = {}
+        for msg in tool_messages:
+            if isinstance(msg.content, str) and len(msg.content) > limit:
+                full_outputs[msg.tool_call_id] = msg.content
+                msg.content = msg.content[:limit] + "\n...[truncated]"
+
+        if not full_outputs:
+            return result
+
+        metadata = dict(state.get("metadata") or {})
+        metadata["tool_outputs"] = {**metadata.get("tool_outputs", {}), **full_outputs}
+        return {"messages": tool_messages, "metadata": metadata}
+
+    async def _invoke_tool(
+        self, call: Dict[str, Any], config: RunnableConfig
+    ) -> ToolMessage:
+        """Run one tool call, turning failures into an error ToolMessage."""
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            content = f"Error: {call['name']} is not a valid tool."
+        else:
+            try:
+                output = await tool.ainvoke(call["args"], config)
+                if isinstance(output, str):
+                    content = output
+                else:
+                    try:
+                        content = orjson.dumps(output).decode()
+                    except orjson.JSONEncodeError:
+                        content = str(output)
+            except Exception as e:
+                content = f"Error: {e!r}\n Please fix your mistakes."
+
+        return ToolMessage(content=content, name=call["name"], tool_call_id=call["id"])
+
+    @staticmethod
+    def _should_continue(state: AgentState) -> Literal["tools", "persist"]:
         """Determine if the agent should continue or finish."""
-        messages = state.get("messages", [])
-        iteration_count = state.get("iteration_count", 0)
-        max_iterations = state.get("max_iterations", self.max_iterations)
-
-        # Check iteration limit
-        if iteration_count >= max_iterations:
-            return "persist"
-
-        # Check if the last message has tool calls
-        if messages:
-            last_message = messages[-1]
-            if isinstance(last_message, AIMessage) and last_message.tool_calls:
-                return "tools"
+        # Continue only if the last model response requested tools and the
+        # iteration limit has not been reached
+        if state.get("last_is_tool_call") and state.get(
+            "iteration_count", 0
+        ) < state["max_iterations"]:
+            return "tools"
 
         return "persist"
 
@@ -195,76 +325,98 @@ class ReActAgent:
         if not session_id or not user_id:
             return {}
 
-        try:
-            # Save to Redis for session continuity
-            for msg in messages[-2:]:  # Save last exchange
-                await redis_memory.add_message(session_id, msg)
-
-            # Persist to PostgreSQL for long-term storage
-            async with get_db_session() as session:
-                # Ensure conversation exists
-                conversation = await ConversationCRUD.get_by_id(
-                    session, uuid.UUID(session_id)
-                )
-
-                if not conversation:
-                    conversation = await ConversationCRUD.create(
-                        session,
-                        user_id=uuid.UUID(user_id),
-                        title="New Conversation",
-                    )
-
-                # Save messages
-                for msg in messages[-2:]:
-                    role = "user" if isinstance(msg, HumanMessage) else "assistant"
-                    await MessageCRUD.create(
-                        session,
-                        conversation_id=conversation.id,
-                        role=role,
-                        content=msg.content,
-                    )
+        # Last exchange
+        exchange = messages[-2:]
 
+        try:
+            # Save to Redis for session continuity; the next turn reads it
+            await redis_memory.add_messages(session_id, exchange)
         except Exception:
             # Log error but don't fail the conversation
             pass
 
+        # PostgreSQL catches up in the background, off the response path
+        rows = [
+            {
+                "role": "user" if isinstance(msg, HumanMessage) else "assistant",
+                "content": msg.content,
+            }
+            for msg in exchange
+        ]
+        await _PERSIST_SLOTS.acquire()
+        task = asyncio.create_task(_persist_to_pg(session_id, user_id, rows))
+        _persist_tasks.add(task)
+        task.add_done_callback(_persist_done)
+
         return {}
 
-    async def run(
+    async def _prepare_state(
         self,
         message: str,
-        session_id: Optional[str] = None,
-        user_id: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Run the agent with a user message."""
+        session_id: Optional[str],
+        user_id: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+    ) -> AgentState:
+        """Load the session and build the initial graph state.
+
+        RAG retrieval only depends on the new message, so it runs
+        concurrently with the Redis session lookups instead of inside the
+        graph after them.
+        """
         # Create or use existing session
         session_id = session_id or str(uuid.uuid4())
         user_id = user_id or str(uuid.uuid4())
 
-        # Ensure session exists in Redis
-        if not await redis_memory.session_exists(session_id):
-            await redis_memory.create_session(user_id, session_id)
+        retrieve_task = (
+            asyncio.create_task(self._retrieve(message)) if self.enable_rag else None
+        )
+        try:
+            # Get conversation history from Redis while checking the session
+            exists, history = await asyncio.gather(
+                redis_memory.session_exists(session_id),
+                redis_memory.get_recent_messages(session_id, limit=10),
+            )
+
+            # Ensure session exists in Redis
+            if not exists:
+                await redis_memory.create_session(user_id, session_id)
 
-        # Get conversation history from Redis
-        history = await redis_memory.get_recent_messages(session_id, limit=10)
+            retrieved_context = await retrieve_task if retrieve_task else None
+        finally:
+            if retrieve_task and not retrieve_task.done():
+                retrieve_task.cancel()
 
         # Build initial state
-        initial_state: AgentState = {
-            "messages": list(history) + [HumanMessage(content=message)],
+        return {
+            "messages": [*history, HumanMessage(content=message)],
             "session_id": session_id,
             "user_id": user_id,
-            "retrieved_context": None,
-            "should_retrieve": self.enable_rag,
+            "user_query": message,
+            "retrieved_context": retrieved_context,
+            "should_retrieve": False,
             "next_action": None,
             "iteration_count": 0,
             "max_iterations": self.max_iterations,
+            "last_is_tool_call": False,
             "tool_calls_made": [],
             "metadata": metadata or {},
         }
 
+    async def run(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Run the agent with a user message."""
+        initial_state = await self._prepare_state(
+            message, session_id, user_id, metadata
+        )
+        session_id = initial_state["session_id"]
+
         # Run the graph
-        final_state = await self.graph.ainvoke(initial_state)
+        final_state = await self.graph.ainvoke(initial_state, self.run_config)
 
         # Extract response
         messages = final_state.get("messages", [])
@@ -289,41 +441,47 @@ class ReActAgent:
         metadata: Optional[Dict[str, Any]] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """Stream agent responses."""
-        # Create or use existing session
-        session_id = session_id or str(uuid.uuid4())
-        user_id = user_id or str(uuid.uuid4())
-
-        # Ensure session exists in Redis
-        if not await redis_memory.session_exists(session_id):
-            await redis_memory.create_session(user_id, session_id)
+        initial_state = await self._prepare_state(
+            message, session_id, user_id, metadata
+        )
+        session_id = initial_state["session_id"]
 
-        # Get conversation history from Redis
-        history = await redis_memory.get_recent_messages(session_id, limit=10)
-
-        # Build initial state
-        initial_state: AgentState = {
-            "messages": list(history) + [HumanMessage(content=message)],
-            "session_id": session_id,
-            "user_id": user_id,
-            "retrieved_context": None,
-            "should_retrieve": self.enable_rag,
-            "next_action": None,
-            "iteration_count": 0,
-            "max_iterations": self.max_iterations,
-            "tool_calls_made": [],
-            "metadata": metadata or {},
-        }
+        # Tokens of calls that bound some tools by summary only, held until
+        # the call ends and is known not to be discarded, keyed by run ID
+        held_tokens: Dict[str, List[str]] = {}
 
         # Stream the graph execution
-        async for event in self.graph.astream_events(initial_state, version="v2"):
+        async for event in self.graph.astream_events(
+            initial_state, self.run_config, version="v2"
+        ):
             event_type = event.get("event")
 
             if event_type == "on_chat_model_stream":
                 chunk = event.get("data", {}).get("chunk")
                 if chunk and hasattr(chunk, "content") and chunk.content:
+                    if event.get("metadata", {}).get("summary_tools"):
+                        held_tokens.setdefault(event["run_id"], []).append(
+                            chunk.content
+                        )
+                    else:
+                        yield {
+                            "type": "token",
+                            "content": chunk.content,
+                            "session_id": session_id,
+                        }
+
+            elif event_type == "on_chat_model_end":
+                tokens = held_tokens.pop(event.get("run_id"), None)
+                output = event.get("data", {}).get("output")
+                summary_tools = event.get("metadata", {}).get("summary_tools", ())
+                # A call to a summary-only tool is retried, so drop its tokens
+                if tokens and not any(
+                    tc["name"] in summary_tools
+                    for tc in getattr(output, "tool_calls", ())
+                ):
                     yield {
                         "type": "token",
-                        "content": chunk.content,
+                        "content": "".join(tokens),
                         "session_id": session_id,
                     }
 
@@ -351,5 +509,66 @@ class ReActAgent:
         }
 
 
+def _agent(config: RunnableConfig) -> ReActAgent:
+    """Return the agent a graph run belongs to."""
+    return config["configurable"]["agent"]
+
+
+async def _retrieve_step(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node: retrieve RAG context."""
+    return await _agent(config)._retrieve_context(state)
+
+
+async def _agent_step(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node: one reasoning step."""
+    return await _agent(config)._agent_node(state)
+
+
+async def _tools_step(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node: run requested tools."""
+    return await _agent(config)._bounded_tool_node(state, config)
+
+
+async def _persist_step(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node: persist the exchange."""
+    return await _agent(config)._persist_conversation(state)
+
+
+@lru_cache(maxsize=1)
+def _build_graph() -> Any:
+    """Build and compile the LangGraph workflow once for all agents.
+
+    The topology is the same for every agent, so nodes are module-level
+    wrappers that dispatch to the agent passed in the run config.
+    """
+    # Create graph with state
+    workflow = StateGraph(AgentState)
+
+    # Add nodes
+    workflow.add_node("retrieve", _retrieve_step)
+    workflow.add_node("agent", _agent_step)
+    workflow.add_node("tools", _tools_step)
+    workflow.add_node("persist", _persist_step)
+
+    # Define edges
+    workflow.set_entry_point("retrieve")
+
+    workflow.add_edge("retrieve", "agent")
+
+    workflow.add_conditional_edges(
+        "agent",
+        ReActAgent._should_continue,
+        {
+            "tools": "tools",
+            "persist": "persist",
+        },
+    )
+
+    workflow.add_edge("tools", "agent")
+    workflow.add_edge("persist", END)
+
+    return workflow.compile()
+
+
 # Create default agent instance
 react_agent = ReActAgent()
@@ -16,6 +16,9 @@ class AgentState(TypedDict):
     session_id: str
     user_id: str
 
+    # Latest user message, so nodes don't rescan the history for it
+    user_query: Optional[str]
+
     # RAG context
     retrieved_context: Optional[str]
     should_retrieve: bool
@@ -24,6 +27,7 @@ class AgentState(TypedDict):
     next_action: Optional[str]
     iteration_count: int
     max_iterations: int
+    last_is_tool_call: bool
 
     # Tool execution
     tool_calls_made: List[Dict[str, Any]]
@@ -1,12 +1,13 @@
 """Chat API endpoints with streaming support."""
 
-import json
+import threading
 from typing import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
-from app.agent.react_agent import ReActAgent
+from app.agent.react_agent import ReActAgent, react_agent
 from app.memory.redis_memory import redis_memory
 from app.schemas.chat import (
     ChatRequest,
@@ -18,6 +19,26 @@ from app.schemas.chat import (
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
+# Every StreamEvent field, so SSE payloads keep the schema's shape without
+# validating each token
+_STREAM_EVENT_TEMPLATE = {name: None for name in StreamEvent.model_fields}
+
+# Compiled agents are stateless across invocations, so one per RAG setting
+_AGENT_CACHE: dict[bool, ReActAgent] = {True: react_agent}
+_AGENT_CACHE_LOCK = threading.Lock()
+
+
+def get_agent(enable_rag: bool) -> ReActAgent:
+    """Return the shared agent for the given RAG setting, building it once."""
+    agent = _AGENT_CACHE.get(enable_rag)
+    if agent is None:
+        with _AGENT_CACHE_LOCK:
+            agent = _AGENT_CACHE.get(enable_rag)
+            if agent is None:
+                agent = ReActAgent(enable_rag=enable_rag)
+                _AGENT_CACHE[enable_rag] = agent
+    return agent
+
 
 @router.post("/", response_model=ChatResponse)
 async def chat(request: ChatRequest) -> ChatResponse:
@@ -35,7 +56,7 @@ async def chat(request: ChatRequest) -> ChatResponse:
             detail="For streaming responses, use the /chat/stream endpoint",
         )
 
-    agent = ReActAgent(enable_rag=request.enable_rag)
+    agent = get_agent(request.enable_rag)
 
     try:
         result = await agent.run(
@@ -45,7 +66,8 @@ async def chat(request: ChatRequest) -> ChatResponse:
             metadata=request.metadata,
         )
 
-        return ChatResponse(
+        # Outbound models are built from trusted values; skip validation
+        return ChatResponse.model_construct(
             response=result["response"],
             session_id=result["session_id"],
             tool_calls=result.get("tool_calls", []),
@@ -67,9 +89,9 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
     - tool_end: Tool execution completed
     - done: Stream complete
     """
-    agent = ReActAgent(enable_rag=request.enable_rag)
+    agent = get_agent(request.enable_rag)
 
-    async def generate_events() -> AsyncGenerator[str, None]:
+    async def generate_events() -> AsyncGenerator[bytes, None]:
         try:
             async for event in agent.stream(
                 message=request.message,
@@ -78,8 +100,7 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
                 metadata=request.metadata,
             ):
                 # Format as SSE
-                event_data = StreamEvent(**event)
-                yield f"data: {event_data.model_dump_json()}\n\n"
+                yield b"data: " + orjson.dumps({**_STREAM_EVENT_TEMPLATE, **event}) + b"\n\n"
 
         except Exception as e:
             error_event = {
@@ -87,7 +108,7 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
                 "content": str(e),
                 "session_id": request.session_id or "",
             }
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield b"data: " + orjson.dumps(error_event) + b"\n\n"
 
     return StreamingResponse(
         generate_events(),
@@ -96,6 +117,8 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
+            # Keeps compression middleware from buffering the stream
+            "Content-Encoding": "identity",
         },
     )
 
@@ -109,7 +132,7 @@ async def create_session(request: SessionCreateRequest) -> SessionResponse:
             initial_context=request.initial_context,
         )
 
-        return SessionResponse(
+        return SessionResponse.model_construct(
             session_id=session_id,
             user_id=request.user_id,
             message_count=0,
@@ -127,7 +150,7 @@ async def get_session(session_id: str) -> SessionResponse:
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    return SessionResponse(
+    return SessionResponse.model_construct(
         session_id=session.session_id,
         user_id=session.user_id,
         message_count=len(session.messages),
@@ -148,9 +171,9 @@ async def delete_session(session_id: str) -> dict:
 @router.get("/sessions/{session_id}/messages")
 async def get_session_messages(session_id: str, limit: int = 50) -> dict:
     """Get messages from a session."""
-    session = await redis_memory.get_session(session_id)
+    session_messages = await redis_memory.get_recent_message_dicts(session_id, limit)
 
-    if not session:
+    if session_messages is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
     messages = [
@@ -159,7 +182,7 @@ async def get_session_messages(session_id: str, limit: int = 50) -> dict:
             "content": msg.get("content", ""),
             "timestamp": msg.get("timestamp"),
         }
-        for msg in session.messages[-limit:]
+        for msg in session_messages
     ]
 
     return {
@@ -44,7 +44,8 @@ async def health_check() -> HealthResponse:
     all_healthy = all(v == "healthy" for v in services.values())
     status = "healthy" if all_healthy else "degraded"
 
-    return HealthResponse(
+    # Built from trusted values; skip validation
+    return HealthResponse.model_construct(
         status=status,
         version="1.0.0",
         services=services,
@@ -1,20 +1,28 @@
 """RAG API endpoints for document management and search."""
 
-from typing import List
+import asyncio
+import logging
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
+from app.core.config import settings
 from app.rag.retriever import rag_manager
 from app.schemas.chat import (
     DocumentIngestRequest,
     DocumentIngestResponse,
     RAGSearchRequest,
     RAGSearchResponse,
-    RAGSearchResult,
 )
 
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
+logger = logging.getLogger("uvicorn.error")
+
+# Bounds concurrent batch ingestions against embedding API rate limits
+_INGEST_SLOTS = asyncio.Semaphore(settings.ingest_concurrency)
+
 
 @router.post("/ingest", response_model=DocumentIngestResponse)
 async def ingest_document(request: DocumentIngestRequest) -> DocumentIngestResponse:
@@ -36,7 +44,8 @@ async def ingest_document(request: DocumentIngestRequest) -> DocumentIngestRespo
             metadata=request.metadata,
         )
 
-        return DocumentIngestResponse(
+        # Outbound models are built from trusted values; skip validation
+        return DocumentIngestResponse.model_construct(
             title=request.title,
             chunk_count=len(embedding_ids),
             embedding_ids=embedding_ids,
@@ -53,12 +62,33 @@ async def ingest_document(request: DocumentIngestRequest) -> DocumentIngestRespo
 async def ingest_documents_batch(
     documents: List[DocumentIngestRequest],
 ) -> List[DocumentIngestResponse]:
-    """Ingest multiple documents in batch."""
-    results = []
+    """Ingest multiple documents in batch.
+
+    All chunks are embedded and stored together. If the batch fails, its
+    chunks are removed and each document is retried on its own so one bad
+    document doesn't fail the rest.
+    """
+    try:
+        batch_ids = await rag_manager.ingest_documents(
+            [doc.model_dump() for doc in documents]
+        )
+    except Exception as e:
+        logger.warning("Batch ingestion failed, retrying per document: %s", e)
+    else:
+        return [
+            DocumentIngestResponse.model_construct(
+                title=doc.title,
+                chunk_count=len(embedding_ids),
+                embedding_ids=embedding_ids,
+            )
+            for doc, embedding_ids in zip(documents, batch_ids)
+        ]
+
+    # Fall back to per-document ingestion to isolate the failure
 
-    for doc in documents:
-        try:
-            embedding_ids = await rag_manager.ingest_document(
+    async def ingest_one(doc: DocumentIngestRequest) -> List[str]:
+        async with _INGEST_SLOTS:
+            return await rag_manager.ingest_document(
                 content=doc.content,
                 title=doc.title,
                 source=doc.source,
@@ -66,56 +96,36 @@ async def ingest_documents_batch(
                 metadata=doc.metadata,
             )
 
-            results.append(
-                DocumentIngestResponse(
-                    title=doc.title,
-                    chunk_count=len(embedding_ids),
-                    embedding_ids=embedding_ids,
-                )
-            )
-
-        except Exception as e:
-            results.append(
-                DocumentIngestResponse(
-                    title=doc.title,
-                    chunk_count=0,
-                    embedding_ids=[],
-                )
-            )
-
-    return results
+    outcomes = await asyncio.gather(
+        *[ingest_one(doc) for doc in documents], return_exceptions=True
+    )
 
+    # Failed documents are reported with no chunks
+    return [
+        DocumentIngestResponse.model_construct(
+            title=doc.title,
+            chunk_count=0 if isinstance(outcome, Exception) else len(outcome),
+            embedding_ids=[] if isinstance(outcome, Exception) else outcome,
+        )
+        for doc, outcome in zip(documents, outcomes)
+    ]
 
-@router.post("/search", response_model=RAGSearchResponse)
-async def search_documents(request: RAGSearchRequest) -> RAGSearchResponse:
-    """
-    Search for relevant documents using hybrid search.
 
-    Combines vector similarity search with keyword matching for optimal results.
-    """
+async def _search(
+    query: str,
+    k: int,
+    vector_weight: float,
+    keyword_weight: float,
+    k_retrieve: Optional[int] = None,
+) -> ORJSONResponse:
+    """Run a hybrid search on already validated parameters."""
     try:
-        # Set retriever weights
-        rag_manager.retriever.vector_weight = request.vector_weight
-        rag_manager.retriever.keyword_weight = request.keyword_weight
-
         results = await rag_manager.retrieve_with_scores(
-            query=request.query,
-            k=request.k,
-        )
-
-        search_results = [
-            RAGSearchResult(
-                content=r["content"],
-                score=r["score"],
-                metadata=r["metadata"],
-            )
-            for r in results
-        ]
-
-        return RAGSearchResponse(
-            query=request.query,
-            results=search_results,
-            count=len(search_results),
+            query=query,
+            k=k,
+            vector_weight=vector_weight,
+            keyword_weight=keyword_weight,
+            k_retrieve=k_retrieve,
         )
 
     except Exception as e:
@@ -124,18 +134,38 @@ async def search_documents(request: RAGSearchRequest) -> RAGSearchResponse:
             detail=f"Search failed: {str(e)}",
         )
 
+    # Serialized straight to orjson, bypassing response_model validation
+    # and jsonable_encoder; the retriever already returns plain floats
+    return ORJSONResponse(
+        {
+            "query": query,
+            "results": results,
+            "count": len(results),
+        }
+    )
 
-@router.get("/search")
+
+@router.post("/search", response_model=RAGSearchResponse)
+async def search_documents(request: RAGSearchRequest) -> ORJSONResponse:
+    """
+    Search for relevant documents using hybrid search.
+
+    Combines vector similarity search with keyword matching for optimal results.
+    """
+    return await _search(
+        request.query,
+        request.k,
+        request.vector_weight,
+        request.keyword_weight,
+        request.k_retrieve,
+    )
+
+
+@router.get("/search", response_model=RAGSearchResponse)
 async def search_documents_get(
-    query: str,
-    k: int = 5,
-    vector_weight: float = 0.7,
-) -> RAGSearchResponse:
+    query: str = Query(..., min_length=1, max_length=1000),
+    k: int = Query(5, ge=1, le=20),
+    vector_weight: float = Query(0.7, ge=0, le=1),
+) -> ORJSONResponse:
     """Search documents using GET request (simpler for testing)."""
-    request = RAGSearchRequest(
-        query=query,
-        k=k,
-        vector_weight=vector_weight,
-        keyword_weight=1 - vector_weight,
-    )
-    return await search_documents(request)
+    return await _search(query, k, vector_weight, 1 - vector_weight)
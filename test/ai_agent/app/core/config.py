@@ -1,9 +1,9 @@
 """Application configuration using Pydantic Settings."""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Optional
 
-from pydantic import Field, PostgresDsn, RedisDsn, field_validator
+from pydantic import Field, PostgresDsn, RedisDsn, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -28,19 +28,36 @@ class Settings(BaseSettings):
     postgres_user: str = Field(default="agent_user")
     postgres_password: str = Field(default="agent_password")
     postgres_db: str = Field(default="agent_db")
+    postgres_pool_size: int = Field(default=20)
+    postgres_max_overflow: int = Field(default=10)
+    postgres_pool_timeout: int = Field(default=30)
+    postgres_pool_recycle: int = Field(default=1800)
+    # Let PgBouncer (transaction pooling) own the pool instead of SQLAlchemy
+    pgbouncer_enabled: bool = Field(default=False)
 
     # Redis
     redis_host: str = Field(default="localhost")
     redis_port: int = Field(default=6379)
     redis_password: Optional[str] = Field(default=None)
     redis_db: int = Field(default=0)
+    # Connections per shared pool; callers wait for a free one when it's full
+    redis_pool_size: int = Field(default=20)
+    # Seconds to wait for a free pooled connection before failing
+    redis_pool_timeout: int = Field(default=30)
 
     # OpenAI
     openai_api_key: str = Field(default="")
     openai_model: str = Field(default="gpt-4o")
 
+    # Bind only short tool summaries until the model picks a tool, then
+    # retry that step with the picked tool's full schema. Costs an extra
+    # model call per newly picked tool, so only worth it with many tools
+    lazy_tool_schemas: bool = Field(default=False)
+
     # Tavily
     tavily_api_key: str = Field(default="")
+    # Seconds to cache identical web searches in process; 0 disables
+    web_search_cache_ttl: int = Field(default=900)
 
     # LangSmith
     langchain_tracing_v2: bool = Field(default=True)
@@ -48,15 +65,29 @@ class Settings(BaseSettings):
     langchain_api_key: str = Field(default="")
     langchain_project: str = Field(default="ai-agent-prod")
 
-    # Embedding
+    # Embedding ("openai" or "fastembed" for local ONNX inference)
+    embedding_backend: str = Field(default="openai")
     embedding_model: str = Field(default="text-embedding-3-small")
     embedding_dimension: int = Field(default=1536)
+    # Seconds to cache embeddings by content hash in Redis; 0 disables
+    embedding_cache_ttl: int = Field(default=86400)
+
+    # Reranking (empty model name disables the cross-encoder)
+    rerank_model: str = Field(default="cross-encoder/ms-marco-MiniLM-L-2-v2")
+    rerank_batch_size: int = Field(default=32)
 
     # Memory
     short_term_memory_ttl: int = Field(default=3600)
     max_conversation_history: int = Field(default=50)
 
-    @property
+    # RAG ingestion
+    ingest_concurrency: int = Field(default=8)
+
+    # Agent
+    max_tool_output_chars: int = Field(default=4096)
+
+    @computed_field
+    @cached_property
     def postgres_dsn(self) -> str:
         """Construct PostgreSQL DSN."""
         return (
@@ -64,7 +95,8 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
-    @property
+    @computed_field
+    @cached_property
     def postgres_sync_dsn(self) -> str:
         """Construct sync PostgreSQL DSN for migrations."""
         return (
@@ -72,7 +104,8 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
-    @property
+    @computed_field
+    @cached_property
     def redis_url(self) -> str:
         """Construct Redis URL."""
         if self.redis_password:
@@ -0,0 +1,37 @@
+"""Shared Redis connection pools."""
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+# One pool per response mode, shared by every Redis client in the process.
+# Blocking pools queue callers for a free connection instead of raising
+# once every connection is checked out
+_text_pool = redis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=settings.redis_pool_size,
+    timeout=settings.redis_pool_timeout,
+    decode_responses=True,
+    encoding="utf-8",
+)
+_bytes_pool = redis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=settings.redis_pool_size,
+    timeout=settings.redis_pool_timeout,
+)
+
+
+def get_redis(decode_responses: bool = True) -> redis.Redis:
+    """Get a Redis client backed by the shared pool.
+
+    Args:
+        decode_responses: Return str instead of raw bytes
+    """
+    pool = _text_pool if decode_responses else _bytes_pool
+    return redis.Redis(connection_pool=pool)
+
+
+async def close_redis_pools() -> None:
+    """Disconnect every pooled Redis connection."""
+    await _text_pool.disconnect()
+    await _bytes_pool.disconnect()
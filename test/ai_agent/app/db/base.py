@@ -1,14 +1,16 @@
 """Database base configuration and session management."""
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
@@ -20,13 +22,25 @@ class Base(DeclarativeBase):
 
 
 # Create async engine
-engine = create_async_engine(
-    settings.postgres_dsn,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+if settings.pgbouncer_enabled:
+    # PgBouncer multiplexes connections; prepared statements don't survive
+    # transaction pooling, so asyncpg's statement caches are disabled
+    engine = create_async_engine(
+        f"{settings.postgres_dsn}?prepared_statement_cache_size=0",
+        echo=settings.debug,
+        poolclass=NullPool,
+        connect_args={"statement_cache_size": 0},
+    )
+else:
+    engine = create_async_engine(
+        settings.postgres_dsn,
+        echo=settings.debug,
+        pool_pre_ping=True,
+        pool_size=settings.postgres_pool_size,
+        max_overflow=settings.postgres_max_overflow,
+        pool_timeout=settings.postgres_pool_timeout,
+        pool_recycle=settings.postgres_pool_recycle,
+    )
 
 # Session factory
 async_session_factory = async_sessionmaker(
@@ -38,6 +52,14 @@ async_session_factory = async_sessionmaker(
 )
 
 
+def on_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run ``callback`` after the session's transaction commits.
+
+    Callbacks are dropped if the transaction rolls back.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
 @asynccontextmanager
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Provide a transactional scope around a series of operations."""
@@ -49,8 +71,12 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
         raise
     finally:
+        callbacks = session.info.pop("after_commit", [])
         await session.close()
 
+    for callback in callbacks:
+        await callback()
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for FastAPI endpoints."""
@@ -59,9 +85,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db() -> None:
-    """Initialize database tables."""
+    """Initialize database tables and upgrade ones from older versions."""
+    # Imported here: the models module depends on Base
+    from app.db.models import upgrade_documents_table
+
     async with engine.begin() as conn:
+        # Document embeddings are pgvector columns
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_documents_table)
 
 
 async def close_db() -> None:
@@ -1,13 +1,31 @@
 """CRUD operations for database models."""
 
 import uuid
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Tuple
 
-from sqlalchemy import desc, select
+import orjson
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import cast, desc, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.db.models import Conversation, Document, Message, User
+from app.core.config import settings
+from app.db.base import on_commit
+from app.db.models import (
+    TEXT_SEARCH_CONFIG,
+    Conversation,
+    Document,
+    Message,
+    User,
+    binary_quantize,
+)
+from app.memory.redis_memory import redis_memory
+
+# Reciprocal rank fusion constant
+RRF_K = 60
 
 
 class UserCRUD:
@@ -75,6 +93,20 @@ class ConversationCRUD:
         await session.flush()
         return conversation
 
+    @staticmethod
+    async def ensure(
+        session: AsyncSession,
+        conversation_id: uuid.UUID,
+        user_id: uuid.UUID,
+        title: Optional[str] = None,
+    ) -> None:
+        """Create the conversation unless it already exists, in one round trip."""
+        await session.execute(
+            insert(Conversation)
+            .values(id=conversation_id, user_id=user_id, title=title, metadata_={})
+            .on_conflict_do_nothing(index_elements=[Conversation.id])
+        )
+
     @staticmethod
     async def get_by_id(
         session: AsyncSession, conversation_id: uuid.UUID
@@ -109,14 +141,115 @@ class ConversationCRUD:
         conversation_id: uuid.UUID,
         summary: str,
     ) -> Optional[Conversation]:
-        """Update conversation summary."""
-        conversation = await ConversationCRUD.get_by_id(session, conversation_id)
-        if conversation:
-            conversation.summary = summary
-            await session.flush()
+        """Update conversation summary with a single UPDATE ... RETURNING."""
+        result = await session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(summary=summary)
+            .returning(Conversation)
+        )
+        conversation = result.scalar_one_or_none()
+        await session.flush()
         return conversation
 
 
+def _messages_index_key(conversation_id: uuid.UUID) -> str:
+    """Redis set of cached message window keys for a conversation."""
+    return f"conv:{conversation_id}:msgs"
+
+
+def _messages_cache_key(conversation_id: uuid.UUID, limit: int) -> str:
+    """Redis key for a cached window of the latest messages."""
+    return f"conv:{conversation_id}:msgs:{limit}"
+
+
+def _message_to_cache(message: Message) -> dict:
+    """Serialize a message row for the Redis cache."""
+    return {
+        "id": message.id,
+        "conversation_id": message.conversation_id,
+        "role": message.role,
+        "content": message.content,
+        "token_count": message.token_count,
+        "tool_calls": message.tool_calls,
+        "tool_call_id": message.tool_call_id,
+        "created_at": message.created_at,
+        "metadata_": message.metadata_,
+    }
+
+
+def _message_from_cache(data: dict) -> Message:
+    """Rebuild a detached message row from the Redis cache."""
+    created_at = data["created_at"]
+    return Message(
+        **{
+            **data,
+            "id": uuid.UUID(data["id"]),
+            "conversation_id": uuid.UUID(data["conversation_id"]),
+            "created_at": datetime.fromisoformat(created_at) if created_at else None,
+        }
+    )
+
+
+def _message_count_key(conversation_id: uuid.UUID) -> str:
+    """Redis key for a conversation's cached message count."""
+    return f"conv:{conversation_id}:msg_count"
+
+
+# Only bump counters that were backfilled; a missing key stays missing
+_INCR_IF_EXISTS = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+    return redis.call("INCRBY", KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+async def _update_message_caches(added: Counter) -> None:
+    """Bump cached counts and drop cached windows of the given conversations.
+
+    Args:
+        added: Number of new messages per conversation ID
+    """
+    if not redis_memory.redis or not added:
+        return
+
+    index_keys = [_messages_index_key(cid) for cid in added]
+    async with redis_memory.redis.pipeline(transaction=False) as pipe:
+        for cid, count in added.items():
+            pipe.eval(
+                _INCR_IF_EXISTS,
+                1,
+                _message_count_key(cid),
+                count,
+                settings.short_term_memory_ttl,
+            )
+        for index_key in index_keys:
+            pipe.smembers(index_key)
+        results = await pipe.execute()
+
+    keys = [key for members in results[len(added):] for key in members]
+    await redis_memory.redis.delete(*index_keys, *keys)
+
+
+def _on_messages_added(session: AsyncSession, added: Counter) -> None:
+    """Update the Redis caches of conversations once their messages commit.
+
+    Deferring to the commit keeps a rolled-back insert from inflating the
+    counts, and a concurrent read from caching the old window again.
+
+    Args:
+        session: Session the messages were inserted in
+        added: Number of new messages per conversation ID
+    """
+    pending = session.info.get("messages_added")
+    if pending is None:
+        pending = session.info["messages_added"] = Counter()
+        on_commit(session, lambda: _update_message_caches(pending))
+    pending.update(added)
+
+
 class MessageCRUD:
     """CRUD operations for Message model."""
 
@@ -143,8 +276,24 @@ class MessageCRUD:
         )
         session.add(message)
         await session.flush()
+        _on_messages_added(session, Counter([conversation_id]))
         return message
 
+    @staticmethod
+    async def create_batch(
+        session: AsyncSession, messages: List[dict]
+    ) -> List[Message]:
+        """Create multiple messages with one bulk INSERT ... RETURNING."""
+        if not messages:
+            return []
+
+        result = await session.execute(insert(Message).returning(Message), messages)
+        db_messages = list(result.scalars().all())
+        _on_messages_added(
+            session, Counter(message["conversation_id"] for message in messages)
+        )
+        return db_messages
+
     @staticmethod
     async def get_conversation_messages(
         session: AsyncSession,
@@ -152,31 +301,72 @@ class MessageCRUD:
         limit: int = 50,
         before: Optional[datetime] = None,
     ) -> Sequence[Message]:
-        """Get messages for a conversation."""
+        """Get messages for a conversation.
+
+        The latest window (no ``before``) is cached in Redis until the
+        conversation gets a new message or the short-term memory TTL passes.
+        """
+        use_cache = before is None and redis_memory.redis is not None
+        if use_cache:
+            cache_key = _messages_cache_key(conversation_id, limit)
+            cached = await redis_memory.redis.get(cache_key)
+            if cached is not None:
+                return [_message_from_cache(data) for data in orjson.loads(cached)]
+
         query = select(Message).where(Message.conversation_id == conversation_id)
 
         if before:
             query = query.where(Message.created_at < before)
 
-        result = await session.execute(
-            query.order_by(desc(Message.created_at)).limit(limit)
+        # Newest window in a subquery, returned oldest first
+        window = aliased(
+            Message, query.order_by(desc(Message.created_at)).limit(limit).subquery()
         )
+        result = await session.execute(select(window).order_by(window.created_at))
         messages = result.scalars().all()
-        return list(reversed(messages))
+
+        if use_cache:
+            index_key = _messages_index_key(conversation_id)
+            async with redis_memory.redis.pipeline(transaction=True) as pipe:
+                pipe.setex(
+                    cache_key,
+                    settings.short_term_memory_ttl,
+                    orjson.dumps([_message_to_cache(m) for m in messages]),
+                )
+                pipe.sadd(index_key, cache_key)
+                pipe.expire(index_key, settings.short_term_memory_ttl)
+                await pipe.execute()
+
+        return messages
 
     @staticmethod
     async def count_conversation_messages(
         session: AsyncSession, conversation_id: uuid.UUID
     ) -> int:
-        """Count messages in a conversation."""
-        from sqlalchemy import func
+        """Count messages in a conversation.
+
+        The count is kept in Redis and incremented as messages are created;
+        a missing counter is backfilled once with ``COUNT(*)``.
+        """
+        count_key = _message_count_key(conversation_id)
+        if redis_memory.redis:
+            cached = await redis_memory.redis.get(count_key)
+            if cached is not None:
+                return int(cached)
 
         result = await session.execute(
             select(func.count(Message.id)).where(
                 Message.conversation_id == conversation_id
             )
         )
-        return result.scalar() or 0
+        count = result.scalar() or 0
+
+        if redis_memory.redis:
+            # NX: a counter set by a concurrent backfill is kept
+            await redis_memory.redis.set(
+                count_key, count, ex=settings.short_term_memory_ttl, nx=True
+            )
+        return count
 
 
 class DocumentCRUD:
@@ -213,11 +403,12 @@ class DocumentCRUD:
     async def create_batch(
         session: AsyncSession, documents: List[dict]
     ) -> List[Document]:
-        """Create multiple documents."""
-        db_documents = [Document(**doc) for doc in documents]
-        session.add_all(db_documents)
-        await session.flush()
-        return db_documents
+        """Create multiple documents with one bulk INSERT ... RETURNING."""
+        if not documents:
+            return []
+
+        result = await session.execute(insert(Document).returning(Document), documents)
+        return list(result.scalars().all())
 
     @staticmethod
     async def get_by_id(
@@ -245,19 +436,139 @@ class DocumentCRUD:
         keyword: str,
         doc_type: Optional[str] = None,
         limit: int = 10,
+        metadata_filter: Optional[dict] = None,
     ) -> Sequence[Document]:
-        """Search documents by keyword (simple LIKE search)."""
-        query = select(Document).where(
-            Document.content.ilike(f"%{keyword}%")
-            | Document.title.ilike(f"%{keyword}%")
-        )
+        """Search documents by keyword using the full-text GIN index.
+
+        Results are ordered by ``ts_rank_cd`` relevance. ``metadata_filter``
+        keeps documents whose metadata contains it, using the JSONB GIN index.
+        """
+        ts_query = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, keyword)
+        score = func.ts_rank_cd(Document.search_vector, ts_query)
+        query = select(Document).where(Document.search_vector.op("@@")(ts_query))
 
         if doc_type:
             query = query.where(Document.doc_type == doc_type)
+        if metadata_filter:
+            query = query.where(Document.metadata_.contains(metadata_filter))
 
-        result = await session.execute(query.limit(limit))
+        result = await session.execute(query.order_by(desc(score)).limit(limit))
         return result.scalars().all()
 
+    @staticmethod
+    async def hybrid_search(
+        session: AsyncSession,
+        query_embedding: List[float],
+        query_text: str,
+        k: int = 5,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        candidates: int = 50,
+        metadata_filter: Optional[dict] = None,
+        rerank_candidates: int = 200,
+    ) -> List[Tuple[Document, float]]:
+        """Search documents by vector similarity and full text in one query.
+
+        The top ``candidates`` of the HNSW cosine search and of the GIN
+        full-text search are fused in SQL with weighted reciprocal rank
+        fusion, so a document found by only one path still scores. The
+        vector side scans the binary-quantized HNSW index by Hamming distance
+        for ``rerank_candidates`` rows and reranks them by fp32 cosine
+        distance. ``metadata_filter`` restricts both searches to documents whose
+        metadata contains it.
+        """
+        filters = []
+        if metadata_filter:
+            filters.append(Document.metadata_.contains(metadata_filter))
+
+        query_vector = cast(query_embedding, Vector(settings.embedding_dimension))
+        hamming = binary_quantize(Document.embedding).hamming_distance(
+            binary_quantize(query_vector)
+        )
+        coarse = (
+            select(Document.id, Document.embedding)
+            .where(Document.embedding.is_not(None), *filters)
+            .order_by(hamming)
+            .limit(rerank_candidates)
+            .cte("coarse")
+        )
+
+        distance = coarse.c.embedding.cosine_distance(query_vector)
+        vec = (
+            select(
+                coarse.c.id,
+                func.row_number().over(order_by=distance).label("rank"),
+            )
+            .order_by(distance)
+            .limit(candidates)
+            .cte("vec")
+        )
+
+        ts_query = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query_text)
+        ts_rank = func.ts_rank_cd(Document.search_vector, ts_query)
+        kw = (
+            select(
+                Document.id,
+                func.row_number().over(order_by=desc(ts_rank)).label("rank"),
+            )
+            .where(Document.search_vector.op("@@")(ts_query), *filters)
+            .order_by(desc(ts_rank))
+            .limit(candidates)
+            .cte("kw")
+        )
+
+        fused = (
+            select(
+                func.coalesce(vec.c.id, kw.c.id).label("id"),
+                (
+                    func.coalesce(vector_weight / (RRF_K + vec.c.rank), 0.0)
+                    + func.coalesce(keyword_weight / (RRF_K + kw.c.rank), 0.0)
+                ).label("score"),
+            )
+            .select_from(vec.join(kw, vec.c.id == kw.c.id, full=True))
+            .cte("fused")
+        )
+
+        # The HNSW scan only yields ef_search rows, 40 by default
+        await session.execute(
+            select(func.set_config("hnsw.ef_search", str(rerank_candidates), True))
+        )
+        result = await session.execute(
+            select(Document, fused.c.score)
+            .join(fused, Document.id == fused.c.id)
+            .order_by(desc(fused.c.score))
+            .limit(k)
+        )
+        return [(document, float(score)) for document, score in result.all()]
+
+    @staticmethod
+    async def get_missing_embeddings(
+        session: AsyncSession, limit: int
+    ) -> Sequence[Tuple[uuid.UUID, str]]:
+        """Get up to ``limit`` (ID, content) pairs of chunks without an embedding."""
+        result = await session.execute(
+            select(Document.id, Document.content)
+            .where(Document.embedding.is_(None))
+            .limit(limit)
+        )
+        return result.tuples().all()
+
+    @staticmethod
+    async def set_embeddings(
+        session: AsyncSession, embeddings: List[Tuple[uuid.UUID, List[float]]]
+    ) -> None:
+        """Store embeddings for existing chunks with one bulk UPDATE."""
+        if not embeddings:
+            return
+
+        await session.execute(
+            update(Document),
+            [
+                {"id": document_id, "embedding": embedding}
+                for document_id, embedding in embeddings
+            ],
+        )
+
     @staticmethod
     async def delete_by_parent_id(
         session: AsyncSession, parent_id: uuid.UUID
@@ -270,3 +581,16 @@ class DocumentCRUD:
         )
         await session.flush()
         return result.rowcount
+
+    @staticmethod
+    async def delete_by_embedding_ids(
+        session: AsyncSession, embedding_ids: List[str]
+    ) -> int:
+        """Delete document chunks by embedding IDs."""
+        from sqlalchemy import delete
+
+        result = await session.execute(
+            delete(Document).where(Document.embedding_id.in_(embedding_ids))
+        )
+        await session.flush()
+        return result.rowcount
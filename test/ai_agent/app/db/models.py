@@ -2,10 +2,12 @@
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 
+from pgvector.sqlalchemy import BIT, Vector
 from sqlalchemy import (
     Boolean,
+    Computed,
     DateTime,
     Enum,
     ForeignKey,
@@ -13,13 +15,26 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    desc,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.schema import CreateColumn
 
+from app.core.config import settings
 from app.db.base import Base
 
+# PostgreSQL text search configuration for document keyword search
+TEXT_SEARCH_CONFIG = "english"
+
+
+def binary_quantize(embedding: Any) -> Any:
+    """SQL expression packing an embedding into one sign bit per dimension."""
+    return func.binary_quantize(embedding).cast(BIT(settings.embedding_dimension))
+
 
 class User(Base):
     """User model for storing user information."""
@@ -89,6 +104,13 @@ class Conversation(Base):
     __table_args__ = (
         Index("ix_conversations_user_id", "user_id"),
         Index("ix_conversations_created_at", "created_at"),
+        # Serves get_user_conversations' top-K without a sort
+        Index(
+            "ix_conversations_user_active_updated",
+            "user_id",
+            desc("updated_at"),
+            postgresql_where=text("is_active"),
+        ),
     )
 
 
@@ -154,6 +176,17 @@ class Document(Base):
         UUID(as_uuid=True), nullable=True
     )
     embedding_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{TEXT_SEARCH_CONFIG}', title || ' ' || content)",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    embedding: Mapped[Optional[List[float]]] = mapped_column(
+        Vector(settings.embedding_dimension), nullable=True, deferred=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -168,4 +201,42 @@ class Document(Base):
         Index("ix_documents_title", "title"),
         Index("ix_documents_doc_type", "doc_type"),
         Index("ix_documents_parent_id", "parent_id"),
-    )
+        Index("ix_documents_search", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_documents_metadata_gin",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+    )
+
+
+# HNSW over 1-bit quantized embeddings (32x smaller than fp32) for the ANN
+# prefilter; full-precision vectors are only read to rerank the candidates
+Index(
+    "ix_documents_embedding_binary",
+    binary_quantize(Document.embedding).label("embedding_binary"),
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding_binary": "bit_hamming_ops"},
+)
+
+# Document columns added after the table was first released
+_DOCUMENT_UPGRADE_COLUMNS = ("search_vector", "embedding")
+
+
+def upgrade_documents_table(conn: Connection) -> None:
+    """Add columns and indexes missing from an older ``documents`` table.
+
+    ``create_all`` skips tables that already exist, so search columns added
+    since are created here. Every statement is a no-op once applied.
+    """
+    table = Document.__table__
+    for name in _DOCUMENT_UPGRADE_COLUMNS:
+        column_ddl = CreateColumn(table.c[name]).compile(dialect=conn.dialect)
+        conn.execute(
+            text(f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {column_ddl}")
+        )
+
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
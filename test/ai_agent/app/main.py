@@ -1,45 +1,67 @@
 """FastAPI application entry point."""
 
+import asyncio
+import logging
 import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.agent.react_agent import wait_for_background_persists
 from app.api import chat, health, rag
 from app.core.config import settings
+from app.core.redis_pool import close_redis_pools
 from app.db.base import close_db, init_db
 from app.memory.redis_memory import redis_memory
-from app.memory.vector_store import vector_store
+from app.rag.reranker import reranker
+from app.rag.retriever import rag_manager
+from app.tools.web_search import web_search_tool
 
+# Uvicorn configures this logger, so startup messages show with its output
+logger = logging.getLogger("uvicorn.error")
 
-@asynccontextmanager
-async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Application lifespan manager for startup and shutdown."""
-    # Startup
-    print(f"Starting {settings.app_name}...")
 
-    # Initialize database
+async def backfill_document_embeddings() -> None:
+    """Embed document chunks stored without a PostgreSQL embedding."""
     try:
-        await init_db()
-        print("PostgreSQL connected and tables created")
+        count = await rag_manager.backfill_embeddings()
     except Exception as e:
-        print(f"Failed to initialize database: {e}")
+        logger.error("Embedding backfill failed: %s", e)
+    else:
+        if count:
+            logger.info("Backfilled embeddings for %d document chunks", count)
 
-    # Connect to Redis
-    try:
-        await redis_memory.connect()
-        print("Redis memory connected")
-    except Exception as e:
-        print(f"Failed to connect Redis memory: {e}")
 
-    # Connect vector store
-    try:
-        await vector_store.connect()
-        print("Redis vector store connected")
-    except Exception as e:
-        print(f"Failed to connect vector store: {e}")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """Application lifespan manager for startup and shutdown."""
+    # Startup
+    logger.info("Starting %s...", settings.app_name)
+
+    # Connect PostgreSQL and Redis (and load the reranker) concurrently; a
+    # failed step is logged and doesn't block the others
+    steps = {
+        "PostgreSQL": init_db(),
+        "Redis memory": redis_memory.connect(),
+    }
+    if settings.rerank_model:
+        steps[f"Reranker {settings.rerank_model}"] = reranker.load()
+
+    results = await asyncio.gather(*steps.values(), return_exceptions=True)
+    for name, result in zip(steps, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to initialize %s: %s", name, result)
+        else:
+            logger.info("%s ready", name)
+
+    # Chunks ingested before embeddings moved to PostgreSQL are embedded in
+    # the background so startup isn't held up
+    backfill_task = None
+    if not isinstance(results[0], Exception):
+        backfill_task = asyncio.create_task(backfill_document_embeddings())
 
     # Set LangSmith environment variables
     if settings.langchain_tracing_v2:
@@ -47,20 +69,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         os.environ["LANGCHAIN_ENDPOINT"] = settings.langchain_endpoint
         os.environ["LANGCHAIN_API_KEY"] = settings.langchain_api_key
         os.environ["LANGCHAIN_PROJECT"] = settings.langchain_project
-        print(f"LangSmith tracing enabled for project: {settings.langchain_project}")
+        logger.info("LangSmith tracing enabled for project: %s", settings.langchain_project)
 
-    print(f"{settings.app_name} started successfully!")
+    logger.info("%s started successfully!", settings.app_name)
 
     yield
 
     # Shutdown
-    print(f"Shutting down {settings.app_name}...")
+    logger.info("Shutting down %s...", settings.app_name)
+
+    if backfill_task is not None:
+        backfill_task.cancel()
+        await asyncio.gather(backfill_task, return_exceptions=True)
 
+    # Background persists still write to Redis and PostgreSQL
+    await wait_for_background_persists()
     await redis_memory.disconnect()
-    await vector_store.disconnect()
+    await close_redis_pools()
     await close_db()
+    await web_search_tool.aclose()
 
-    print("Shutdown complete")
+    logger.info("Shutdown complete")
 
 
 def create_app() -> FastAPI:
@@ -72,6 +101,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware
@@ -1,13 +1,12 @@
 """Memory management module."""
 
 from app.memory.redis_memory import ConversationMemory, RedisMemoryManager, redis_memory
-from app.memory.vector_store import RedisVectorStore, VectorDocument, vector_store
+from app.memory.embeddings import DocumentEmbedder, document_embedder
 
 __all__ = [
     "RedisMemoryManager",
     "redis_memory",
     "ConversationMemory",
-    "RedisVectorStore",
-    "vector_store",
-    "VectorDocument",
+    "DocumentEmbedder",
+    "document_embedder",
 ]
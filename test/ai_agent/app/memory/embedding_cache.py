@@ -0,0 +1,99 @@
+"""Redis-backed cache in front of an embeddings client."""
+
+import hashlib
+from typing import Dict, List
+
+import numpy as np
+import redis.asyncio as redis
+from langchain_core.embeddings import Embeddings
+
+from app.core.redis_pool import get_redis
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that caches vectors by content hash in Redis.
+
+    Query and document embeddings are cached separately, since some models
+    encode them differently. Redis errors fall through to the wrapped client.
+    """
+
+    def __init__(self, embeddings: Embeddings, namespace: str, ttl: int):
+        """Initialize the cache.
+
+        Args:
+            embeddings: Wrapped embeddings client
+            namespace: Key namespace, typically the model name
+            ttl: Cache entry lifetime in seconds
+        """
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.ttl = ttl
+        self.redis = get_redis(decode_responses=False)
+
+    def _key(self, kind: str, content: str) -> str:
+        """Cache key for a text embedded as a query or a document."""
+        digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        return f"emb:{self.namespace}:{kind}:{digest}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents synchronously, bypassing the cache."""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query synchronously, bypassing the cache."""
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a query, serving repeated queries from the cache."""
+        key = self._key("q", text)
+        try:
+            cached = await self.redis.get(key)
+        except redis.RedisError:
+            cached = None
+        if cached is not None:
+            return np.frombuffer(cached, dtype=np.float32).tolist()
+
+        embedding = await self.embeddings.aembed_query(text)
+        try:
+            await self.redis.set(
+                key, np.asarray(embedding, dtype=np.float32).tobytes(), ex=self.ttl
+            )
+        except redis.RedisError:
+            pass
+        return embedding
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents with one MGET, embedding only uncached texts."""
+        if not texts:
+            return []
+
+        keys = [self._key("d", text) for text in texts]
+        try:
+            cached = await self.redis.mget(keys)
+        except redis.RedisError:
+            cached = [None] * len(texts)
+
+        found: Dict[str, List[float]] = {
+            text: np.frombuffer(raw, dtype=np.float32).tolist()
+            for text, raw in zip(texts, cached)
+            if raw is not None
+        }
+
+        # Duplicate texts in the batch are embedded once
+        missing = list(dict.fromkeys(text for text in texts if text not in found))
+        if missing:
+            embeddings = await self.embeddings.aembed_documents(missing)
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for text, embedding in zip(missing, embeddings):
+                        pipe.set(
+                            self._key("d", text),
+                            np.asarray(embedding, dtype=np.float32).tobytes(),
+                            ex=self.ttl,
+                        )
+                    await pipe.execute()
+            except redis.RedisError:
+                pass
+            found.update(zip(missing, embeddings))
+
+        return [found[text] for text in texts]
@@ -0,0 +1,99 @@
+"""Embedding client for knowledge base documents and queries."""
+
+import asyncio
+import hashlib
+import uuid
+from typing import AsyncIterator, List, Tuple
+
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from app.core.config import settings
+from app.memory.embedding_cache import CachedEmbeddings
+
+# Texts per embeddings API request when adding documents in bulk
+EMBED_BATCH_SIZE = 512
+
+# Embedding batches in flight at once
+EMBED_CONCURRENCY = 4
+
+
+def create_embeddings() -> Embeddings:
+    """Create the embeddings client for the configured backend.
+
+    Unless ``embedding_cache_ttl`` is 0, the client is wrapped in a Redis
+    cache keyed by content hash.
+    """
+    embeddings: Embeddings
+    if settings.embedding_backend == "fastembed":
+        # Imported lazily: fastembed is only needed for local inference
+        from app.memory.embeddings_local import FastEmbedEmbeddings
+
+        embeddings = FastEmbedEmbeddings(model_name=settings.embedding_model)
+    else:
+        embeddings = OpenAIEmbeddings(
+            model=settings.embedding_model,
+            openai_api_key=settings.openai_api_key,
+        )
+
+    if settings.embedding_cache_ttl > 0:
+        embeddings = CachedEmbeddings(
+            embeddings,
+            namespace=f"{settings.embedding_backend}:{settings.embedding_model}",
+            ttl=settings.embedding_cache_ttl,
+        )
+    return embeddings
+
+
+class DocumentEmbedder:
+    """Embed document chunks in concurrent batches.
+
+    Chunks and their embeddings are stored in PostgreSQL, which also serves
+    retrieval.
+    """
+
+    def __init__(self):
+        """Initialize the embeddings client."""
+        self.embeddings = create_embeddings()
+
+    def generate_doc_id(self, content: str) -> str:
+        """Generate a unique document ID based on content hash."""
+        content_hash = hashlib.blake2b(content.encode(), digest_size=6).hexdigest()
+        return f"{uuid.uuid4().hex[:8]}_{content_hash}"
+
+    async def embed_documents(self, contents: List[str]) -> List[List[float]]:
+        """Embed texts ``EMBED_BATCH_SIZE`` at a time, batches in parallel."""
+        embeddings: List[List[float]] = [[] for _ in contents]
+        async for offset, batch in self.embed_batches_as_completed(contents):
+            embeddings[offset : offset + len(batch)] = batch
+        return embeddings
+
+    async def embed_batches_as_completed(
+        self, contents: List[str]
+    ) -> AsyncIterator[Tuple[int, List[List[float]]]]:
+        """Yield ``(offset, embeddings)`` for each batch as soon as it is ready.
+
+        Up to ``EMBED_CONCURRENCY`` batches are embedded at once and keep
+        running while the caller handles earlier ones.
+        """
+        semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+        async def embed_batch(offset: int) -> Tuple[int, List[List[float]]]:
+            async with semaphore:
+                batch = contents[offset : offset + EMBED_BATCH_SIZE]
+                return offset, await self.embeddings.aembed_documents(batch)
+
+        tasks = [
+            asyncio.ensure_future(embed_batch(offset))
+            for offset in range(0, len(contents), EMBED_BATCH_SIZE)
+        ]
+        try:
+            for next_batch in asyncio.as_completed(tasks):
+                yield await next_batch
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+# Global instance
+document_embedder = DocumentEmbedder()
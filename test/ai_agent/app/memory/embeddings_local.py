@@ -0,0 +1,52 @@
+"""Local ONNX embeddings via FastEmbed."""
+
+import asyncio
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+class FastEmbedEmbeddings(Embeddings):
+    """LangChain embeddings backed by a local FastEmbed (ONNX Runtime) model."""
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 256,
+        parallel: Optional[int] = 0,
+    ):
+        """Load the model.
+
+        Args:
+            model_name: FastEmbed model, e.g. ``BAAI/bge-small-en-v1.5``
+            batch_size: Texts per inference batch
+            parallel: Worker processes for large inputs; 0 uses every core
+        """
+        from fastembed import TextEmbedding
+
+        self.model = TextEmbedding(model_name=model_name, threads=None)
+        self.batch_size = batch_size
+        self.parallel = parallel
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed passages, fanning out to worker processes for large inputs."""
+        # Worker startup only pays off once there is more than one batch
+        parallel = self.parallel if len(texts) > self.batch_size else None
+        return [
+            vector.tolist()
+            for vector in self.model.embed(
+                texts, batch_size=self.batch_size, parallel=parallel
+            )
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search query."""
+        return next(iter(self.model.query_embed(text))).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed passages off the event loop."""
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a search query off the event loop."""
+        return await asyncio.to_thread(self.embed_query, text)
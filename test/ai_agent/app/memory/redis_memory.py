@@ -1,11 +1,13 @@
 """Redis-based memory management for short-term session storage."""
 
-import json
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
 
+import msgspec
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
 from langchain_core.messages import (
     AIMessage,
     BaseMessage,
@@ -13,13 +15,34 @@ from langchain_core.messages import (
     SystemMessage,
     ToolMessage,
 )
-from pydantic import BaseModel
-
 from app.core.config import settings
+from app.core.redis_pool import get_redis
+
+
+# Seconds a formatted timestamp is reused across burst writes
+_NOW_TTL = 0.05
+_now_cache = [0.0, ""]
 
 
-class ConversationMemory(BaseModel):
-    """In-memory conversation state."""
+def _now_iso() -> str:
+    """Current UTC time in ISO format, reformatted at most every ``_NOW_TTL``."""
+    now = time.time()
+    if now - _now_cache[0] > _NOW_TTL:
+        _now_cache[0] = now
+        _now_cache[1] = (
+            datetime.fromtimestamp(now, tz=timezone.utc).replace(tzinfo=None).isoformat()
+        )
+    return _now_cache[1]
+
+
+class ConversationMemory(msgspec.Struct, omit_defaults=True):
+    """In-memory conversation state.
+
+    Only the fixed session fields are stored in the session key,
+    msgpack-encoded. Messages live in a separate Redis list and context
+    entries in a state hash, so both can be updated without reading the
+    session; they are attached when the session is read.
+    """
 
     session_id: str
     user_id: str
@@ -29,6 +52,28 @@ class ConversationMemory(BaseModel):
     updated_at: str = ""
 
 
+class StoredMessage(msgspec.Struct, omit_defaults=True):
+    """Message list entry, encoded straight to msgpack."""
+
+    type: str
+    content: Union[str, List[Any]] = ""
+    timestamp: str = ""
+    tool_calls: List[Dict[str, Any]] = []
+    tool_call_id: str = ""
+    additional_kwargs: Dict[str, Any] = {}
+
+
+_encoder = msgspec.msgpack.Encoder()
+_session_decoder = msgspec.msgpack.Decoder(ConversationMemory)
+_message_decoder = msgspec.msgpack.Decoder(StoredMessage)
+_message_dict_decoder = msgspec.msgpack.Decoder(Dict[str, Any])
+_value_decoder = msgspec.msgpack.Decoder()
+
+# State hash fields: one msgpack-encoded value per context entry
+_CONTEXT_PREFIX = "ctx:"
+_UPDATED_AT_FIELD = "updated_at"
+
+
 class RedisMemoryManager:
     """Manager for short-term memory storage in Redis."""
 
@@ -40,11 +85,8 @@ class RedisMemoryManager:
 
     async def connect(self) -> None:
         """Establish Redis connection."""
-        self.redis = redis.from_url(
-            settings.redis_url,
-            encoding="utf-8",
-            decode_responses=True,
-        )
+        # Raw bytes: message list entries are msgpack-encoded
+        self.redis = get_redis(decode_responses=False)
         await self.redis.ping()
 
     async def disconnect(self) -> None:
@@ -56,46 +98,44 @@ class RedisMemoryManager:
         """Generate Redis key for session."""
         return f"session:{session_id}"
 
-    def _message_to_dict(self, message: BaseMessage) -> Dict[str, Any]:
-        """Convert LangChain message to dictionary."""
-        msg_dict = {
-            "type": message.__class__.__name__,
-            "content": message.content,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        if hasattr(message, "tool_calls") and message.tool_calls:
-            msg_dict["tool_calls"] = message.tool_calls
-
-        if hasattr(message, "tool_call_id") and message.tool_call_id:
-            msg_dict["tool_call_id"] = message.tool_call_id
-
-        if message.additional_kwargs:
-            msg_dict["additional_kwargs"] = message.additional_kwargs
-
-        return msg_dict
+    def _messages_key(self, session_id: str) -> str:
+        """Generate Redis key for the session's message list."""
+        return f"session:{session_id}:messages"
+
+    def _state_key(self, session_id: str) -> str:
+        """Generate Redis key for the session's context and update time."""
+        return f"session:{session_id}:state"
+
+    def _message_to_struct(self, message: BaseMessage, timestamp: str) -> StoredMessage:
+        """Convert LangChain message to a storable struct."""
+        return StoredMessage(
+            type=message.__class__.__name__,
+            content=message.content,
+            timestamp=timestamp,
+            tool_calls=getattr(message, "tool_calls", None) or [],
+            tool_call_id=getattr(message, "tool_call_id", None) or "",
+            additional_kwargs=message.additional_kwargs,
+        )
 
-    def _dict_to_message(self, msg_dict: Dict[str, Any]) -> BaseMessage:
-        """Convert dictionary back to LangChain message."""
-        msg_type = msg_dict.get("type", "HumanMessage")
-        content = msg_dict.get("content", "")
-        additional_kwargs = msg_dict.get("additional_kwargs", {})
+    def _struct_to_message(self, stored: StoredMessage) -> BaseMessage:
+        """Convert a stored struct back to LangChain message."""
+        content = stored.content
+        additional_kwargs = stored.additional_kwargs
 
-        if msg_type == "HumanMessage":
+        if stored.type == "HumanMessage":
             return HumanMessage(content=content, additional_kwargs=additional_kwargs)
-        elif msg_type == "AIMessage":
-            tool_calls = msg_dict.get("tool_calls", [])
+        elif stored.type == "AIMessage":
             return AIMessage(
                 content=content,
                 additional_kwargs=additional_kwargs,
-                tool_calls=tool_calls,
+                tool_calls=stored.tool_calls,
             )
-        elif msg_type == "SystemMessage":
+        elif stored.type == "SystemMessage":
             return SystemMessage(content=content, additional_kwargs=additional_kwargs)
-        elif msg_type == "ToolMessage":
+        elif stored.type == "ToolMessage":
             return ToolMessage(
                 content=content,
-                tool_call_id=msg_dict.get("tool_call_id", ""),
+                tool_call_id=stored.tool_call_id,
                 additional_kwargs=additional_kwargs,
             )
         else:
@@ -112,22 +152,24 @@ class RedisMemoryManager:
             raise RuntimeError("Redis not connected")
 
         session_id = session_id or str(uuid.uuid4())
-        now = datetime.utcnow().isoformat()
+        now = _now_iso()
 
         memory = ConversationMemory(
             session_id=session_id,
             user_id=user_id,
-            messages=[],
-            context=initial_context or {},
             created_at=now,
             updated_at=now,
         )
 
-        await self.redis.setex(
-            self._session_key(session_id),
-            self.ttl,
-            memory.model_dump_json(),
-        )
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.setex(
+                self._session_key(session_id),
+                self.ttl,
+                _encoder.encode(memory),
+            )
+            if initial_context:
+                self._queue_context(pipe, session_id, initial_context, now)
+            await pipe.execute()
 
         return session_id
 
@@ -136,62 +178,154 @@ class RedisMemoryManager:
         if not self.redis:
             raise RuntimeError("Redis not connected")
 
-        data = await self.redis.get(self._session_key(session_id))
-        if data:
-            return ConversationMemory.model_validate_json(data)
-        return None
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self._session_key(session_id))
+            pipe.lrange(self._messages_key(session_id), 0, -1)
+            pipe.hgetall(self._state_key(session_id))
+            data, raw_messages, state = await pipe.execute()
+
+        if not data:
+            return None
+
+        session = _session_decoder.decode(data)
+        session.messages = [_message_dict_decoder.decode(raw) for raw in raw_messages]
+
+        # Sessions written before the state hash keep their context inline
+        updated = [session.updated_at]
+        for field, value in state.items():
+            field = field.decode()
+            if field == _UPDATED_AT_FIELD:
+                updated.append(value.decode())
+            elif field.startswith(_CONTEXT_PREFIX):
+                session.context[field[len(_CONTEXT_PREFIX):]] = _value_decoder.decode(value)
+        if session.messages:
+            updated.append(session.messages[-1]["timestamp"])
+        # ISO timestamps order lexicographically
+        session.updated_at = max(updated)
+        return session
 
     async def add_message(
         self,
         session_id: str,
         message: BaseMessage,
+        pipe: Optional[Pipeline] = None,
     ) -> None:
         """Add a message to the session."""
-        if not self.redis:
-            raise RuntimeError("Redis not connected")
-
-        session = await self.get_session(session_id)
-        if not session:
-            raise ValueError(f"Session {session_id} not found")
-
-        msg_dict = self._message_to_dict(message)
-        session.messages.append(msg_dict)
+        await self.add_messages(session_id, [message], pipe=pipe)
 
+    def _queue_messages(
+        self,
+        pipe: Pipeline,
+        session_id: str,
+        messages: List[BaseMessage],
+    ) -> None:
+        """Queue the append, trim and TTL refresh for messages on a pipeline."""
+        session_key = self._session_key(session_id)
+        messages_key = self._messages_key(session_id)
+        now = _now_iso()
+        packed = [
+            _encoder.encode(self._message_to_struct(message, now)) for message in messages
+        ]
+
+        pipe.rpush(messages_key, *packed)
         # Trim to max history
-        if len(session.messages) > self.max_history:
-            session.messages = session.messages[-self.max_history :]
+        pipe.ltrim(messages_key, -self.max_history, -1)
+        pipe.expire(messages_key, self.ttl)
+        pipe.expire(session_key, self.ttl)
+        pipe.expire(self._state_key(session_id), self.ttl)
 
-        session.updated_at = datetime.utcnow().isoformat()
+    def _queue_context(
+        self,
+        pipe: Pipeline,
+        session_id: str,
+        context: Dict[str, Any],
+        updated_at: str,
+    ) -> None:
+        """Queue writing context entries and the update time to the state hash."""
+        state_key = self._state_key(session_id)
+        mapping = {
+            f"{_CONTEXT_PREFIX}{key}": _encoder.encode(value)
+            for key, value in context.items()
+        }
+        mapping[_UPDATED_AT_FIELD] = updated_at
 
-        await self.redis.setex(
-            self._session_key(session_id),
-            self.ttl,
-            session.model_dump_json(),
-        )
+        pipe.hset(state_key, mapping=mapping)
+        pipe.expire(state_key, self.ttl)
 
     async def add_messages(
         self,
         session_id: str,
         messages: List[BaseMessage],
+        pipe: Optional[Pipeline] = None,
     ) -> None:
-        """Add multiple messages to the session."""
-        for message in messages:
-            await self.add_message(session_id, message)
+        """Append messages to the session in a single MULTI/EXEC round trip.
+
+        When ``pipe`` is given the commands are only queued on it, so writes
+        for several sessions can share one round trip; the caller executes
+        the pipeline and is responsible for the sessions existing.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+
+        if not messages:
+            return
+
+        if pipe is not None:
+            self._queue_messages(pipe, session_id, messages)
+            return
+
+        session_key = self._session_key(session_id)
+        messages_key = self._messages_key(session_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.exists(session_key)
+            self._queue_messages(pipe, session_id, messages)
+            exists, *_ = await pipe.execute()
+
+        if not exists:
+            await self.redis.delete(messages_key)
+            raise ValueError(f"Session {session_id} not found")
 
     async def get_messages(self, session_id: str) -> List[BaseMessage]:
         """Get all messages from session as LangChain messages."""
-        session = await self.get_session(session_id)
-        if not session:
-            return []
-
-        return [self._dict_to_message(msg) for msg in session.messages]
+        return await self.get_recent_messages(session_id, limit=0)
 
     async def get_recent_messages(
         self, session_id: str, limit: int = 10
     ) -> List[BaseMessage]:
-        """Get recent messages from session."""
-        messages = await self.get_messages(session_id)
-        return messages[-limit:]
+        """Get recent messages from session with a single LRANGE.
+
+        A ``limit`` of 0 returns every stored message.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+
+        raw_messages = await self.redis.lrange(
+            self._messages_key(session_id), -limit if limit > 0 else 0, -1
+        )
+        return [
+            self._struct_to_message(_message_decoder.decode(raw)) for raw in raw_messages
+        ]
+
+    async def get_recent_message_dicts(
+        self, session_id: str, limit: int = 10
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get recent stored message dicts, or None if the session is missing.
+
+        Only the last ``limit`` entries are read from the list; a ``limit``
+        of 0 returns every stored message.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.exists(self._session_key(session_id))
+            pipe.lrange(self._messages_key(session_id), -limit if limit > 0 else 0, -1)
+            exists, raw_messages = await pipe.execute()
+
+        if not exists:
+            return None
+        return [_message_dict_decoder.decode(raw) for raw in raw_messages]
 
     async def update_context(
         self,
@@ -199,33 +333,40 @@ class RedisMemoryManager:
         context: Dict[str, Any],
         merge: bool = True,
     ) -> None:
-        """Update session context."""
+        """Update session context in a single MULTI/EXEC round trip.
+
+        Context entries are written to the state hash directly, without
+        reading the session first.
+        """
         if not self.redis:
             raise RuntimeError("Redis not connected")
 
-        session = await self.get_session(session_id)
-        if not session:
-            raise ValueError(f"Session {session_id} not found")
-
-        if merge:
-            session.context.update(context)
-        else:
-            session.context = context
+        session_key = self._session_key(session_id)
+        state_key = self._state_key(session_id)
 
-        session.updated_at = datetime.utcnow().isoformat()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.exists(session_key)
+            if not merge:
+                pipe.delete(state_key)
+            self._queue_context(pipe, session_id, context, _now_iso())
+            pipe.expire(session_key, self.ttl)
+            pipe.expire(self._messages_key(session_id), self.ttl)
+            exists, *_ = await pipe.execute()
 
-        await self.redis.setex(
-            self._session_key(session_id),
-            self.ttl,
-            session.model_dump_json(),
-        )
+        if not exists:
+            await self.redis.delete(state_key)
+            raise ValueError(f"Session {session_id} not found")
 
     async def clear_session(self, session_id: str) -> bool:
         """Clear a session from Redis."""
         if not self.redis:
             raise RuntimeError("Redis not connected")
 
-        result = await self.redis.delete(self._session_key(session_id))
+        result = await self.redis.delete(
+            self._session_key(session_id),
+            self._messages_key(session_id),
+            self._state_key(session_id),
+        )
         return result > 0
 
     async def extend_session_ttl(self, session_id: str) -> bool:
@@ -233,7 +374,12 @@ class RedisMemoryManager:
         if not self.redis:
             raise RuntimeError("Redis not connected")
 
-        return await self.redis.expire(self._session_key(session_id), self.ttl)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.expire(self._session_key(session_id), self.ttl)
+            pipe.expire(self._messages_key(session_id), self.ttl)
+            pipe.expire(self._state_key(session_id), self.ttl)
+            extended, *_ = await pipe.execute()
+        return extended
 
     async def session_exists(self, session_id: str) -> bool:
         """Check if a session exists."""
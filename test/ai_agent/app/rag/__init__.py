@@ -1,5 +1,12 @@
 """RAG module."""
 
+from app.rag.reranker import CrossEncoderReranker, reranker
 from app.rag.retriever import HybridRetriever, RAGManager, rag_manager
 
-__all__ = ["HybridRetriever", "RAGManager", "rag_manager"]
+__all__ = [
+    "HybridRetriever",
+    "RAGManager",
+    "rag_manager",
+    "CrossEncoderReranker",
+    "reranker",
+]
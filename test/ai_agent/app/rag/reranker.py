@@ -0,0 +1,70 @@
+"""Cross-encoder reranking for retrieved documents."""
+
+import asyncio
+from typing import List, Optional
+
+from langchain_core.documents import Document
+
+from app.core.config import settings
+
+
+class CrossEncoderReranker:
+    """Rerank retrieval candidates by scoring (query, passage) pairs jointly."""
+
+    def __init__(self, model_name: str, batch_size: int = 32):
+        """Initialize reranker; the model is loaded on startup."""
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether a model is loaded."""
+        return self.model is not None
+
+    async def load(self) -> None:
+        """Load the cross-encoder model off the event loop."""
+        if not self.model_name:
+            return
+
+        from sentence_transformers import CrossEncoder
+
+        self.model = await asyncio.to_thread(CrossEncoder, self.model_name)
+
+    async def rerank(
+        self,
+        query: str,
+        documents: List[Document],
+        k: Optional[int] = None,
+    ) -> List[Document]:
+        """Return the top ``k`` documents ordered by cross-encoder score.
+
+        The hybrid retrieval score is kept as ``hybrid_score`` and ``score``
+        becomes the cross-encoder score. Without a loaded model the documents
+        are returned in their original order.
+        """
+        if not self.model or not documents:
+            return documents[:k]
+
+        pairs = [(query, doc.page_content) for doc in documents]
+        scores = await asyncio.to_thread(
+            self.model.predict, pairs, batch_size=self.batch_size
+        )
+
+        ranked = sorted(
+            zip(documents, scores), key=lambda item: item[1], reverse=True
+        )[:k]
+
+        results = []
+        for doc, score in ranked:
+            metadata = dict(doc.metadata)
+            metadata["hybrid_score"] = metadata.get("score")
+            metadata["score"] = float(score)
+            results.append(Document(page_content=doc.page_content, metadata=metadata))
+        return results
+
+
+# Global instance
+reranker = CrossEncoderReranker(
+    settings.rerank_model, batch_size=settings.rerank_batch_size
+)
@@ -1,21 +1,25 @@
 """RAG Retriever with Hybrid Search capabilities."""
 
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from async_lru import alru_cache
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from pydantic import Field
+from pydantic import ConfigDict, Field
 
 from app.db.base import get_db_session
 from app.db.crud import DocumentCRUD
-from app.memory.vector_store import VectorDocument, vector_store
+from app.memory.embeddings import document_embedder
+from app.rag.reranker import reranker
 
 
 class HybridRetriever(BaseRetriever):
     """Custom retriever that combines vector and keyword search."""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     k: int = Field(default=5, description="Number of documents to retrieve")
     vector_weight: float = Field(
         default=0.7, description="Weight for vector search results"
@@ -30,28 +34,57 @@ class HybridRetriever(BaseRetriever):
         default=True, description="Include metadata in results"
     )
 
-    class Config:
-        arbitrary_types_allowed = True
-
     def _get_relevant_documents(self, query: str) -> List[Document]:
         """Synchronous retrieval - not implemented for async-only store."""
         raise NotImplementedError("Use async retrieval with aget_relevant_documents")
 
     async def _aget_relevant_documents(self, query: str) -> List[Document]:
-        """Retrieve relevant documents using hybrid search."""
-        results = await vector_store.hybrid_search(
-            query=query,
-            k=self.k,
-            vector_weight=self.vector_weight,
-            keyword_weight=self.keyword_weight,
-            score_threshold=self.score_threshold,
-        )
+        """Retrieve relevant documents using the configured parameters."""
+        return await self.search(query)
+
+    async def search(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        vector_weight: Optional[float] = None,
+        keyword_weight: Optional[float] = None,
+    ) -> List[Document]:
+        """Retrieve relevant documents using hybrid search in PostgreSQL.
+
+        Per-call parameters override the retriever's defaults without
+        modifying it, so concurrent requests can't leak settings.
+        """
+        query_embedding = await document_embedder.embeddings.aembed_query(query)
+
+        async with get_db_session() as session:
+            results = await DocumentCRUD.hybrid_search(
+                session,
+                query_embedding=query_embedding,
+                query_text=query,
+                k=k or self.k,
+                vector_weight=self.vector_weight if vector_weight is None else vector_weight,
+                keyword_weight=self.keyword_weight if keyword_weight is None else keyword_weight,
+            )
 
         documents = []
-        for result in results:
-            metadata = result.metadata.copy() if self.include_metadata else {}
-            metadata["score"] = result.score
-            metadata["doc_id"] = result.id
+        for result, score in results:
+            if self.score_threshold and score < self.score_threshold:
+                continue
+
+            metadata = (
+                {
+                    "title": result.title,
+                    "source": result.source,
+                    "doc_type": result.doc_type,
+                    "chunk_index": result.chunk_index,
+                    "parent_id": str(result.parent_id) if result.parent_id else None,
+                    **(result.metadata_ or {}),
+                }
+                if self.include_metadata
+                else {}
+            )
+            metadata["score"] = score
+            metadata["doc_id"] = result.embedding_id
 
             doc = Document(
                 page_content=result.content,
@@ -62,6 +95,19 @@ class HybridRetriever(BaseRetriever):
         return documents
 
 
+@alru_cache(maxsize=1024, ttl=300)
+async def _cached_retrieve(
+    manager: "RAGManager",
+    query: str,
+    k: Optional[int],
+    vector_weight: float,
+    keyword_weight: float,
+) -> Tuple[List[Document], str]:
+    """Retrieve and format context."""
+    documents = await manager.retrieve(query, k, vector_weight, keyword_weight)
+    return documents, manager.format_context(documents)
+
+
 class RAGManager:
     """Manager for RAG operations including document ingestion and retrieval."""
 
@@ -95,84 +141,169 @@ class RAGManager:
         metadata: Optional[Dict[str, Any]] = None,
     ) -> List[str]:
         """Ingest a document by splitting and storing chunks."""
-        # Split document into chunks
-        chunks = self.text_splitter.split_text(content)
+        [embedding_ids] = await self.ingest_documents([
+            {
+                "content": content,
+                "title": title,
+                "source": source,
+                "doc_type": doc_type,
+                "metadata": metadata,
+            }
+        ])
+        return embedding_ids
+
+    async def ingest_documents(
+        self,
+        documents: List[Dict[str, Any]],
+    ) -> List[List[str]]:
+        """Ingest multiple documents with batched embedding and storage.
 
-        if not chunks:
-            return []
+        Chunks from every document are embedded in batches. Each batch is
+        written to PostgreSQL, which serves retrieval, as soon as its
+        embeddings arrive, while later batches are still embedding; all
+        inserts share one transaction.
 
-        parent_id = uuid.uuid4()
-        embedding_ids = []
+        Returns:
+            Embedding IDs per document, in input order
+        """
         db_documents = []
+        chunk_counts = []
 
-        async with get_db_session() as session:
-            for i, chunk in enumerate(chunks):
-                # Generate embedding ID
-                embedding_id = await vector_store.add_document(
-                    content=chunk,
-                    metadata={
-                        "title": title,
-                        "source": source,
-                        "doc_type": doc_type,
-                        "chunk_index": i,
-                        "parent_id": str(parent_id),
-                        **(metadata or {}),
-                    },
-                    title=title,
-                )
-                embedding_ids.append(embedding_id)
+        for doc in documents:
+            # Split document into chunks
+            chunks = self.text_splitter.split_text(doc["content"])
+            chunk_counts.append(len(chunks))
 
+            parent_id = uuid.uuid4()
+            metadata = doc.get("metadata") or {}
+            for i, chunk in enumerate(chunks):
                 # Prepare DB document
                 db_documents.append({
-                    "title": title,
+                    "title": doc["title"],
                     "content": chunk,
-                    "source": source,
-                    "doc_type": doc_type,
+                    "source": doc.get("source"),
+                    "doc_type": doc.get("doc_type"),
                     "chunk_index": i,
                     "parent_id": parent_id,
-                    "embedding_id": embedding_id,
-                    "metadata_": metadata or {},
+                    "embedding_id": document_embedder.generate_doc_id(chunk),
+                    "metadata_": metadata,
                 })
 
-            # Store in PostgreSQL for persistence
-            await DocumentCRUD.create_batch(session, db_documents)
+        if not db_documents:
+            return [[] for _ in documents]
+
+        embedding_ids = [doc["embedding_id"] for doc in db_documents]
+        try:
+            async with get_db_session() as session:
+                async for offset, embeddings in document_embedder.embed_batches_as_completed(
+                    [doc["content"] for doc in db_documents]
+                ):
+                    batch = db_documents[offset : offset + len(embeddings)]
+                    for db_document, embedding in zip(batch, embeddings):
+                        db_document["embedding"] = embedding
+                    await DocumentCRUD.create_batch(session, batch)
+        except Exception:
+            # A failed commit may still have landed; chunk IDs are random, so
+            # a retry would store the chunks again next to any leftovers
+            async with get_db_session() as session:
+                await DocumentCRUD.delete_by_embedding_ids(session, embedding_ids)
+            raise
+
+        # New chunks may change any cached result
+        _cached_retrieve.cache_clear()
+
+        # Scatter the flat ID list back to documents
+        results = []
+        offset = 0
+        for count in chunk_counts:
+            results.append(embedding_ids[offset : offset + count])
+            offset += count
+        return results
 
-        return embedding_ids
+    async def backfill_embeddings(self, batch_size: int = 512) -> int:
+        """Embed chunks stored before PostgreSQL held their embeddings.
 
-    async def ingest_documents(
-        self,
-        documents: List[Dict[str, Any]],
-    ) -> Dict[str, List[str]]:
-        """Ingest multiple documents."""
-        results = {}
-        for doc in documents:
-            embedding_ids = await self.ingest_document(
-                content=doc["content"],
-                title=doc["title"],
-                source=doc.get("source"),
-                doc_type=doc.get("doc_type"),
-                metadata=doc.get("metadata"),
+        Such chunks are invisible to vector search until backfilled.
+
+        Returns:
+            Number of chunks embedded
+        """
+        total = 0
+        while True:
+            async with get_db_session() as session:
+                rows = await DocumentCRUD.get_missing_embeddings(session, batch_size)
+            if not rows:
+                break
+
+            embeddings = await document_embedder.embed_documents(
+                [content for _, content in rows]
             )
-            results[doc["title"]] = embedding_ids
-        return results
+            async with get_db_session() as session:
+                await DocumentCRUD.set_embeddings(
+                    session,
+                    [
+                        (document_id, embedding)
+                        for (document_id, _), embedding in zip(rows, embeddings)
+                    ],
+                )
+            total += len(rows)
+
+        if total:
+            _cached_retrieve.cache_clear()
+        return total
 
     async def retrieve(
         self,
         query: str,
         k: Optional[int] = None,
+        vector_weight: Optional[float] = None,
+        keyword_weight: Optional[float] = None,
     ) -> List[Document]:
-        """Retrieve relevant documents for a query."""
-        if k:
-            self.retriever.k = k
-        return await self.retriever.aget_relevant_documents(query)
+        """Retrieve relevant documents for a query.
+
+        Unset parameters fall back to the retriever's defaults.
+        """
+        return await self.retriever.search(query, k, vector_weight, keyword_weight)
+
+    async def retrieve_context(
+        self,
+        query: str,
+        k: Optional[int] = None,
+    ) -> Tuple[List[Document], str]:
+        """Retrieve documents and their formatted context, cached for 5 minutes.
+
+        The cache is cleared whenever documents are ingested or deleted. The
+        returned documents are shared between callers and must not be mutated.
+        """
+        return await _cached_retrieve(
+            self,
+            query,
+            k,
+            self.retriever.vector_weight,
+            self.retriever.keyword_weight,
+        )
 
     async def retrieve_with_scores(
         self,
         query: str,
         k: Optional[int] = None,
+        vector_weight: Optional[float] = None,
+        keyword_weight: Optional[float] = None,
+        k_retrieve: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Retrieve documents with their relevance scores."""
-        documents = await self.retrieve(query, k)
+        """Retrieve documents with their relevance scores.
+
+        When the cross-encoder is loaded, ``k_retrieve`` candidates (default
+        ``max(20, 4 * k)``) are retrieved and reranked down to ``k``.
+        """
+        k = k or self.retriever.k
+        if reranker.ready:
+            candidates = await self.retrieve(
+                query, k_retrieve or max(20, 4 * k), vector_weight, keyword_weight
+            )
+            documents = await reranker.rerank(query, candidates, k)
+        else:
+            documents = await self.retrieve(query, k, vector_weight, keyword_weight)
         return [
             {
                 "content": doc.page_content,
@@ -187,20 +318,10 @@ class RAGManager:
     async def delete_document(self, parent_id: uuid.UUID) -> int:
         """Delete a document and all its chunks."""
         async with get_db_session() as session:
-            # Get all chunks
-            documents = await session.execute(
-                "SELECT embedding_id FROM documents WHERE parent_id = :parent_id",
-                {"parent_id": parent_id},
-            )
-
-            # Delete from vector store
-            for doc in documents:
-                if doc.embedding_id:
-                    await vector_store.delete_document(doc.embedding_id)
-
-            # Delete from PostgreSQL
             deleted_count = await DocumentCRUD.delete_by_parent_id(session, parent_id)
 
+        _cached_retrieve.cache_clear()
+
         return deleted_count
 
     def format_context(self, documents: List[Document]) -> str:
@@ -1,10 +1,25 @@
 """Pydantic schemas for chat API."""
 
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Seconds a response timestamp is reused across concurrent responses
+_NOW_TTL = 0.001
+_now_cache = [0.0, datetime.min]
+
+
+def _now_utc() -> datetime:
+    """Current naive UTC time, recomputed at most every ``_NOW_TTL``."""
+    now = time.time()
+    if now - _now_cache[0] > _NOW_TTL:
+        _now_cache[0] = now
+        _now_cache[1] = datetime.fromtimestamp(now, tz=timezone.utc).replace(tzinfo=None)
+    return _now_cache[1]
 
 
 class ChatRequest(BaseModel):
@@ -25,7 +40,7 @@ class ChatResponse(BaseModel):
     session_id: str = Field(..., description="Session ID")
     tool_calls: List[Dict[str, Any]] = Field(default_factory=list, description="Tools used")
     iterations: int = Field(0, description="Number of agent iterations")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_now_utc)
 
 
 class StreamEvent(BaseModel):
@@ -50,7 +65,7 @@ class SessionResponse(BaseModel):
 
     session_id: str
     user_id: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_now_utc)
     message_count: int = 0
 
 
@@ -77,6 +92,12 @@ class RAGSearchRequest(BaseModel):
 
     query: str = Field(..., min_length=1, max_length=1000)
     k: int = Field(5, ge=1, le=20, description="Number of results")
+    k_retrieve: Optional[int] = Field(
+        None,
+        ge=1,
+        le=100,
+        description="Candidates to rerank; defaults to max(20, 4 * k)",
+    )
     vector_weight: float = Field(0.7, ge=0, le=1)
     keyword_weight: float = Field(0.3, ge=0, le=1)
 
@@ -109,6 +130,8 @@ class UserCreate(BaseModel):
 class UserResponse(BaseModel):
     """User response schema."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: uuid.UUID
     username: str
     email: str
@@ -116,9 +139,6 @@ class UserResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class HealthResponse(BaseModel):
     """Health check response."""
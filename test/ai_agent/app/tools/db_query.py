@@ -1,17 +1,70 @@
 """Database query tool for structured data retrieval."""
 
-import json
-import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Type
+import asyncio
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
 
+import orjson
 from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
 
 from app.db.base import get_db_session
 
+# Long-lived loop that runs queries for synchronous callers
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting its thread on first use."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="db-query-loop", daemon=True
+            ).start()
+            _background_loop = loop
+    return _background_loop
+
+
+@lru_cache(maxsize=256)
+def _build_statement(
+    table: str,
+    select_fields: Tuple[str, ...],
+    filter_keys: Tuple[str, ...],
+    order_field: str,
+    order_dir: str,
+) -> TextClause:
+    """Build the parameterized SELECT once per distinct query shape."""
+    where_clauses = [f"{key} = :param_{key}" for key in filter_keys]
+    where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+    return text(
+        f"""
+        SELECT {", ".join(select_fields)}
+        FROM {table}
+        WHERE {where_sql}
+        ORDER BY {order_field} {order_dir}
+        LIMIT :limit
+        """
+    )
+
+
+def _with_field_sets(queries: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Add frozenset views of each query's field lists for membership checks.
+
+    The lists are kept for their column order.
+    """
+    for config in queries.values():
+        config["allowed_field_set"] = frozenset(config["allowed_fields"])
+        config["filter_field_set"] = frozenset(config["filter_fields"])
+    return queries
+
 
 class DBQueryInput(BaseModel):
     """Input schema for database query tool."""
@@ -55,11 +108,12 @@ class DatabaseQueryTool(BaseTool):
 
     Always specify appropriate filters to narrow down results.
     """
+    short_summary: str = "Query users, conversations, messages or documents in the app database."
     args_schema: Type[BaseModel] = DBQueryInput
     return_direct: bool = False
 
     # Allowed tables and their safe columns
-    ALLOWED_QUERIES: Dict[str, Dict[str, Any]] = {
+    ALLOWED_QUERIES: Dict[str, Dict[str, Any]] = _with_field_sets({
         "users": {
             "table": "users",
             "allowed_fields": [
@@ -114,7 +168,7 @@ class DatabaseQueryTool(BaseTool):
             "filter_fields": ["id", "doc_type", "source"],
             "default_order": "created_at",
         },
-    }
+    })
 
     def _run(
         self,
@@ -126,36 +180,14 @@ class DatabaseQueryTool(BaseTool):
         limit: int = 10,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        """Execute database query synchronously."""
-        # For sync context, we need to run in an event loop
-        import asyncio
-
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If already in async context, create a new task
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(
-                        asyncio.run,
-                        self._execute_query(
-                            query_type, filters, fields, order_by, order_direction, limit
-                        ),
-                    )
-                    return future.result()
-            else:
-                return loop.run_until_complete(
-                    self._execute_query(
-                        query_type, filters, fields, order_by, order_direction, limit
-                    )
-                )
-        except RuntimeError:
-            return asyncio.run(
-                self._execute_query(
-                    query_type, filters, fields, order_by, order_direction, limit
-                )
-            )
+        """Execute database query synchronously on the background loop."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._execute_query(
+                query_type, filters, fields, order_by, order_direction, limit
+            ),
+            _get_background_loop(),
+        )
+        return future.result()
 
     async def _arun(
         self,
@@ -189,77 +221,57 @@ class DatabaseQueryTool(BaseTool):
         config = self.ALLOWED_QUERIES[query_type]
         table = config["table"]
         allowed_fields = config["allowed_fields"]
-        filter_fields = config["filter_fields"]
+        allowed_field_set = config["allowed_field_set"]
+        filter_field_set = config["filter_field_set"]
 
-        # Validate and sanitize fields
+        # Validate and sanitize fields; requested names are swapped for the
+        # interned literals from ALLOWED_QUERIES, so row keys and statement
+        # cache keys compare by identity
         if fields:
-            safe_fields = [f for f in fields if f in allowed_fields]
+            safe_fields = [sys.intern(f) for f in fields if f in allowed_field_set]
             if not safe_fields:
                 safe_fields = allowed_fields
         else:
             safe_fields = allowed_fields
 
-        # Build SELECT clause
-        select_clause = ", ".join(safe_fields)
-
-        # Build WHERE clause with parameterized queries
-        where_clauses = []
-        params = {}
-
-        if filters:
-            for key, value in filters.items():
-                if key in filter_fields:
-                    param_name = f"param_{key}"
-                    where_clauses.append(f"{key} = :{param_name}")
-                    params[param_name] = value
-
-        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+        # Bind filters as parameters
+        safe_filters = {
+            key: value
+            for key, value in (filters or {}).items()
+            if key in filter_field_set
+        }
+        filter_keys = tuple(sorted(safe_filters))
+        params = {f"param_{key}": value for key, value in safe_filters.items()}
 
         # Validate order_by
-        order_field = order_by if order_by in allowed_fields else config["default_order"]
+        order_field = (
+            order_by if order_by in allowed_field_set else config["default_order"]
+        )
         order_dir = "DESC" if order_direction.lower() == "desc" else "ASC"
 
-        # Build full query
-        query = f"""
-            SELECT {select_clause}
-            FROM {table}
-            WHERE {where_sql}
-            ORDER BY {order_field} {order_dir}
-            LIMIT :limit
-        """
+        query = _build_statement(
+            table, tuple(safe_fields), filter_keys, order_field, order_dir
+        )
         params["limit"] = limit
 
         try:
             async with get_db_session() as session:
-                result = await session.execute(text(query), params)
+                result = await session.execute(query, params)
                 rows = result.fetchall()
 
                 if not rows:
                     return f"No results found for query type '{query_type}' with the given filters."
 
-                # Format results
-                formatted_results = []
-                for row in rows:
-                    row_dict = {}
-                    for i, field in enumerate(safe_fields):
-                        value = row[i]
-                        # Handle special types
-                        if isinstance(value, uuid.UUID):
-                            value = str(value)
-                        elif isinstance(value, datetime):
-                            value = value.isoformat()
-                        row_dict[field] = value
-                    formatted_results.append(row_dict)
-
-                return json.dumps(
+                # orjson serializes UUIDs and datetimes natively
+                return orjson.dumps(
                     {
                         "query_type": query_type,
-                        "count": len(formatted_results),
-                        "results": formatted_results,
+                        "count": len(rows),
+                        "results": [dict(zip(safe_fields, row)) for row in rows],
                     },
-                    indent=2,
+                    option=orjson.OPT_INDENT_2,
                     default=str,
-                )
+                ).decode()
 
         except Exception as e:
             return f"Database query error: {str(e)}"
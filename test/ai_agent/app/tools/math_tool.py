@@ -3,7 +3,8 @@
 import ast
 import math
 import operator
-from typing import Any, Dict, Optional, Type, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Type, Union
 
 from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
@@ -21,6 +22,15 @@ class MathInput(BaseModel):
     )
 
 
+@lru_cache(maxsize=1024)
+def _parse_expression(expression: str) -> ast.expr:
+    """Parse an expression, caching the tree for repeated expressions.
+
+    Evaluation only reads the tree, so cached trees are safely shared.
+    """
+    return ast.parse(expression, mode="eval").body
+
+
 class SafeMathEvaluator:
     """Safe evaluator for mathematical expressions."""
 
@@ -79,10 +89,10 @@ class SafeMathEvaluator:
         """Safely evaluate a mathematical expression."""
         try:
             # Parse the expression
-            tree = ast.parse(expression, mode="eval")
+            tree = _parse_expression(expression)
 
             # Evaluate the AST
-            result = self._eval_node(tree.body)
+            result = self._eval_node(tree)
 
             return result
 
@@ -92,66 +102,79 @@ class SafeMathEvaluator:
             raise ValueError(f"Error evaluating expression: {e}")
 
     def _eval_node(self, node: ast.AST) -> Any:
-        """Recursively evaluate an AST node."""
-        if isinstance(node, ast.Constant):
-            # Handle numeric constants
-            if isinstance(node.value, (int, float)):
-                return node.value
-            raise ValueError(f"Unsupported constant type: {type(node.value)}")
-
-        elif isinstance(node, ast.Name):
-            # Handle named constants (pi, e, etc.)
-            if node.id in self.CONSTANTS:
-                return self.CONSTANTS[node.id]
-            raise ValueError(f"Unknown constant: {node.id}")
-
-        elif isinstance(node, ast.BinOp):
-            # Handle binary operations (+, -, *, /, etc.)
-            if type(node.op) not in self.OPERATORS:
-                raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-
-            left = self._eval_node(node.left)
-            right = self._eval_node(node.right)
-            op_func = self.OPERATORS[type(node.op)]
-
-            # Check for division by zero
-            if isinstance(node.op, (ast.Div, ast.FloorDiv)) and right == 0:
-                raise ValueError("Division by zero")
-
-            return op_func(left, right)
-
-        elif isinstance(node, ast.UnaryOp):
-            # Handle unary operations (-, +)
-            if type(node.op) not in self.OPERATORS:
-                raise ValueError(f"Unsupported unary operator: {type(node.op).__name__}")
-
-            operand = self._eval_node(node.operand)
-            return self.OPERATORS[type(node.op)](operand)
-
-        elif isinstance(node, ast.Call):
-            # Handle function calls (sqrt, sin, etc.)
-            if not isinstance(node.func, ast.Name):
-                raise ValueError("Only simple function calls are supported")
-
-            func_name = node.func.id
-            if func_name not in self.FUNCTIONS:
-                raise ValueError(f"Unknown function: {func_name}")
-
-            # Evaluate arguments
-            args = [self._eval_node(arg) for arg in node.args]
-
-            return self.FUNCTIONS[func_name](*args)
-
-        elif isinstance(node, ast.List):
-            # Handle lists for functions like min, max, sum
-            return [self._eval_node(elem) for elem in node.elts]
-
-        elif isinstance(node, ast.Tuple):
-            # Handle tuples
-            return tuple(self._eval_node(elem) for elem in node.elts)
-
-        else:
+        """Recursively evaluate an AST node with one dispatch lookup."""
+        handler = self._HANDLERS.get(type(node))
+        if handler is None:
             raise ValueError(f"Unsupported expression type: {type(node).__name__}")
+        return handler(self, node)
+
+    def _eval_constant(self, node: ast.Constant) -> Any:
+        """Handle numeric constants."""
+        if isinstance(node.value, (int, float)):
+            return node.value
+        raise ValueError(f"Unsupported constant type: {type(node.value)}")
+
+    def _eval_name(self, node: ast.Name) -> Any:
+        """Handle named constants (pi, e, etc.)."""
+        if node.id in self.CONSTANTS:
+            return self.CONSTANTS[node.id]
+        raise ValueError(f"Unknown constant: {node.id}")
+
+    def _eval_binop(self, node: ast.BinOp) -> Any:
+        """Handle binary operations (+, -, *, /, etc.)."""
+        if type(node.op) not in self.OPERATORS:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+
+        left = self._eval_node(node.left)
+        right = self._eval_node(node.right)
+        op_func = self.OPERATORS[type(node.op)]
+
+        # Check for division by zero
+        if isinstance(node.op, (ast.Div, ast.FloorDiv)) and right == 0:
+            raise ValueError("Division by zero")
+
+        return op_func(left, right)
+
+    def _eval_unaryop(self, node: ast.UnaryOp) -> Any:
+        """Handle unary operations (-, +)."""
+        if type(node.op) not in self.OPERATORS:
+            raise ValueError(f"Unsupported unary operator: {type(node.op).__name__}")
+
+        operand = self._eval_node(node.operand)
+        return self.OPERATORS[type(node.op)](operand)
+
+    def _eval_call(self, node: ast.Call) -> Any:
+        """Handle function calls (sqrt, sin, etc.)."""
+        if not isinstance(node.func, ast.Name):
+            raise ValueError("Only simple function calls are supported")
+
+        func_name = node.func.id
+        if func_name not in self.FUNCTIONS:
+            raise ValueError(f"Unknown function: {func_name}")
+
+        # Evaluate arguments
+        args = [self._eval_node(arg) for arg in node.args]
+
+        return self.FUNCTIONS[func_name](*args)
+
+    def _eval_list(self, node: ast.List) -> Any:
+        """Handle lists for functions like min, max, sum."""
+        return [self._eval_node(elem) for elem in node.elts]
+
+    def _eval_tuple(self, node: ast.Tuple) -> Any:
+        """Handle tuples."""
+        return tuple(self._eval_node(elem) for elem in node.elts)
+
+    # Evaluator per supported node type
+    _HANDLERS: Dict[type, Callable[["SafeMathEvaluator", Any], Any]] = {
+        ast.Constant: _eval_constant,
+        ast.Name: _eval_name,
+        ast.BinOp: _eval_binop,
+        ast.UnaryOp: _eval_unaryop,
+        ast.Call: _eval_call,
+        ast.List: _eval_list,
+        ast.Tuple: _eval_tuple,
+    }
 
 
 class MathTool(BaseTool):
@@ -173,6 +196,7 @@ class MathTool(BaseTool):
     - "sin(radians(45))" → 0.707107
     - "log(100, 10)" → 2.0
     """
+    short_summary: str = "Evaluate arithmetic, trigonometric, logarithmic and other math expressions."
     args_schema: Type[BaseModel] = MathInput
     return_direct: bool = False
 
@@ -197,7 +221,10 @@ class MathTool(BaseTool):
                 if result.is_integer():
                     formatted = str(int(result))
                 else:
-                    formatted = f"{result:.{precision}f}".rstrip("0").rstrip(".")
+                    formatted = f"{result:.{precision}f}"
+                    # Only strip when there are trailing zeros after a decimal point
+                    if precision and formatted[-1] == "0":
+                        formatted = formatted.rstrip("0").rstrip(".")
             else:
                 formatted = str(result)
 
@@ -1,14 +1,24 @@
 """Web search tool using Tavily API."""
 
-from typing import Any, Dict, List, Optional, Type
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
 
+import httpx
+from cachetools import TTLCache
 from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from tavily import TavilyClient
 
 from app.core.config import settings
 
+# Formatted results kept per distinct search
+SEARCH_CACHE_SIZE = 1024
+
+# Tavily REST endpoint for the async path
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+TAVILY_TIMEOUT = 30.0
+
 
 class WebSearchInput(BaseModel):
     """Input schema for web search tool."""
@@ -43,16 +53,26 @@ class WebSearchTool(BaseTool):
 
     Returns a list of relevant search results with titles, URLs, and content snippets.
     """
+    short_summary: str = "Search the web for current events, news and real-time facts."
     args_schema: Type[BaseModel] = WebSearchInput
     return_direct: bool = False
 
     _client: Optional[TavilyClient] = None
+    _async_client: Optional[httpx.AsyncClient] = None
+    _cache: Optional[TTLCache] = None
+    _cache_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
     def __init__(self, **kwargs):
         """Initialize the web search tool."""
         super().__init__(**kwargs)
         if settings.tavily_api_key:
             self._client = TavilyClient(api_key=settings.tavily_api_key)
+            # Pooled connections shared by every async search
+            self._async_client = httpx.AsyncClient(timeout=TAVILY_TIMEOUT)
+        if settings.web_search_cache_ttl > 0:
+            self._cache = TTLCache(
+                maxsize=SEARCH_CACHE_SIZE, ttl=settings.web_search_cache_ttl
+            )
 
     def _run(
         self,
@@ -67,6 +87,14 @@ class WebSearchTool(BaseTool):
         if not self._client:
             return "Error: Tavily API key not configured. Please set TAVILY_API_KEY environment variable."
 
+        # Repeated searches within the TTL skip the API call
+        key = self._cache_key(
+            query, max_results, search_depth, include_domains, exclude_domains
+        )
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
             response = self._client.search(
                 query=query,
@@ -76,11 +104,45 @@ class WebSearchTool(BaseTool):
                 exclude_domains=exclude_domains,
             )
 
-            return self._format_results(response)
+            formatted = self._format_results(response)
 
         except Exception as e:
             return f"Error performing web search: {str(e)}"
 
+        self._cache_set(key, formatted)
+        return formatted
+
+    def _cache_key(
+        self,
+        query: str,
+        max_results: int,
+        search_depth: str,
+        include_domains: Optional[List[str]],
+        exclude_domains: Optional[List[str]],
+    ) -> Tuple[Any, ...]:
+        """Cache key covering every search parameter."""
+        return (
+            query,
+            max_results,
+            search_depth,
+            tuple(include_domains or ()),
+            tuple(exclude_domains or ()),
+        )
+
+    def _cache_get(self, key: Tuple[Any, ...]) -> Optional[str]:
+        """Look up formatted results for a search."""
+        if self._cache is None:
+            return None
+        with self._cache_lock:
+            return self._cache.get(key)
+
+    def _cache_set(self, key: Tuple[Any, ...], formatted: str) -> None:
+        """Store formatted results for a search."""
+        if self._cache is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = formatted
+
     async def _arun(
         self,
         query: str,
@@ -90,16 +152,43 @@ class WebSearchTool(BaseTool):
         exclude_domains: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        """Execute web search asynchronously."""
-        # Tavily client is sync, so we just call the sync version
-        return self._run(
-            query=query,
-            max_results=max_results,
-            search_depth=search_depth,
-            include_domains=include_domains,
-            exclude_domains=exclude_domains,
-            run_manager=run_manager,
+        """Execute web search asynchronously without blocking the event loop."""
+        if not self._async_client:
+            return "Error: Tavily API key not configured. Please set TAVILY_API_KEY environment variable."
+
+        key = self._cache_key(
+            query, max_results, search_depth, include_domains, exclude_domains
         )
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self._async_client.post(
+                TAVILY_SEARCH_URL,
+                json={
+                    "api_key": settings.tavily_api_key,
+                    "query": query,
+                    "max_results": max_results,
+                    "search_depth": search_depth,
+                    "include_domains": include_domains or [],
+                    "exclude_domains": exclude_domains or [],
+                },
+            )
+            response.raise_for_status()
+
+            formatted = self._format_results(response.json())
+
+        except Exception as e:
+            return f"Error performing web search: {str(e)}"
+
+        self._cache_set(key, formatted)
+        return formatted
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client."""
+        if self._async_client:
+            await self._async_client.aclose()
 
     def _format_results(self, response: Dict[str, Any]) -> str:
         """Format search results into a readable string."""